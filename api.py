@@ -0,0 +1,198 @@
+import os
+import tempfile
+from itertools import chain
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List, Union
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from llm_client import LLMError, RateLimitError, LLMTimeoutError, LLMServerError, TokenBudgetError
+
+
+###############################################################################
+# 취업 준비 가이드 HTTP API (FastAPI)
+# - CareerGuidePipeline의 각 단계를 JSON 엔드포인트로 제공 (요청 간 상태 없음)
+# - 생성 단계는 /stream 엔드포인트로 텍스트를 토큰 단위 스트리밍
+# - 동기 엔드포인트(def)는 FastAPI 스레드 풀에서 실행되므로 여러 요청이 파이프라인을 공유
+# - LLM 오류(llm_client.LLMError)는 {"error": 예외 이름, "detail": 메시지} JSON과 상태 코드로 응답
+# - CAREER_GUIDE_FAKE_LLM=1이면 가짜 LLM(fake_llm.py)으로 실행 (부하 테스트용)
+# - 단계별 메트릭: /metrics (prometheus_client 설치 시), OpenTelemetry span (opentelemetry-api 설치 시)
+#
+#   uvicorn api:app --port 8000
+#   CAREER_GUIDE_FAKE_LLM=1 uvicorn api:app --port 8000 --workers 4
+###############################################################################
+
+FAKE_LLM = os.environ.get("CAREER_GUIDE_FAKE_LLM", "") not in ("", "0")
+FAKE_LATENCY = float(os.environ.get("CAREER_GUIDE_FAKE_LATENCY", 0.05))
+
+
+@lru_cache(maxsize=None)
+def get_service_pipeline():
+    """
+    프로세스 단위 파이프라인. 가짜 LLM 모드에서는 임시 디렉토리에 캐시와 임베딩 저장소를 만듭니다.
+    """
+    if FAKE_LLM:
+        from fake_llm import make_fake_pipeline
+        workdir = tempfile.mkdtemp(prefix="career_guide_")
+        return make_fake_pipeline(workdir, latency=FAKE_LATENCY)[0]
+
+    from career_guide import get_pipeline
+    return get_pipeline()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # 첫 요청에서 생기는 1회성 로딩을 서버 시작 시 수행
+    pipeline = get_service_pipeline()
+    pipeline.warm_up()
+    # 세그먼트 공고 인덱스: 새 스냅샷은 백그라운드에서 준비 후 교체, 주기적으로 압축 (워커마다, 압축은 파일 잠금으로 한 번에 하나)
+    pipeline.start_index_maintenance()
+    yield
+
+
+app = FastAPI(title="CareerGuide API", lifespan=lifespan)
+
+# prometheus_client가 설치되어 있으면 단계별 소요 시간/토큰/캐시 적중 메트릭을 /metrics로 제공 (tracing.py)
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+else:
+    app.mount("/metrics", prometheus_client.make_asgi_app())
+
+# LLM 오류 종류별 응답 상태 코드 (그 외 LLMError는 502)
+ERROR_STATUS = {RateLimitError: 429, LLMTimeoutError: 504, LLMServerError: 502, TokenBudgetError: 413}
+
+
+@app.exception_handler(LLMError)
+def llm_error_handler(request, e):
+    headers = {"Retry-After": str(int(e.retry_after) + 1)} if e.retry_after is not None else None
+    return JSONResponse(
+        {"error": type(e).__name__, "detail": str(e)},
+        status_code=ERROR_STATUS.get(type(e), 502), headers=headers,
+    )
+
+
+class JobRequest(BaseModel):
+    job: str
+    company: str
+
+
+class RequiredSkillsRequest(BaseModel):
+    job: str
+    job_posting: str
+    top_n: int = 3
+
+
+class PersonalStatementRequest(BaseModel):
+    job: str
+    categories: List[str]
+    activities: List[str]
+    skills: str
+
+
+class InterviewRequest(BaseModel):
+    job: str
+    company: str
+    job_posting: str
+    personal_statement: Union[str, List[str]]
+    include_news: bool = True
+
+
+class NewsQuestionsRequest(BaseModel):
+    job: str
+    company: str
+    keyword: str
+    topic: str
+    text: str
+
+
+class GuideRequest(BaseModel):
+    job: str
+    company: str
+    top_n: int = 3
+    max_keywords: int = 10
+
+
+def _stream(chat_stream):
+    # 첫 청크를 미리 받아 LLM 호출 오류가 응답 시작 전에 오류 응답으로 처리되도록 함
+    chunks = iter(chat_stream)
+    first = next(chunks, "")
+    return StreamingResponse(chain([first], chunks), media_type="text/plain; charset=utf-8")
+
+
+def _records(df):
+    return df.to_dict(orient="records")
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok", "fake_llm": FAKE_LLM}
+
+
+@app.post("/job-posting")
+def job_posting(request: JobRequest):
+    return {"job_posting": get_service_pipeline().generate_job_posting(request.job, request.company)}
+
+
+@app.post("/job-posting/stream")
+def job_posting_stream(request: JobRequest):
+    return _stream(get_service_pipeline().generate_job_posting(request.job, request.company, stream=True))
+
+
+@app.post("/required-skills")
+def required_skills(request: RequiredSkillsRequest):
+    pipeline = get_service_pipeline()
+    similar, scores = pipeline.similar_postings(request.job_posting, request.top_n, return_scores=True)
+    return {
+        "similar_postings": similar,
+        "skills": pipeline.get_required_skills(request.job, request.job_posting, similar, scores),
+    }
+
+
+@app.post("/required-skills/stream")
+def required_skills_stream(request: RequiredSkillsRequest):
+    return _stream(get_service_pipeline().required_skills(
+        request.job, request.job_posting, request.top_n, stream=True))
+
+
+@app.post("/personal-statement")
+def personal_statement(request: PersonalStatementRequest):
+    if len(request.categories) != len(request.activities):
+        raise HTTPException(422, "categories와 activities의 길이가 다릅니다.")
+    return {"personal_statement": get_service_pipeline().generate_personal_statement(
+        request.job, request.categories, request.activities, request.skills)}
+
+
+@app.post("/interview")
+def interview(request: InterviewRequest):
+    """
+    면접 질문 단계 결과. 뉴스 DataFrame은 레코드 리스트로 직렬화합니다.
+    clusters: [{"news_dict": {cluster_id: [기사, ...]}, "text": 클러스터 텍스트}, ...]
+    """
+    results, timings = get_service_pipeline().interview(
+        request.job, request.company, request.job_posting, request.personal_statement, request.include_news)
+    if "news" in results:
+        results["news"] = [_records(df) for df in results["news"]]
+        results["clusters"] = [
+            {"news_dict": {str(cid): _records(df) for cid, df in news_dict.items()}, "text": text}
+            for news_dict, text in results["clusters"]
+        ]
+    return {"results": results, "timings": timings}
+
+
+@app.post("/news-questions")
+def news_questions(request: NewsQuestionsRequest):
+    return {"questions": get_service_pipeline().generate_q2(
+        request.job, request.company, request.keyword, request.topic, request.text)}
+
+
+@app.post("/guide")
+def guide(request: GuideRequest):
+    return get_service_pipeline().generate_guide(request.job, request.company, request.top_n, request.max_keywords)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=int(os.environ.get("PORT", 8000)))
@@ -0,0 +1,177 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+###############################################################################
+# (직무, 회사) 쌍 대량 가이드 생성
+# - 입력: job, company 열을 가진 CSV 또는 JSONL
+# - 쌍마다 공고 생성 → 유사 공고 검색 → 필요 역량 → 면접 질문 (CareerGuidePipeline.generate_guide)
+# - 동시에 처리하는 쌍 수를 --concurrency로 제한
+# - 결과를 한 줄씩 JSONL에 바로 기록하므로, 중단된 실행을 다시 시작하면 완료된 쌍은 건너뜀
+# - 진행 중 처리량(pairs/min)을 출력하고, --parquet이면 마지막에 Parquet으로도 저장
+#
+#   python batch_runner.py pairs.csv -o guides.jsonl --concurrency 8
+#   python batch_runner.py pairs.csv -o guides.jsonl --fake-llm     # 가짜 LLM으로 실행
+###############################################################################
+
+
+def pair_key(job, company):
+    return f"{company.strip()}\t{job.strip()}"
+
+
+def read_pairs(path):
+    """
+    입력 파일에서 (job, company) 리스트를 읽습니다. 중복 쌍은 한 번만 반환합니다.
+    """
+    with open(path, encoding="utf-8-sig") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+
+    pairs, seen = [], set()
+    for row in rows:
+        job, company = str(row.get("job", "")).strip(), str(row.get("company", "")).strip()
+        if not job or not company or pair_key(job, company) in seen:
+            continue
+        seen.add(pair_key(job, company))
+        pairs.append((job, company))
+    return pairs
+
+
+def completed_keys(path):
+    """
+    출력 JSONL에서 성공한 쌍의 키를 읽습니다. 마지막 줄이 잘려 있으면 무시합니다.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                done.add(pair_key(record["job"], record["company"]))
+    return done
+
+
+class BatchRunner:
+    """
+    generate(job, company) → dict 함수를 여러 쌍에 대해 실행하고 결과를 JSONL로 기록합니다.
+    """
+
+    def __init__(self, generate, output_path, concurrency=4, report_every=10):
+        self.generate = generate
+        self.output_path = output_path
+        self.concurrency = concurrency
+        self.report_every = report_every
+        self.stats = {"ok": 0, "error": 0, "skipped": 0}
+        self._lock = threading.Lock()
+
+    def _write(self, f, record):
+        with self._lock:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            self.stats[record["status"]] += 1
+
+    def _run_one(self, f, job, company):
+        start = time.perf_counter()
+        try:
+            record = {"status": "ok", **self.generate(job, company)}
+        except Exception as e:
+            record = {"status": "error", "job": job, "company": company, "error": f"{type(e).__name__}: {e}"}
+        record["elapsed"] = round(time.perf_counter() - start, 3)
+        self._write(f, record)
+
+    def run(self, pairs):
+        done = completed_keys(self.output_path)
+        todo = [(job, company) for job, company in pairs if pair_key(job, company) not in done]
+        self.stats["skipped"] = len(pairs) - len(todo)
+        if self.stats["skipped"]:
+            print(f"이전 실행에서 완료된 {self.stats['skipped']}쌍을 건너뜁니다.")
+
+        start = time.perf_counter()
+        with open(self.output_path, "a", encoding="utf-8") as f, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [pool.submit(self._run_one, f, job, company) for job, company in todo]
+            for n, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if n % self.report_every == 0 or n == len(futures):
+                    elapsed = time.perf_counter() - start
+                    print(f"[{n}/{len(todo)}] 성공 {self.stats['ok']} / 실패 {self.stats['error']}  "
+                          f"{n / elapsed * 60:.1f} pairs/min")
+
+        elapsed = time.perf_counter() - start
+        return {**self.stats, "elapsed": elapsed,
+                "pairs_per_min": len(todo) / elapsed * 60 if elapsed > 0 else 0.0}
+
+
+def to_parquet(jsonl_path, parquet_path):
+    """
+    성공한 결과만 Parquet으로 저장합니다 (쌍마다 마지막 결과 사용).
+    """
+    import pandas as pd
+
+    records = {}
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                records[pair_key(record["job"], record["company"])] = record
+
+    df = pd.DataFrame(list(records.values()))
+    for column in ("similar_postings", "keywords", "timings"):
+        if column in df:
+            df[column] = df[column].map(lambda value: json.dumps(value, ensure_ascii=False))
+    df.to_parquet(parquet_path, index=False)
+    return len(df)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="(직무, 회사) 쌍 대량 가이드 생성")
+    parser.add_argument("input", help="job, company 열을 가진 CSV 또는 JSONL")
+    parser.add_argument("-o", "--output", default="guides.jsonl", help="결과 JSONL (재실행 시 이어서 진행)")
+    parser.add_argument("--parquet", help="완료 후 성공한 결과를 Parquet으로도 저장")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 처리할 쌍 수")
+    parser.add_argument("--limit", type=int, default=None, help="앞에서부터 N쌍만 처리")
+    parser.add_argument("--fake-llm", action="store_true", help="가짜 LLM/임베딩으로 실행 (API 호출 없음)")
+    parser.add_argument("--fake-latency", type=float, default=0.2, help="가짜 LLM 호출당 지연(초)")
+    args = parser.parse_args()
+
+    pairs = read_pairs(args.input)[:args.limit]
+    if not pairs:
+        sys.exit(f"{args.input}에 처리할 (job, company) 쌍이 없습니다.")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.fake_llm:
+            from fake_llm import make_fake_pipeline
+            pipeline, fake = make_fake_pipeline(workdir, args.fake_latency)
+        else:
+            from career_guide import get_pipeline
+            pipeline = get_pipeline()
+
+        start = time.perf_counter()
+        pipeline.warm_up()
+        print(f"준비 완료 ({time.perf_counter() - start:.1f}s)")
+
+        runner = BatchRunner(pipeline.generate_guide, args.output, concurrency=args.concurrency)
+        result = runner.run(pairs)
+
+    print(f"완료: 성공 {result['ok']} / 실패 {result['error']} / 건너뜀 {result['skipped']}  "
+          f"{result['elapsed']:.1f}s, {result['pairs_per_min']:.1f} pairs/min")
+    if args.fake_llm:
+        print(f"가짜 LLM 호출: {fake.calls}")
+    if args.parquet:
+        print(f"Parquet 저장: {args.parquet} ({to_parquet(args.output, args.parquet)}쌍)")
@@ -0,0 +1,210 @@
+import os
+import time
+import argparse
+import numpy as np
+
+import kr_text
+from reranker import DEFAULT_WEIGHTS, top_k_indices
+
+
+###############################################################################
+# 공고 BM25 검색 + 밀집(임베딩) 점수 융합
+# - org_sum / work_sum / skills_sum을 Kiwi 명사(kr_text.nouns_many)로 토큰화
+# - 필드별 BM25 가중치(idf × 포화된 tf)에 필드 가중치를 곱해 (N, F*V) CSR 행렬 하나로 저장
+#   (열 = 필드 f의 단어 t → f*V + t) → 쿼리 점수는 희소 행렬-벡터 곱 한 번
+# - fuse_scores: 후보별 밀집 점수와 BM25 점수를 한 번의 벡터 연산으로 결합
+#     * weighted : 후보 안에서 min-max 정규화 후 alpha * dense + (1 - alpha) * sparse
+#     * rrf      : Σ 1 / (k + 순위)  (순위는 후보 안에서 계산)
+# - 임베딩 API에 닿지 않으면 BM25 점수만으로 검색 (career_guide.retrieval, 네트워크 왕복 없음)
+#
+#   python bm25_index.py            # 공고 DB 자기 검색 정확도 + 합성 코퍼스 latency
+###############################################################################
+
+RETRIEVAL_MODE = os.environ.get("RETRIEVAL_MODE", "hybrid")        # hybrid / dense / sparse
+HYBRID_FUSION = os.environ.get("HYBRID_FUSION", "weighted")         # weighted / rrf
+HYBRID_ALPHA = float(os.environ.get("HYBRID_ALPHA", 0.7))           # weighted: 밀집 점수 비중
+HYBRID_CANDIDATES = int(os.environ.get("HYBRID_CANDIDATES", 50))    # 밀집/희소 각각의 후보 수
+RRF_K = 60
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELDS = ("org_sum", "work_sum", "skills_sum")
+
+
+class BM25Index:
+    """
+    필드 가중 BM25 점수 행렬 (CSR).
+
+        index = BM25Index.build(db)      # db: org_sum / work_sum / skills_sum 열 DataFrame
+        scores = index.scores(("조직 설명", "직무 설명", "필요 역량"))   # (N,)
+    """
+
+    def __init__(self, matrix, vocab, weights):
+        self.matrix = matrix            # scipy.sparse.csr_matrix (N, F*V) float32
+        self.vocab = vocab              # {단어: 번호}
+        self.weights = weights
+
+    @classmethod
+    def build(cls, db, weights=None, k1=BM25_K1, b=BM25_B):
+        from scipy import sparse
+
+        weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        n = len(db)
+        tokens = {
+            field: kr_text.nouns_many(db[field].fillna("").astype(str).tolist())
+            for field in FIELDS
+        }
+        vocab = {}
+        for field in FIELDS:
+            for doc in tokens[field]:
+                for term in doc:
+                    vocab.setdefault(term, len(vocab))
+        n_terms = len(vocab)
+
+        rows, cols, values = [], [], []
+        for f, field in enumerate(FIELDS):
+            doc_ids = np.repeat(np.arange(n), [len(doc) for doc in tokens[field]])
+            term_ids = np.fromiter((vocab[t] for doc in tokens[field] for t in doc), dtype=np.int64,
+                                   count=len(doc_ids))
+            # (문서, 단어)별 tf
+            pairs, tf = np.unique(doc_ids * n_terms + term_ids, return_counts=True)
+            doc, term = np.divmod(pairs, n_terms)
+
+            lengths = np.bincount(doc_ids, minlength=n).astype(np.float32)
+            avg_len = lengths.mean() if n and lengths.mean() > 0 else 1.0
+            df = np.bincount(term, minlength=n_terms)
+            idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+            norm = k1 * (1 - b + b * lengths[doc] / avg_len)
+            rows.append(doc)
+            cols.append(term + f * n_terms)
+            values.append(weights.get(field, 0.0) * idf[term] * tf * (k1 + 1) / (tf + norm))
+
+        matrix = sparse.csr_matrix(
+            (np.concatenate(values).astype(np.float32), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n, len(FIELDS) * n_terms),
+        )
+        return cls(matrix, vocab, weights)
+
+    def encode_query(self, texts):
+        """
+        필드별 쿼리 텍스트 (조직, 직무, 역량)를 (F*V,) 단어 존재 벡터로 바꿉니다. 사전에 없는 단어는 무시합니다.
+        """
+        n_terms = len(self.vocab)
+        query = np.zeros(len(FIELDS) * n_terms, dtype=np.float32)
+        for f, doc in enumerate(kr_text.nouns_many(list(texts))):
+            ids = [self.vocab[t] for t in doc if t in self.vocab]
+            query[np.asarray(ids, dtype=np.int64) + f * n_terms] = 1.0
+        return query
+
+    def scores(self, texts):
+        """
+        모든 공고의 BM25 점수 (N,) — CSR 행렬-벡터 곱 한 번.
+        """
+        return self.matrix @ self.encode_query(texts)
+
+    def search(self, texts, k):
+        scores = self.scores(texts)
+        indices = top_k_indices(scores, k)[0]
+        return indices, scores[indices]
+
+
+def fuse_scores(dense, sparse, method=HYBRID_FUSION, alpha=HYBRID_ALPHA, rrf_k=RRF_K):
+    """
+    같은 후보에 대한 밀집 점수와 BM25 점수 배열을 결합한 점수 배열을 반환합니다.
+    """
+    dense = np.asarray(dense, dtype=np.float32)
+    sparse = np.asarray(sparse, dtype=np.float32)
+    if method == "rrf":
+        dense_rank = np.argsort(np.argsort(-dense, kind="stable"), kind="stable")
+        sparse_rank = np.argsort(np.argsort(-sparse, kind="stable"), kind="stable")
+        return 1.0 / (rrf_k + 1 + dense_rank) + 1.0 / (rrf_k + 1 + sparse_rank)
+    if method != "weighted":
+        raise ValueError(f"알 수 없는 융합 방식입니다: {method}")
+
+    def minmax(x):
+        span = x.max() - x.min() if len(x) else 0.0
+        return (x - x.min()) / span if span > 0 else np.zeros_like(x)
+
+    return alpha * minmax(dense) + (1 - alpha) * minmax(sparse)
+
+
+def hybrid_top_k(dense_ids, dense_query, rows, sparse_scores, k, candidates=HYBRID_CANDIDATES,
+                 method=HYBRID_FUSION, alpha=HYBRID_ALPHA):
+    """
+    밀집 검색 후보(dense_ids)와 BM25 상위 후보를 합친 뒤, 후보 전체의 점수를 한 번에 결합하여
+    상위 k개의 (행 번호, 융합 점수)를 반환합니다.
+    rows(ids): 후보 행의 원본 가중 결합 벡터 (reranker.FusedReranker.rows) — 밀집 점수를 정확히 다시 계산
+    IVF 검색은 후보가 k개보다 적으면 -1로 채우므로 음수 번호는 버립니다 (-1은 마지막 행으로 읽힘).
+    """
+    dense_ids = np.asarray(dense_ids)
+    candidate_ids = np.union1d(dense_ids[dense_ids >= 0], top_k_indices(sparse_scores, candidates)[0])
+    dense = rows(candidate_ids) @ dense_query
+    fused = fuse_scores(dense, sparse_scores[candidate_ids], method, alpha)
+    best = top_k_indices(fused, k)[0]
+    return candidate_ids[best], fused[best]
+
+
+###############################################################################
+# 벤치마크
+###############################################################################
+
+def self_retrieval(db, index, field="skills_sum", k=3, n=200, seed=0):
+    """
+    공고의 한 필드만 쿼리로 넣었을 때 원래 공고가 BM25 상위 k개에 드는 비율 (정확한 용어 매칭 확인).
+    """
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(db), min(n, len(db)), replace=False)
+    hits = 0
+    for row in rows:
+        texts = ["", "", ""]
+        texts[FIELDS.index(field)] = str(db[field].iloc[row])
+        indices, _ = index.search(texts, k)
+        hits += int(row in indices)
+    return hits / len(rows)
+
+
+def benchmark(n=100_000, vocab_size=20_000, doc_len=60, n_queries=200, seed=0):
+    from scipy import sparse
+
+    from posting_store import PostingStore
+
+    db = PostingStore().frame(*FIELDS)
+    kr_text.get_kiwi()  # Kiwi 모델 로딩은 빌드 시간에서 제외
+    start = time.perf_counter()
+    index = BM25Index.build(db)
+    print(f"[공고 DB] {len(db)}건 BM25 빌드 {time.perf_counter() - start:.2f}s  "
+          f"어휘 {len(index.vocab):,}  nnz {index.matrix.nnz:,}")
+    for field in FIELDS:
+        print(f"[공고 DB] {field}만으로 자기 검색 top-3 적중률 {self_retrieval(db, index, field):.3f}")
+
+    # 합성 코퍼스: 행렬-벡터 곱 / 융합 latency
+    rng = np.random.default_rng(seed)
+    n_cols = len(FIELDS) * vocab_size
+    nnz = n * doc_len
+    matrix = sparse.csr_matrix(
+        (rng.random(nnz, dtype=np.float32), (np.repeat(np.arange(n), doc_len), rng.integers(0, n_cols, nnz))),
+        shape=(n, n_cols),
+    )
+    queries = np.zeros((n_queries, n_cols), dtype=np.float32)
+    for q in queries:
+        q[rng.integers(0, n_cols, 30)] = 1.0
+    start = time.perf_counter()
+    for q in queries:
+        scores = matrix @ q
+        top_k_indices(scores, HYBRID_CANDIDATES)
+    sparse_ms = (time.perf_counter() - start) * 1000 / n_queries
+
+    dense = rng.random((n_queries, 2 * HYBRID_CANDIDATES), dtype=np.float32)
+    start = time.perf_counter()
+    for d in dense:
+        fuse_scores(d, rng.random(len(d), dtype=np.float32))
+    fuse_ms = (time.perf_counter() - start) * 1000 / n_queries
+    print(f"[합성] {n:,}건 x {n_cols:,}열 (nnz {matrix.nnz:,})  BM25 점수 + 후보 선택 {sparse_ms:.2f} ms/query  "
+          f"융합 {fuse_ms:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공고 BM25 인덱스 벤치마크")
+    parser.add_argument("--n", type=int, default=100_000, help="합성 코퍼스 공고 수")
+    args = parser.parse_args()
+    benchmark(n=args.n)
@@ -0,0 +1,573 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial, lru_cache
+from embedding_store import load_store, DEFAULT_STORE_DIR
+from reranker import FusedReranker
+from ann_index import make_index
+from embedding_client import EmbeddingClient, EmbeddingUnavailable
+from embedding_backend import make_backend
+from bm25_index import BM25Index, RETRIEVAL_MODE, HYBRID_CANDIDATES, hybrid_top_k
+from orchestrator import Stage, run_pipeline
+from llm_cache import LLMCache, cached_chat_completion
+from llm_stream import ChatStream
+from llm_client import RateLimitedClient, classify_error
+from job_index import JobIndex, make_tokenizer
+from posting_store import PostingStore
+from posting_index import StaticSnapshot, open_posting_index, start_compactor
+from news_store import NewsStore
+import kr_text
+from keyword_model import get_keyword_model
+from news_clustering import cluster_news_and_text
+from tracing import traced
+from prompts import (
+    job_posting_prompt, required_skills_prompt, statement_prompt, q1_prompt, news_keyword_prompt,
+    summarize_cluster_prompt, q2_prompt, q3_prompt,
+)
+
+
+###############################################################################
+# 취업 준비 가이드 파이프라인
+# - 외부 의존성을 생성자로 주입받는 CareerGuidePipeline (프롬프트 템플릿은 prompts.py)
+# - 파이프라인은 요청 간 상태를 갖지 않으므로 한 인스턴스를 여러 스레드/요청이 공유 가능
+# - demo.py(Streamlit), api.py(HTTP API), batch_runner.py(대량 생성)가 함께 사용
+# - 단계 함수는 @traced로 소요 시간, 토큰 사용량, 캐시 적중을 기록 (tracing.py)
+# - 공고 DB와 임베딩은 스냅샷(posting_index.py)으로 읽음: 세그먼트 인덱스가 있으면 새 세그먼트를
+#   재시작 없이 반영하고, 요청 하나(generate_guide 등)는 pin_snapshot()으로 같은 스냅샷을 사용
+#   서비스는 start_index_maintenance()로 새 스냅샷의 역색인/검색 인덱스를 백그라운드에서 만든 뒤 교체하고
+#   주기적으로 압축 (api.py lifespan, demo.py)
+# - 유사 공고 검색은 임베딩 검색 + BM25(bm25_index.py) 융합. 임베딩 API에 닿지 않으면 BM25만 사용
+# - 쿼리 임베딩은 EMBEDDING_BACKEND(embedding_backend.py: Upstage API 또는 로컬 LSA/ONNX)로 계산하며,
+#   공고 임베딩 저장소도 같은 백엔드로 만든 것이어야 함 (다르면 ValueError → reembed)
+###############################################################################
+
+MODEL = "gpt-4o-mini"
+
+# 동시에 실행할 LLM 호출 수 상한
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 4))
+
+# search_db가 DB 행을 채택하기 위한 최소 점수 (1.0 = 질의의 모든 토큰이 직무명에 포함)
+SEARCH_DB_MIN_SCORE = 0.999
+
+# 유사 공고 검색의 필드별 가중치 (조직 / 직무 / 역량)
+RETRIEVAL_WEIGHTS = {"org_sum": 0.2, "work_sum": 0.4, "skills_sum": 0.4}
+
+# 직무명 토큰화 캐시 크기 (스냅샷이 바뀌어도 이미 분석한 직무명은 다시 분석하지 않음)
+JOB_TOKEN_CACHE_SIZE = 200_000
+
+# 세그먼트 공고 인덱스 압축 확인 주기(초) (posting_index.start_compactor)
+COMPACT_INTERVAL = float(os.environ.get("POSTING_INDEX_COMPACT_INTERVAL", 60))
+
+
+# 데이터 전처리 함수 정의 (Kiwi 명사 추출, kr_text 참고)
+def Kr_preprocessing(text):
+    return kr_text.preprocess(text)
+
+
+def Kr_preprocessing2(text):
+    # 채용 공고용 불용어(kr_text.POSTING_STOPWORDS)를 추가로 제외
+    return list(kr_text.nouns(text, stopwords="posting"))
+
+
+def parse_posting(result):
+    """
+    생성된 공고에서 (조직 설명, 직무 설명, 필요 역량)을 추출합니다.
+    """
+    user_org, user_work, user_skills = "", "", ""
+    for line in result.split("\n"):
+        if "조직 설명" in line:
+            user_org = line.split(":", 1)[-1].strip()
+        elif "직무 설명" in line:
+            user_work = line.split(":", 1)[-1].strip()
+        elif "필요 역량" in line:
+            user_skills = line.split(":", 1)[-1].strip()
+    return user_org, user_work, user_skills
+
+
+###############################################################################
+# 파이프라인
+###############################################################################
+
+# 뉴스 트렌드 분석에 사용하는 키워드 수 (generate_news_keyword 프롬프트 기준)
+NEWS_KEYWORD_COUNT = 3
+
+# pin_snapshot() 블록 안에서 고정된 공고 스냅샷 (orchestrator 단계 스레드에도 전달됨)
+_pinned_snapshot = ContextVar("posting_snapshot", default=None)
+
+
+class CareerGuidePipeline:
+    """
+    직무/회사 입력 → 채용 공고 → 유사 공고와 필요 역량 → 자기소개서 글감 → 면접 질문.
+
+    외부 의존성은 모두 생성자로 주입받고 요청 간 상태를 저장하지 않습니다.
+    llm_client: chat.completions.create를 제공하는 OpenAI 호환 클라이언트
+    embedding_client: embedding_client.EmbeddingClient
+    posting_index: posting_index.PostingIndex (없으면 postings + store_dir의 고정 공고 DB 사용)
+    """
+
+    def __init__(self, llm_client, embedding_client, llm_cache=None, postings=None, news_store=None,
+                 store_dir=DEFAULT_STORE_DIR, model=MODEL, max_concurrency=LLM_MAX_CONCURRENCY,
+                 retrieval_weights=RETRIEVAL_WEIGHTS, posting_index=None, retrieval_mode=RETRIEVAL_MODE):
+        self.llm_client = llm_client
+        self.embedding_client = embedding_client
+        self.llm_cache = llm_cache
+        self.postings = postings or PostingStore()
+        self.news_store = news_store or NewsStore()
+        self.store_dir = store_dir
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.retrieval_weights = retrieval_weights
+        self.posting_index = posting_index
+        self.retrieval_mode = retrieval_mode
+        self._static_snapshot = None
+        self._job_tokenizer = None
+        self._maintenance = None
+
+    ###########################################################################
+    # 공고 스냅샷
+    ###########################################################################
+
+    def snapshot(self):
+        """
+        현재 공고 스냅샷. pin_snapshot() 블록 안에서는 블록 시작 시점의 스냅샷을 반환합니다.
+        """
+        pinned = _pinned_snapshot.get()
+        if pinned is not None:
+            return pinned
+        if self.posting_index is not None:
+            return self.posting_index.snapshot()
+        if self._static_snapshot is None:
+            self._static_snapshot = StaticSnapshot(self.postings, load_store(self.store_dir))
+        return self._static_snapshot
+
+    @contextmanager
+    def pin_snapshot(self):
+        """
+        블록 안의 search_db / retrieval / similar_postings가 같은 스냅샷을 보도록 고정합니다.
+        이미 고정되어 있으면 그 스냅샷을 그대로 씁니다.
+        """
+        pinned = _pinned_snapshot.get()
+        if pinned is not None:
+            yield pinned
+            return
+        snapshot = self.snapshot()
+        token = _pinned_snapshot.set(snapshot)
+        try:
+            yield snapshot
+        finally:
+            _pinned_snapshot.reset(token)
+
+    def _job_index(self, snapshot):
+        # 직무명 역색인은 스냅샷마다 한 번만 생성 (토크나이저 캐시는 스냅샷 간 공유 → 새 직무명만 분석)
+        if self._job_tokenizer is None:
+            self._job_tokenizer = make_tokenizer(kr_text.get_kiwi(), cache_size=JOB_TOKEN_CACHE_SIZE)
+        db = snapshot.frame("job", "org_sum", "work_sum", "skills_sum")
+        return snapshot.derived("job_index", lambda: JobIndex(db["job"].tolist(), tokenize=self._job_tokenizer))
+
+    def _retrieval_index(self, snapshot):
+        # (재정렬기, 검색 백엔드)를 스냅샷마다 한 번만 생성. 고정 DB만 인덱스 파일을 저장/재사용하고,
+        # 세그먼트 스냅샷은 직전 스냅샷 인덱스의 학습 결과(IVF-PQ 코드북, 압축 투영)를 재사용
+        key = ("retrieval", tuple(sorted(self.retrieval_weights.items())))
+
+        def build():
+            backend = self.embedding_client.backend
+            if snapshot.store.model != backend.passage_model:
+                raise ValueError(
+                    f"공고 임베딩({snapshot.store.model})과 쿼리 임베딩 백엔드({backend.passage_model})가 다릅니다. "
+                    f"python embedding_backend.py reembed로 공고 DB를 다시 임베딩하세요."
+                )
+            reranker = FusedReranker(snapshot.store, self.retrieval_weights)
+            previous = snapshot.previous(key)
+            return reranker, make_index(reranker, persist=isinstance(snapshot, StaticSnapshot),
+                                        previous=previous[1] if previous else None)
+
+        return snapshot.derived(key, build)
+
+    def _bm25_index(self, snapshot):
+        # BM25 행렬도 스냅샷마다 한 번만 생성 (Kiwi 명사 추출은 kr_text 캐시로 새 공고만 수행)
+        db = snapshot.frame("org_sum", "work_sum", "skills_sum")
+        return snapshot.derived(
+            ("bm25", tuple(sorted(self.retrieval_weights.items()))),
+            lambda: BM25Index.build(db, self.retrieval_weights),
+        )
+
+    ###########################################################################
+    # LLM 호출
+    ###########################################################################
+
+    def chat_completion(self, prompt, temperature, max_tokens=1024, system=None,
+                        cache_nondeterministic=False, stream=False):
+        """
+        LLM 호출 공통 함수. temperature=0 호출은 응답 캐시를 거칩니다.
+        stream=True이면 청크를 yield하는 ChatStream을 반환합니다 (반복 후 .text에 전체 응답).
+        실패하면 llm_client.LLMError 하위 예외를 발생시킵니다.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        if stream:
+            return ChatStream(
+                self.llm_client, self.model, messages,
+                cache=self.llm_cache, cache_nondeterministic=cache_nondeterministic,
+                max_tokens=max_tokens, temperature=temperature
+            )
+        try:
+            return cached_chat_completion(
+                self.llm_client, self.llm_cache, self.model, messages,
+                cache_nondeterministic=cache_nondeterministic,
+                max_tokens=max_tokens, temperature=temperature
+            )
+        except Exception as e:
+            raise classify_error(e) from e
+
+    def _generate(self, prompt, temperature, max_tokens=1024, stream=False):
+        # prompt: prompts.py의 (정적 system 접두부, user 입력) 쌍
+        system, user = prompt
+        if stream:
+            return self.chat_completion(user, temperature=temperature, max_tokens=max_tokens, system=system, stream=True)
+        return self.chat_completion(user, temperature=temperature, max_tokens=max_tokens, system=system).strip()
+
+    ###########################################################################
+    # 1. 채용 공고 생성
+    ###########################################################################
+
+    def search_db_candidates(self, full_job, k=5):
+        """
+        DB의 'job' 열 역색인에서 full_job(회사 + 직무)과 관련된 공고를 점수 순으로 반환합니다.
+        역색인은 스냅샷마다 처음 호출될 때 한 번만 생성됩니다.
+        """
+        snapshot = self.snapshot()
+        db = snapshot.frame("job", "org_sum", "work_sum", "skills_sum")
+        index = self._job_index(snapshot)
+        ranked = index.search(full_job, k=k)
+        candidates = db.iloc[[doc_id for doc_id, _ in ranked]].copy()
+        candidates["score"] = [score for _, score in ranked]
+        return candidates
+
+    @traced()
+    def search_db(self, full_job):
+        """
+        full_job과 직무명이 일치하는 DB 공고를 반환합니다. 없으면 None.
+        """
+        candidates = self.search_db_candidates(full_job, k=1)
+        if not candidates.empty and candidates["score"].iloc[0] >= SEARCH_DB_MIN_SCORE:
+            return candidates.iloc[0]  # 가장 관련성 높은 데이터 반환
+        return None
+
+    @traced()
+    def generate_job_posting(self, job, company, stream=False):
+        """
+        기존 DB에 같은 직무가 있으면 그 요약을 보완하고, 없으면 예시 기반으로 채용 공고를 생성합니다.
+        """
+        db_data = self.search_db(f"{company} {job}")
+        return self._generate(job_posting_prompt(job, company, db_data), temperature=0, stream=stream)
+
+    ###########################################################################
+    # 2. 유사 공고 검색 + 필요 역량
+    ###########################################################################
+
+    def get_embedding(self, text):
+        return self.embedding_client.embed(text)
+
+    @traced()
+    def retrieval(self, job_posting, top_n=3, return_scores=False):
+        """
+        생성된 공고와 유사한 DB 공고 top_n개의 행 번호를 반환합니다.
+        return_scores=True이면 (행 번호, 점수) 리스트 쌍을 반환합니다.
+        RETRIEVAL_MODE 환경 변수로 검색 방식을 선택합니다.
+          hybrid : 임베딩 검색 후보와 BM25 후보를 합쳐 점수 융합 (HYBRID_FUSION / HYBRID_ALPHA)
+          dense  : 필드별 가중 코사인 유사도만 사용 (검색 백엔드는 RETRIEVAL_BACKEND: exact / ivfpq / compact)
+          sparse : BM25만 사용 (임베딩 API 호출 없음)
+        임베딩 API에 닿지 않으면(EmbeddingUnavailable) BM25만으로 검색합니다.
+        """
+        texts = parse_posting(job_posting)
+        snapshot = self.snapshot()
+        mode = self.retrieval_mode
+
+        queries = None
+        if mode != "sparse":
+            try:
+                # 세 필드를 한 번의 API 호출로 임베딩 (캐시에 있으면 호출 없음)
+                org_emb, work_emb, skills_emb = self.embedding_client.embed_many(list(texts))
+                queries = {"org_sum": org_emb, "work_sum": work_emb, "skills_sum": skills_emb}
+            except EmbeddingUnavailable:
+                if mode == "dense":
+                    raise
+
+        if queries is None:
+            idx, scores = self._bm25_index(snapshot).search(texts, top_n)
+        else:
+            reranker, index = self._retrieval_index(snapshot)
+            encoded = reranker.encode_queries(queries)
+            dense_idx, dense_scores = index.search(encoded, top_n if mode == "dense" else HYBRID_CANDIDATES)
+            if mode == "dense":
+                found = dense_idx[0] >= 0  # IVF는 후보가 모자라면 -1로 채움
+                idx, scores = dense_idx[0][found], dense_scores[0][found]
+            else:
+                sparse_scores = self._bm25_index(snapshot).scores(texts)
+                idx, scores = hybrid_top_k(dense_idx[0], encoded[0], reranker.rows, sparse_scores, top_n)
+
+        if return_scores:
+            return idx.tolist(), scores.tolist()
+        return idx.tolist()
+
+    @traced()
+    def similar_postings(self, job_posting, top_n=3, return_scores=False):
+        """
+        유사 공고 top_n개의 전체 요약(total_sum) 리스트. return_scores=True이면 (요약 리스트, 유사도 리스트).
+        """
+        with self.pin_snapshot() as snapshot:
+            idx, scores = self.retrieval(job_posting, top_n, return_scores=True)
+            similar = snapshot.frame("total_sum").loc[idx, "total_sum"].tolist()
+        return (similar, scores) if return_scores else similar
+
+    @traced()
+    def get_required_skills(self, job, job_posting, similar_sum, scores=None, stream=False):
+        """
+        scores(유사도)가 있으면 유사 공고를 점수에 비례한 토큰 예산으로 잘라 프롬프트에 넣습니다.
+        """
+        return self._generate(required_skills_prompt(job, job_posting, similar_sum, scores), temperature=0, stream=stream)
+
+    def required_skills(self, job, job_posting, top_n=3, stream=False):
+        """
+        유사 공고 top_n개를 찾아 필요 역량을 생성합니다 (similar_postings → get_required_skills).
+        """
+        with self.pin_snapshot():
+            similar, scores = self.similar_postings(job_posting, top_n, return_scores=True)
+        return self.get_required_skills(job, job_posting, similar, scores, stream=stream)
+
+    ###########################################################################
+    # 3. 자기소개서 글감
+    ###########################################################################
+
+    @traced()
+    def generate_statement_for_category(self, job, category, activity, skills, stream=False):
+        return self._generate(statement_prompt(job, category, activity, skills), temperature=0.3, stream=stream)
+
+    def generate_personal_statement(self, job, selected_categories, activities, skills):
+        """
+        선택한 문항별 글감과 개요를 {문항: 내용}으로 반환합니다. 문항별 생성은 동시에 실행합니다.
+        """
+        stages = [
+            Stage(category, partial(self.generate_statement_for_category, job, category, activity, skills))
+            for category, activity in zip(selected_categories, activities)
+        ]
+        results, _ = run_pipeline(stages, max_concurrency=self.max_concurrency)
+
+        # 선택한 문항 순서 유지
+        return {category: results[category] for category in selected_categories}
+
+    ###########################################################################
+    # 4. 면접 질문
+    ###########################################################################
+
+    @traced()
+    def generate_q1(self, job, personal_statement, stream=False):
+        return self._generate(q1_prompt(job, personal_statement), temperature=0, stream=stream)
+
+    @traced()
+    def generate_news_keyword(self, job, company):
+        """
+        뉴스 검색 키워드 리스트.
+        """
+        content = self._generate(news_keyword_prompt(job, company), temperature=0.8)
+
+        # 키워드 리스트 생성
+        keywords = []
+        for line in content.split("\n"):
+            if line.startswith("- 키워드"):
+                keyword = line.split(":")[1].strip()
+                keyword = keyword.strip('"').strip("'")
+                keywords.append(keyword)
+        return keywords
+
+    @traced()
+    def search_news_by_keyword(self, keyword, limit=30):
+        """
+        keyword의 최신 기사를 limit개까지 DataFrame으로 반환합니다.
+        """
+        return self.news_store.search(keyword, limit=limit)
+
+    @traced()
+    def search_news_by_keywords(self, keywords, limit=30):
+        """
+        여러 키워드의 최신 기사를 동시에 검색하여 keywords 순서대로 DataFrame 리스트를 반환합니다.
+        로컬 뉴스 저장소가 오래되었을 때만 DeepSearch에서 새 기사를 가져옵니다.
+        """
+        return self.news_store.search_many(keywords, limit=limit)
+
+    @traced("cluster_news")
+    def cluster_news_with_text(self, news):
+        """
+        뉴스 요약을 클러스터링하여 ({cluster_id: DataFrame}, 클러스터 텍스트)를 반환합니다.
+        요약의 전처리 결과는 뉴스 저장소에 저장되어 재사용됩니다.
+        """
+        return cluster_news_and_text(news, preprocess_many=self.news_store.cached_many(kr_text.preprocess_many))
+
+    def cluster_news(self, news):
+        """
+        뉴스 요약을 클러스터링하여 {cluster_id: DataFrame}을 반환합니다.
+        """
+        return self.cluster_news_with_text(news)[0]
+
+    @traced()
+    def summarize_cluster(self, text, job, company, keyword, stream=False):
+        return self._generate(summarize_cluster_prompt(text, job, company, keyword), temperature=0, stream=stream)
+
+    @traced()
+    def generate_q2(self, job, company, keyword, topic, text):
+        """
+        선택한 뉴스 토픽 기반 질문을 줄 단위 리스트로 반환합니다.
+        """
+        content = self._generate(q2_prompt(job, company, keyword, topic, text), temperature=0)
+        return [q.strip() for q in content.split("\n") if q.strip()]
+
+    @traced()
+    def extract_keywords(self, job_posting, max_keywords=10):
+        """
+        공고 DB 전체로 미리 계산한 IDF(keyword_model.py)로 공고의 명사를 점수화하여
+        상위 max_keywords개 키워드를 반환합니다.
+        """
+        return get_keyword_model().extract(Kr_preprocessing2(job_posting), max_keywords)
+
+    @traced()
+    def generate_q3(self, job, keywords, job_posting, stream=False):
+        """
+        LLM을 이용하여 직무와 관련된 지식 중심의 질문을 생성합니다.
+        """
+        return self._generate(q3_prompt(job, keywords, job_posting), temperature=0.7, max_tokens=300, stream=stream)
+
+    def interview(self, job, company, job_posting, personal_statement, include_news=True):
+        """
+        면접 질문 단계를 DAG로 실행하여 (결과 dict, 단계별 소요 시간)을 반환합니다.
+        결과: q1, keywords, q3, (include_news이면) news_keywords, news, clusters, trends
+        활동 기반 질문, 뉴스 트렌드 분석, 단순 기술 질문은 서로 독립적이므로 동시에 실행합니다.
+        """
+        stages = [
+            Stage("q1", partial(self.generate_q1, job, personal_statement)),
+            Stage("keywords", partial(self.extract_keywords, job_posting, 10)),
+            Stage("q3", lambda keywords: self.generate_q3(job, keywords, job_posting), deps=("keywords",)),
+        ]
+
+        # 뉴스 키워드 → 뉴스 검색 → 클러스터링 → 클러스터 요약 (키워드별 체인은 서로 병렬)
+        if include_news:
+            stages += [
+                Stage("news_keywords", partial(self.generate_news_keyword, job, company)),
+                Stage("news", self.search_news_by_keywords, deps=("news_keywords",)),
+            ]
+            for i in range(NEWS_KEYWORD_COUNT):
+                stages += [
+                    # 클러스터 dict와 클러스터 텍스트를 한 번의 클러스터링으로 생성
+                    Stage(f"clusters{i}", lambda news, i=i: self.cluster_news_with_text(news[i]), deps=("news",)),
+                    Stage(f"trend{i}",
+                          lambda clusters, keywords, i=i: self.summarize_cluster(clusters[1], job, company, keywords[i]).split('\n\n'),
+                          deps=(f"clusters{i}", "news_keywords")),
+                ]
+
+        results, timings = run_pipeline(stages, max_concurrency=self.max_concurrency)
+        if include_news:
+            results["clusters"] = [results.pop(f"clusters{i}") for i in range(NEWS_KEYWORD_COUNT)]
+            results["trends"] = [results.pop(f"trend{i}") for i in range(NEWS_KEYWORD_COUNT)]
+        return results, timings
+
+    ###########################################################################
+    # 헤드리스 실행 (batch_runner.py)
+    ###########################################################################
+
+    def warm_up(self):
+        """
+        첫 요청에서 생기는 1회성 로딩(공고 DB, 직무명 역색인, Kiwi, 키워드 모델, 임베딩 저장소)을 미리 수행합니다.
+        """
+        self.warm_snapshot(self.snapshot())
+        get_keyword_model()
+
+    def warm_snapshot(self, snapshot):
+        """
+        snapshot의 직무명 역색인, 검색 인덱스, BM25 행렬을 미리 만듭니다.
+        posting_index.PostingIndex.start_refresher의 warm으로 넘기면 새 스냅샷을 내보내기 전에 실행됩니다.
+        """
+        token = _pinned_snapshot.set(snapshot)
+        try:
+            self.search_db_candidates("", k=1)
+            snapshot.frame("total_sum")
+            self._retrieval_index(snapshot)
+            if self.retrieval_mode != "dense":
+                self._bm25_index(snapshot)
+        finally:
+            _pinned_snapshot.reset(token)
+
+    def start_index_maintenance(self, compact_interval=COMPACT_INTERVAL):
+        """
+        세그먼트 공고 인덱스를 쓸 때 백그라운드 스레드 두 개를 시작합니다 (프로세스당 한 번, 없으면 아무 일 없음).
+          * 새 스냅샷을 요청 밖에서 열고 warm_snapshot으로 준비한 뒤 교체 (요청은 준비된 스냅샷만 사용)
+          * compact_interval초마다 필요할 때만 압축 (posting_index.start_compactor)
+        """
+        if self.posting_index is None or self._maintenance is not None:
+            return
+        self._maintenance = (
+            self.posting_index.start_refresher(self.warm_snapshot),
+            start_compactor(self.posting_index.path, compact_interval),
+        )
+
+    def generate_guide(self, job, company, top_n=3, max_keywords=10):
+        """
+        (직무, 회사) 하나에 대한 가이드를 생성하여 dict로 반환합니다. LLM 오류는 LLMError로 올립니다.
+        공고 생성 후 유사 공고 검색 → 필요 역량, 키워드 → 면접 질문은 서로 독립이므로 동시에 실행합니다.
+        search_db와 유사 공고 검색은 같은 공고 스냅샷을 사용합니다.
+        """
+        stages = [
+            Stage("job_posting", partial(self.generate_job_posting, job, company)),
+            Stage("similar_postings", partial(self.similar_postings, top_n=top_n, return_scores=True),
+                  deps=("job_posting",)),
+            Stage("required_skills", lambda job_posting, similar: self.get_required_skills(job, job_posting, *similar),
+                  deps=("job_posting", "similar_postings")),
+            Stage("keywords", partial(self.extract_keywords, max_keywords=max_keywords), deps=("job_posting",)),
+            Stage("questions", lambda job_posting, keywords: self.generate_q3(job, keywords, job_posting),
+                  deps=("job_posting", "keywords")),
+        ]
+        with self.pin_snapshot():
+            results, timings = run_pipeline(stages, max_concurrency=self.max_concurrency)
+        results["similar_postings"] = results["similar_postings"][0]
+        return {
+            "job": job,
+            "company": company,
+            **results,
+            "timings": {name: round(t["duration"], 3) for name, t in timings.items()},
+        }
+
+
+def create_pipeline(llm_client=None, embedding_api_client=None, llm_cache=None, embedding_cache=None,
+                    rate_limits=None, embedding_backend=None, **kwargs):
+    """
+    환경 변수의 API 키로 기본 클라이언트를 만들어 파이프라인을 생성합니다.
+    OPENAI_API_KEY: gpt-4o-mini, UPSTAGE_API_KEY: Upstage solar 임베딩
+    embedding_backend: 쿼리 임베딩 백엔드. 없으면 EMBEDDING_BACKEND (remote / lsa / onnx, embedding_backend.py)
+    LLM 클라이언트는 RateLimitedClient로 감싸 RPM/TPM 한도, 재시도, 동시 실행 조절을 적용합니다 (llm_client.py).
+    rate_limits: RateLimitedClient 설정 (예: {"rpm": 500, "tpm": 200_000})
+    POSTING_INDEX_DIR에 세그먼트 공고 인덱스가 있으면 그것을 사용합니다 (posting_index.py).
+    """
+    if llm_client is None:
+        import openai
+        # 재시도는 RateLimitedClient가 담당하므로 SDK 자체 재시도는 끔
+        llm_client = openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""), max_retries=0)
+    if not isinstance(llm_client, RateLimitedClient):
+        llm_client = RateLimitedClient(llm_client, **(rate_limits or {}))
+    if embedding_backend is None:
+        # remote는 embedding_api_client(없으면 UPSTAGE_API_KEY로 생성)를 사용
+        embedding_backend = make_backend("remote" if embedding_api_client is not None else None,
+                                         client=embedding_api_client)
+    # 배치 요청 + SQLite 영구 캐시 + 중복 요청 병합을 담당하는 임베딩 클라이언트
+    embedding_client = EmbeddingClient(backend=embedding_backend, cache=embedding_cache)
+    # temperature=0 호출 응답 캐시 (같은 프롬프트 재호출 방지)
+    llm_cache = llm_cache if llm_cache is not None else LLMCache()
+    if "posting_index" not in kwargs:
+        kwargs["posting_index"] = open_posting_index()
+    return CareerGuidePipeline(llm_client, embedding_client, llm_cache=llm_cache, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_pipeline():
+    """
+    기본 설정 파이프라인 (프로세스 단위 싱글톤).
+    """
+    return create_pipeline()
@@ -0,0 +1,337 @@
+import os
+import copy
+import json
+import time
+import argparse
+import numpy as np
+
+from reranker import top_k_indices
+
+
+###############################################################################
+# 압축 임베딩 인덱스 (RETRIEVAL_BACKEND=compact)
+# - 필드별 임베딩을 (선택) 차원 축소 후 float16 또는 int8(스칼라 양자화) 코드로 메모리에 보관
+#     * reduce="pca"    : 코퍼스 표본의 주성분(상위 특이벡터)으로 투영 (중심화하지 않아 내적 보존에 유리)
+#     * reduce="random" : 가우시안 랜덤 투영 (학습 없음)
+#     * int8            : 차원별 최대 절댓값으로 [-127, 127]에 대칭 양자화
+# - 검색: 압축 코드로 전체를 훑어 상위 shortlist개 후보를 고른 뒤,
+#   후보만 저장소(memmap)의 원본 float32 벡터로 정확한 가중 점수를 다시 계산
+# - 전체 float32 가중 결합 행렬(3 × N × D)을 메모리에 만들지 않음 (reranker.FusedReranker.rows)
+#
+#   python compact_index.py                       # 합성 코퍼스로 메모리 절감 / top-3 일치율 비교
+#   python compact_index.py --store embedding_store
+###############################################################################
+
+COMPACT_INDEX_PATH = os.environ.get("COMPACT_INDEX_PATH", "compact_index.npz")
+COMPACT_DTYPE = os.environ.get("COMPACT_DTYPE", "int8")        # float16 / int8
+COMPACT_REDUCE = os.environ.get("COMPACT_REDUCE", "") or None  # pca / random / (없음)
+COMPACT_DIM = int(os.environ.get("COMPACT_DIM", 256))          # 차원 축소 시 필드별 차원
+COMPACT_SHORTLIST = int(os.environ.get("COMPACT_SHORTLIST", 32))
+
+DTYPES = {"float16": np.float16, "int8": np.int8}
+
+
+class CompactIndex:
+    """
+    압축 코드로 후보를 고르고 원본 벡터로 재정렬하는 검색 인덱스.
+    search()는 다른 백엔드(ann_index.py)와 같이 reranker.encode_queries()의 (B, F*D) 쿼리를 받습니다.
+
+        index = CompactIndex(dtype="int8", reduce="pca", dim=256).build(reranker)
+        indices, scores = index.search(reranker.encode_queries(queries), k=3)
+    """
+
+    def __init__(self, dtype=COMPACT_DTYPE, reduce=COMPACT_REDUCE, dim=COMPACT_DIM,
+                 shortlist=COMPACT_SHORTLIST, train_size=20_000, seed=0, chunk_size=65536):
+        if dtype not in DTYPES:
+            raise ValueError(f"지원하지 않는 압축 형식입니다: {dtype}")
+        if reduce not in (None, "pca", "random"):
+            raise ValueError(f"지원하지 않는 차원 축소 방식입니다: {reduce}")
+        self.dtype = dtype
+        self.reduce = reduce
+        self.dim = dim
+        self.shortlist = shortlist
+        self.train_size = train_size
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+        self.reranker = None
+        self.projections = None   # {필드: (D, d) 투영 행렬 또는 None}
+        self.scales = None        # int8: (F*d,) 차원별 역양자화 배율
+        self.codes = None         # (N, F*d) float16 / int8
+        self.fingerprint = None   # 코드를 만든 저장소 내용 + 가중치 해시 (FusedReranker.fingerprint)
+        self.trained_rows = None  # fit 당시 행 수
+
+    def _project(self, field, x):
+        projection = self.projections[field]
+        x = np.asarray(x, dtype=np.float32)
+        return x if projection is None else x @ projection
+
+    def fit(self, reranker):
+        """
+        필드별 투영 행렬과 int8 배율을 학습합니다. 저장소 전체가 아닌 표본과 청크 단위로 읽습니다.
+        """
+        self.reranker = reranker
+        store = reranker.store
+        n, full_dim = len(store), reranker.dim
+        rng = np.random.default_rng(self.seed)
+        sample = np.arange(n) if n <= self.train_size else np.sort(rng.choice(n, self.train_size, replace=False))
+
+        self.projections = {}
+        for i, field in enumerate(reranker.fields):
+            if self.reduce is None:
+                self.projections[field] = None
+            elif self.reduce == "pca":
+                # 표본의 (D, D) 2차 모멘트 행렬 고유벡터 = 표본 SVD의 오른쪽 특이벡터
+                gram = np.zeros((full_dim, full_dim), dtype=np.float64)
+                for start in range(0, len(sample), self.chunk_size):
+                    x = np.asarray(store[field][sample[start:start + self.chunk_size]], dtype=np.float64)
+                    gram += x.T @ x
+                _, vectors = np.linalg.eigh(gram)
+                dim = min(self.dim, full_dim, len(sample))
+                self.projections[field] = np.ascontiguousarray(vectors[:, ::-1][:, :dim], dtype=np.float32)
+            else:
+                field_rng = np.random.default_rng(self.seed + i)
+                dim = min(self.dim, full_dim)
+                self.projections[field] = (
+                    field_rng.standard_normal((full_dim, dim)) / np.sqrt(dim)
+                ).astype(np.float32)
+
+        if self.dtype == "int8":
+            max_abs = np.concatenate([
+                np.max([np.abs(self._project(field, store[field][start:start + self.chunk_size])).max(axis=0)
+                        for start in range(0, n, self.chunk_size)], axis=0)
+                for field in reranker.fields
+            ])
+            max_abs[max_abs == 0] = 1.0
+            self.scales = (max_abs / 127.0).astype(np.float32)
+        self.trained_rows = n
+        return self
+
+    def reuse(self, reranker):
+        """
+        투영 행렬과 int8 배율은 그대로 두고 reranker의 모든 행만 다시 압축한 새 인덱스.
+        필드/차원/가중치가 다르거나 fit 이후 행 수가 두 배를 넘었으면 None (다시 fit해야 함).
+        int8 배율을 넘는 새 행의 값은 ±127로 잘립니다 (재정렬이 원본 벡터로 점수를 다시 계산).
+        """
+        old = self.reranker
+        if (self.projections is None or not self.trained_rows or old.fields != reranker.fields
+                or old.dim != reranker.dim or old.weights != reranker.weights
+                or len(reranker) > 2 * self.trained_rows):
+            return None
+        index = copy.copy(self)
+        index.reranker = reranker
+        index.fingerprint = reranker.fingerprint()
+        return index.add(reranker)
+
+    def _encode(self, rows):
+        parts = np.hstack([self._project(field, rows[field]) for field in self.reranker.fields])
+        if self.dtype == "int8":
+            return np.clip(np.rint(parts / self.scales), -127, 127).astype(np.int8)
+        return parts.astype(np.float16)
+
+    def add(self, reranker=None):
+        """
+        저장소의 모든 행을 청크 단위로 압축 코드로 변환합니다.
+        """
+        reranker = reranker or self.reranker
+        store = reranker.store
+        n = len(store)
+        chunks = []
+        for start in range(0, n, self.chunk_size):
+            rows = {field: store[field][start:start + self.chunk_size] for field in reranker.fields}
+            chunks.append(self._encode(rows))
+        self.codes = np.concatenate(chunks) if chunks else np.empty((0, 0), dtype=DTYPES[self.dtype])
+        return self
+
+    def build(self, reranker):
+        self.fingerprint = reranker.fingerprint()
+        return self.fit(reranker).add(reranker)
+
+    def encode_queries(self, queries):
+        """
+        (B, F*D) 쿼리를 압축 코드 공간의 (B, F*d) 쿼리로 바꿉니다.
+        필드 가중치와 int8 배율을 쿼리 쪽에 곱해 코드와의 내적이 곧 근사 가중 점수가 되도록 합니다.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        full_dim = self.reranker.dim
+        parts = [
+            self._project(field, queries[:, i * full_dim:(i + 1) * full_dim]) * np.float32(self.reranker.weights[field])
+            for i, field in enumerate(self.reranker.fields)
+        ]
+        encoded = np.hstack(parts)
+        return encoded * self.scales if self.dtype == "int8" else encoded
+
+    def approx_scores(self, queries):
+        """
+        압축 코드로 계산한 근사 점수 (B, N).
+        """
+        encoded = self.encode_queries(queries)
+        scores = np.empty((len(encoded), len(self.codes)), dtype=np.float32)
+        for start in range(0, len(self.codes), self.chunk_size):
+            block = self.codes[start:start + self.chunk_size].astype(np.float32)
+            scores[:, start:start + len(block)] = encoded @ block.T
+        return scores
+
+    def search(self, queries, k, shortlist=None):
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        shortlist = max(k, self.shortlist if shortlist is None else shortlist)
+        candidates = top_k_indices(self.approx_scores(queries), shortlist)
+
+        out_idx = np.empty((len(queries), min(k, candidates.shape[1])), dtype=np.int64)
+        out_scores = np.empty(out_idx.shape, dtype=np.float32)
+        for qi, query in enumerate(queries):
+            # memmap은 정렬된 행 번호로 읽는 것이 빠름
+            ids = np.sort(candidates[qi])
+            exact = self.reranker.rows(ids) @ query
+            best = top_k_indices(exact, k)[0]
+            out_idx[qi] = ids[best]
+            out_scores[qi] = exact[best]
+        return out_idx, out_scores
+
+    def memory(self):
+        """
+        압축 인덱스와 전체 float32 가중 결합 행렬의 메모리(바이트).
+        """
+        full = len(self.codes) * len(self.reranker.fields) * self.reranker.dim * 4
+        extra = sum(p.nbytes for p in self.projections.values() if p is not None)
+        extra += self.scales.nbytes if self.scales is not None else 0
+        compact = self.codes.nbytes + extra
+        return {"full_bytes": full, "compact_bytes": compact, "saved": 1 - compact / full if full else 0.0}
+
+    def save(self, path):
+        params = {"dtype": self.dtype, "reduce": self.reduce, "dim": self.dim, "shortlist": self.shortlist,
+                  "fields": list(self.reranker.fields), "fingerprint": self.fingerprint}
+        arrays = {f"projection_{field}": p for field, p in self.projections.items() if p is not None}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        np.savez(path, params=np.array(json.dumps(params)), codes=self.codes, **arrays)
+
+    @classmethod
+    def load(cls, path, reranker):
+        data = np.load(path)
+        params = json.loads(str(data["params"]))
+        if params["fields"] != list(reranker.fields):
+            raise ValueError("압축 인덱스의 필드가 재정렬기와 다릅니다.")
+        index = cls(dtype=params["dtype"], reduce=params["reduce"], dim=params["dim"], shortlist=params["shortlist"])
+        index.reranker = reranker
+        index.projections = {field: data[f"projection_{field}"] if f"projection_{field}" in data else None
+                             for field in reranker.fields}
+        index.scales = data["scales"] if "scales" in data else None
+        index.codes = data["codes"]
+        index.fingerprint = params.get("fingerprint")
+        index.trained_rows = len(index.codes)
+        return index
+
+
+def load_or_build(reranker, path=None):
+    """
+    path(기본 COMPACT_INDEX_PATH)의 압축 인덱스를 불러옵니다. 없거나 설정(형식/축소 방식/차원)이나
+    저장소 내용(FusedReranker.fingerprint)이 다르면 새로 만들어 저장합니다.
+    """
+    path = path or COMPACT_INDEX_PATH
+    if os.path.exists(path):
+        index = CompactIndex.load(path, reranker)
+        if (index.fingerprint == reranker.fingerprint() and index.dtype == COMPACT_DTYPE
+                and index.reduce == COMPACT_REDUCE and index.dim == COMPACT_DIM):
+            return index
+    index = CompactIndex().build(reranker)
+    index.save(path)
+    return index
+
+
+###############################################################################
+# 벤치마크: 정확 검색 대비 메모리 절감과 top-3 일치율
+###############################################################################
+
+CONFIGS = [
+    ("float16", None),
+    ("int8", None),
+    ("float16", "pca"),
+    ("int8", "pca"),
+    ("int8", "random"),
+]
+
+
+def make_synthetic_store(out_dir, n, dim, n_topics=512, seed=0):
+    """
+    행마다 하나의 주제를 공유하는 세 필드 임베딩을 만들어 저장소로 저장합니다.
+    """
+    from embedding_store import FIELDS, write_store
+
+    rng = np.random.default_rng(seed)
+    topic_ids = rng.integers(0, n_topics, n)
+    matrices = {}
+    for field in FIELDS:
+        topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+        matrices[field] = topics[topic_ids] + 0.8 * rng.standard_normal((n, dim)).astype(np.float32)
+    write_store(matrices, out_dir, source="synthetic")
+
+
+def make_queries(reranker, n_queries, noise=0.3, seed=1):
+    """
+    저장소 행에 잡음을 더한 필드별 쿼리 (생성된 공고가 DB 공고와 비슷한 상황을 흉내 냄).
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(reranker.store), n_queries, replace=False))
+    queries = {}
+    for field in reranker.fields:
+        base = np.asarray(reranker.store[field][rows], dtype=np.float32)
+        queries[field] = base + noise * rng.standard_normal(base.shape).astype(np.float32) / np.sqrt(base.shape[1])
+    return reranker.encode_queries(queries)
+
+
+def benchmark(store_dir, n_queries=200, k=3, dim=COMPACT_DIM, shortlist=COMPACT_SHORTLIST):
+    from embedding_store import EmbeddingStore
+    from reranker import FusedReranker
+    from ann_index import ExactIndex
+
+    reranker = FusedReranker(EmbeddingStore(store_dir))
+    queries = make_queries(reranker, min(n_queries, len(reranker.store)))
+
+    start = time.perf_counter()
+    exact = ExactIndex(reranker)
+    truth, _ = exact.search(queries, k)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"[exact]  {len(reranker.store):,} x 3 x {reranker.dim}  "
+          f"{np.prod(reranker.shape) * 4 / 2**20:.1f}MB  {exact_ms:.2f} ms/query")
+
+    for dtype, reduce in CONFIGS:
+        start = time.perf_counter()
+        index = CompactIndex(dtype=dtype, reduce=reduce, dim=dim, shortlist=shortlist).build(reranker)
+        build_s = time.perf_counter() - start
+
+        for sl in (0, shortlist):
+            start = time.perf_counter()
+            if sl:
+                found, _ = index.search(queries, k, shortlist=sl)
+            else:
+                found = top_k_indices(index.approx_scores(queries), k)
+            ms = (time.perf_counter() - start) * 1000 / len(queries)
+            overlap = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+            same = np.mean([list(f) == list(t) for f, t in zip(found, truth)])
+            memory = index.memory()
+            name = f"{dtype}" + (f"+{reduce}{dim}" if reduce else "")
+            print(f"[{name:<14}] shortlist={sl:<3} {memory['compact_bytes'] / 2**20:7.1f}MB "
+                  f"({memory['saved']:.0%} 절감)  top-{k} 겹침 {overlap:.3f}  순위 일치 {same:.3f}  "
+                  f"{ms:.2f} ms/query  (빌드 {build_s:.1f}s)")
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="압축 임베딩 인덱스 vs 정확 검색 비교")
+    parser.add_argument("--store", help="임베딩 저장소 디렉토리 (없으면 합성 코퍼스)")
+    parser.add_argument("--n", type=int, default=20_000, help="합성 코퍼스 공고 수")
+    parser.add_argument("--full-dim", type=int, default=1024, help="합성 코퍼스 임베딩 차원")
+    parser.add_argument("--dim", type=int, default=COMPACT_DIM, help="차원 축소 시 필드별 차원")
+    parser.add_argument("--shortlist", type=int, default=COMPACT_SHORTLIST)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.store:
+        benchmark(args.store, args.queries, dim=args.dim, shortlist=args.shortlist)
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            store_dir = os.path.join(workdir, "store")
+            make_synthetic_store(store_dir, args.n, args.full_dim)
+            benchmark(store_dir, args.queries, dim=args.dim, shortlist=args.shortlist)
@@ -0,0 +1,364 @@
+import os
+import time
+import hashlib
+import argparse
+import threading
+import numpy as np
+
+import kr_text
+from embedding_store import FIELDS, DEFAULT_PASSAGE_MODEL, normalize_rows
+
+
+###############################################################################
+# 임베딩 백엔드 (쿼리/공고 텍스트 → 벡터)
+# - remote : Upstage solar API (embedding-query / embedding-passage). 검색마다 네트워크 왕복
+# - lsa    : 공고 코퍼스로 학습한 TF-IDF(Kiwi 명사) → SVD 투영. numpy 행렬 곱만으로 CPU에서 임베딩
+#            (학습에만 scikit-learn 사용, 모델은 어휘 + IDF + 투영 행렬 .npz)
+# - onnx   : 로컬 ONNX 문장 인코더 (onnxruntime + tokenizers 설치 시, mean pooling)
+# - 공고 임베딩 저장소 manifest의 model과 백엔드의 passage_model이 같아야 검색 가능
+#   → 백엔드를 바꾸면 reembed로 공고 DB 전체를 다시 임베딩 (세그먼트 인덱스가 있으면 세그먼트 하나로 교체)
+#
+#   EMBEDDING_BACKEND=lsa
+#   python embedding_backend.py fit                  # LSA 모델 학습 (lsa_model.npz)
+#   python embedding_backend.py reembed              # 공고 DB를 EMBEDDING_BACKEND로 재임베딩
+#   python embedding_backend.py eval                 # 기준(remote) 저장소 대비 검색 겹침 / latency
+###############################################################################
+
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "remote")  # remote / lsa / onnx
+
+LSA_MODEL_VERSION = 1
+LSA_MODEL_PATH = os.environ.get("LSA_MODEL_PATH", "lsa_model.npz")
+LSA_DIM = int(os.environ.get("LSA_DIM", 256))
+
+ONNX_MODEL_PATH = os.environ.get("ONNX_MODEL_PATH", "encoder.onnx")
+ONNX_TOKENIZER_PATH = os.environ.get("ONNX_TOKENIZER_PATH", "tokenizer.json")
+# e5 계열처럼 쿼리/문서 접두어를 요구하는 인코더용
+ONNX_QUERY_PREFIX = os.environ.get("ONNX_QUERY_PREFIX", "")
+ONNX_PASSAGE_PREFIX = os.environ.get("ONNX_PASSAGE_PREFIX", "")
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def upstage_client():
+    from openai import OpenAI  # Requires openai==1.52.2
+
+    return OpenAI(api_key=os.environ.get("UPSTAGE_API_KEY", ""), base_url="https://api.upstage.ai/v1/solar")
+
+
+class RemoteBackend:
+    """
+    OpenAI 호환 임베딩 API. 쿼리와 공고에 서로 다른 모델을 씁니다.
+    """
+
+    def __init__(self, client, query_model="embedding-query", passage_model=DEFAULT_PASSAGE_MODEL, batch_size=100):
+        self.client = client
+        self.query_model = query_model
+        self.passage_model = passage_model
+        self.batch_size = batch_size
+
+    def embed_queries(self, texts):
+        response = self.client.embeddings.create(input=list(texts), model=self.query_model)
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.array([item.embedding for item in data], dtype=np.float32)
+
+    def embed_passages(self, texts):
+        from embedding_store import embed_texts
+
+        return embed_texts(self.client, list(texts), model=self.passage_model, batch_size=self.batch_size)
+
+
+class LsaBackend:
+    """
+    TF-IDF(1 + log tf, smooth idf, L2 정규화) → SVD 투영 (D,). 쿼리와 공고에 같은 모델을 씁니다.
+
+        backend = LsaBackend.fit(texts, dim=256)
+        backend.embed_queries(["데이터 분석 경험", "SQL, Python"])   # (2, D)
+    """
+
+    def __init__(self, vocab, idf, components):
+        self.vocab = np.asarray(vocab)
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.components = np.ascontiguousarray(components, dtype=np.float32)   # (D, V)
+        self.index = {term: i for i, term in enumerate(self.vocab.tolist())}
+        # 같은 경로라도 다시 학습하면 다른 모델 → 이전 모델로 만든 저장소와 섞이지 않도록 내용 해시를 이름에 포함
+        digest = hashlib.sha256(self.components.tobytes())
+        digest.update("\0".join(self.vocab.tolist()).encode("utf-8"))
+        self.query_model = self.passage_model = f"lsa-{self.components.shape[0]}-{digest.hexdigest()[:12]}"
+
+    @property
+    def dim(self):
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, texts, dim=LSA_DIM, seed=42):
+        """
+        텍스트 리스트(공고 요약 필드마다 문서 하나)로 어휘, IDF, SVD 투영을 학습합니다.
+        """
+        from scipy import sparse
+        from sklearn.decomposition import TruncatedSVD
+
+        token_lists = kr_text.nouns_many(list(texts))
+        vocab = sorted({term for tokens in token_lists for term in tokens})
+        index = {term: i for i, term in enumerate(vocab)}
+        df = np.zeros(len(vocab), dtype=np.float64)
+        for tokens in token_lists:
+            df[[index[term] for term in set(tokens)]] += 1
+        idf = np.log((len(token_lists) + 1) / (df + 1)) + 1.0
+
+        rows, cols, values = [], [], []
+        for row, tokens in enumerate(token_lists):
+            ids, tf = np.unique(np.array([index[term] for term in tokens], dtype=np.int64), return_counts=True)
+            weights = (1.0 + np.log(tf)) * idf[ids]
+            rows.append(np.full(len(ids), row))
+            cols.append(ids)
+            values.append(weights / (np.linalg.norm(weights) or 1.0))
+        tfidf = sparse.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                                  shape=(len(token_lists), len(vocab)))
+        dim = min(dim, tfidf.shape[0] - 1, tfidf.shape[1] - 1)
+        svd = TruncatedSVD(n_components=dim, random_state=seed).fit(tfidf)
+        return cls(vocab, idf, svd.components_)
+
+    def save(self, path=LSA_MODEL_PATH):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, version=LSA_MODEL_VERSION, vocab=self.vocab, idf=self.idf,
+                            components=self.components)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=LSA_MODEL_PATH):
+        data = np.load(path, allow_pickle=False)
+        if int(data["version"]) != LSA_MODEL_VERSION:
+            raise ValueError(f"지원하지 않는 LSA 모델 버전입니다: {int(data['version'])}")
+        return cls(data["vocab"], data["idf"], data["components"])
+
+    def tfidf(self, texts):
+        """
+        (B, V) TF-IDF 행렬 (어휘에 없는 단어는 무시).
+        """
+        matrix = np.zeros((len(texts), len(self.vocab)), dtype=np.float32)
+        for row, tokens in enumerate(kr_text.nouns_many(list(texts))):
+            ids = [self.index[term] for term in tokens if term in self.index]
+            if not ids:
+                continue
+            ids, tf = np.unique(ids, return_counts=True)
+            matrix[row, ids] = (1.0 + np.log(tf)) * self.idf[ids]
+        return normalize_rows(matrix)
+
+    def embed_queries(self, texts):
+        return self.tfidf(texts) @ self.components.T
+
+    def embed_passages(self, texts, batch_size=1000):
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.vstack([self.embed_queries(texts[start:start + batch_size])
+                          for start in range(0, len(texts), batch_size)])
+
+
+class OnnxBackend:
+    """
+    로컬 ONNX 문장 인코더 (Hugging Face tokenizer.json + 인코더 .onnx). 마지막 은닉 상태를 mean pooling 합니다.
+    """
+
+    def __init__(self, model_path=ONNX_MODEL_PATH, tokenizer_path=ONNX_TOKENIZER_PATH, max_length=256,
+                 query_prefix=ONNX_QUERY_PREFIX, passage_prefix=ONNX_PASSAGE_PREFIX, batch_size=32):
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError("onnx 임베딩 백엔드에는 onnxruntime과 tokenizers가 필요합니다.") from e
+
+        self.session = onnxruntime.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self.input_names = {item.name for item in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding()
+        self.query_prefix = query_prefix
+        self.passage_prefix = passage_prefix
+        self.batch_size = batch_size
+        stem = os.path.splitext(os.path.basename(model_path))[0]
+        self.query_model = self.passage_model = f"onnx-{stem}-{os.path.getsize(model_path)}"
+
+    def _encode(self, texts):
+        encodings = self.tokenizer.encode_batch(list(texts))
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+        mask = inputs["attention_mask"][:, :, None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1.0)
+
+    def embed_queries(self, texts):
+        return self._encode([self.query_prefix + text for text in texts]).astype(np.float32)
+
+    def embed_passages(self, texts):
+        texts = [self.passage_prefix + text for text in texts]
+        return np.vstack([self._encode(texts[start:start + self.batch_size])
+                          for start in range(0, len(texts), self.batch_size)]).astype(np.float32)
+
+
+def fit_lsa(path=LSA_MODEL_PATH, dim=LSA_DIM, postings=None):
+    """
+    공고 DB의 세 요약 열로 LSA 모델을 학습하여 저장합니다.
+    """
+    from posting_store import PostingStore
+
+    db = (postings or PostingStore()).frame(*FIELDS)
+    texts = [text for field in FIELDS for text in db[field].fillna("").astype(str).tolist() if text.strip()]
+    backend = LsaBackend.fit(texts, dim=dim)
+    backend.save(path)
+    return backend
+
+
+def make_backend(name=None, client=None):
+    """
+    이름(remote / lsa / onnx, 기본 EMBEDDING_BACKEND)으로 백엔드를 만듭니다.
+    remote는 client(없으면 UPSTAGE_API_KEY로 생성)를 쓰고, 로컬 백엔드는 프로세스 단위로 한 번만 로드합니다.
+    """
+    name = name or EMBEDDING_BACKEND
+    if name == "remote":
+        return RemoteBackend(client if client is not None else upstage_client())
+    if name not in ("lsa", "onnx"):
+        raise ValueError(f"알 수 없는 임베딩 백엔드입니다: {name}")
+
+    backend = _backends.get(name)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(name)
+            if backend is None:
+                if name == "lsa":
+                    backend = LsaBackend.load() if os.path.exists(LSA_MODEL_PATH) else fit_lsa()
+                else:
+                    backend = OnnxBackend()
+                _backends[name] = backend
+    return backend
+
+
+###############################################################################
+# 재임베딩 배치 작업
+###############################################################################
+
+def reembed(backend, posting_index_path=None, store_dir=None, postings=None):
+    """
+    공고 DB 전체를 backend로 다시 임베딩합니다.
+    세그먼트 공고 인덱스(posting_index.py)가 있으면 세그먼트 하나로 교체하고, 없으면 임베딩 저장소를 다시 씁니다.
+    반환: 커밋된 manifest
+    """
+    import posting_index
+    from embedding_store import DEFAULT_STORE_DIR, write_store
+    from posting_store import PostingStore
+
+    index_path = posting_index_path or posting_index.POSTING_INDEX_DIR
+    if os.path.exists(os.path.join(index_path, posting_index.MANIFEST_NAME)):
+        return posting_index.reembed(backend, index_path)
+
+    from ann_index import ANN_INDEX_PATH
+    from compact_index import COMPACT_INDEX_PATH
+
+    db = (postings or PostingStore()).frame(*FIELDS)
+    matrices = {field: backend.embed_passages(db[field].fillna("").astype(str).tolist()) for field in FIELDS}
+    manifest = write_store(matrices, store_dir or DEFAULT_STORE_DIR, source="reembed", model=backend.passage_model)
+    # 이전 임베딩으로 학습해 저장한 검색 인덱스는 행 수가 같아도 쓸 수 없으므로 지움 (다음 로딩 때 다시 생성)
+    for path in (ANN_INDEX_PATH, COMPACT_INDEX_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+    return manifest
+
+
+###############################################################################
+# 오프라인 평가: 기준 저장소(remote) 대비 로컬 백엔드의 유사 공고 겹침과 쿼리 임베딩 latency
+# - 공고 n건을 쿼리로 삼아 (자기 자신 제외) 가중 코사인 상위 k개를 두 저장소에서 각각 구해 겹침 비율 계산
+#   기준 쪽 쿼리 벡터는 저장된 공고 임베딩 (--remote면 embedding-query API로 임베딩, 임베딩 캐시 사용)
+# - latency: 쿼리 하나(세 필드) 임베딩 시간. remote는 --remote일 때만 실제 API로 측정
+###############################################################################
+
+def _fused_top_k(store, queries, rows, k):
+    from reranker import FusedReranker, top_k_indices
+
+    reranker = FusedReranker(store)
+    scores = reranker.scores(queries)
+    scores[np.arange(len(rows)), rows] = -np.inf  # 자기 자신 제외
+    return top_k_indices(scores, k)
+
+
+def _latency(embed, samples):
+    timings = []
+    for texts in samples:
+        start = time.perf_counter()
+        embed(texts)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, 50), np.percentile(timings, 95)
+
+
+def evaluate(backend, reference_dir=None, n=200, ks=(3, 10), remote=False, seed=0):
+    import tempfile
+    from embedding_store import DEFAULT_STORE_DIR, EmbeddingStore, write_store
+    from posting_store import PostingStore
+
+    reference = EmbeddingStore(reference_dir or DEFAULT_STORE_DIR)
+    db = PostingStore().frame(*FIELDS).fillna("").astype(str)
+    if len(db) != len(reference):
+        raise ValueError(f"공고 DB({len(db)}건)와 기준 저장소({len(reference)}건)의 행 수가 다릅니다.")
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(db), min(n, len(db)), replace=False))
+    samples = [[db[field].iloc[row] or " " for field in FIELDS] for row in rows]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        matrices = {field: backend.embed_passages(db[field].tolist()) for field in FIELDS}
+        write_store(matrices, os.path.join(workdir, "store"), model=backend.passage_model)
+        build_s = time.perf_counter() - start
+        local = EmbeddingStore(os.path.join(workdir, "store"))
+
+        vectors = np.stack([backend.embed_queries(texts) for texts in samples])    # (n, 3, D)
+        local_top = _fused_top_k(local, {field: vectors[:, f] for f, field in enumerate(FIELDS)}, rows, max(ks))
+
+        if remote:
+            from embedding_client import EmbeddingClient
+
+            client = EmbeddingClient(backend=make_backend("remote"))
+            ref_vectors = np.stack([client.embed_many(texts) for texts in samples])
+            ref_queries = {field: ref_vectors[:, f] for f, field in enumerate(FIELDS)}
+        else:
+            ref_queries = {field: np.asarray(reference[field][rows]) for field in FIELDS}
+        ref_top = _fused_top_k(reference, ref_queries, rows, max(ks))
+
+    print(f"[{backend.query_model}] 공고 {len(db)}건 재임베딩 {build_s:.2f}s, 쿼리 {len(rows)}건, 기준 {reference.model}")
+    for k in ks:
+        overlap = np.mean([len(set(a[:k]) & set(b[:k])) / k for a, b in zip(local_top, ref_top)])
+        print(f"  top-{k} 겹침 {overlap:.3f}")
+    kr_text.clear_cache()  # 재임베딩 때 캐시된 명사 추출 결과 없이 측정 (Kiwi 형태소 분석 포함)
+    p50, p95 = _latency(backend.embed_queries, samples)
+    print(f"  쿼리 임베딩 latency p50 {p50:.2f} ms  p95 {p95:.2f} ms")
+    if remote:
+        remote_backend = make_backend("remote")
+        p50, p95 = _latency(remote_backend.embed_queries, samples[:20])
+        print(f"  [remote] 쿼리 임베딩 latency p50 {p50:.2f} ms  p95 {p95:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 백엔드: LSA 학습 / 공고 재임베딩 / 오프라인 평가")
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    fit_parser = subparsers.add_parser("fit", help="공고 DB로 LSA 모델 학습")
+    fit_parser.add_argument("--dim", type=int, default=LSA_DIM)
+    reembed_parser = subparsers.add_parser("reembed", help="공고 DB를 백엔드로 재임베딩")
+    reembed_parser.add_argument("--store", help="임베딩 저장소 경로 (세그먼트 인덱스가 없을 때)")
+    eval_parser = subparsers.add_parser("eval", help="기준 저장소 대비 겹침 / latency")
+    eval_parser.add_argument("--reference", help="기준(remote) 임베딩 저장소 경로")
+    eval_parser.add_argument("-n", type=int, default=200)
+    eval_parser.add_argument("--remote", action="store_true", help="기준 쿼리 임베딩과 latency를 실제 API로 측정")
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        backend = fit_lsa(dim=args.dim)
+        print(f"LSA 모델 생성 완료: {LSA_MODEL_PATH} ({backend.query_model}, 어휘 {len(backend.vocab):,}개)")
+    elif args.command == "reembed":
+        backend = make_backend(args.backend)
+        reembed(backend, store_dir=args.store)
+        print(f"재임베딩 완료: {backend.passage_model}")
+    else:
+        evaluate(make_backend(args.backend), reference_dir=args.reference, n=args.n, remote=args.remote)
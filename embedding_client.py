@@ -0,0 +1,321 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import Future
+import numpy as np
+
+from tracing import traced
+from stub_server import StubHandler, StubServer
+from embedding_backend import RemoteBackend
+
+
+###############################################################################
+# 임베딩 API 클라이언트 (배치 + 영구 캐시 + 중복 요청 병합)
+# - 캐시에 없는 텍스트만 모아 embeddings.create 한 번으로 요청
+# - (모델, 텍스트) sha256 해시를 키로 SQLite에 저장, 최근 사용 순(LRU)으로 개수 제한
+# - 다른 스레드가 이미 요청 중인 텍스트는 새로 요청하지 않고 그 결과를 기다림
+# - 실제 임베딩은 백엔드가 수행 (embedding_backend.py: Upstage API 또는 로컬 CPU 모델)
+# - 연결 실패/타임아웃/5xx가 나면 cooldown초 동안 API를 부르지 않고 바로 EmbeddingUnavailable
+#   (캐시에 있는 텍스트는 계속 반환. career_guide.retrieval은 이때 BM25만으로 검색)
+#
+#   python embedding_client.py    # 로컬 가짜 임베딩 서버로 캐시 적중률/요청 수/cooldown 확인
+###############################################################################
+
+DEFAULT_CACHE_PATH = os.environ.get("EMBEDDING_CACHE_PATH", "embedding_cache.sqlite")
+
+# 임베딩 API에 닿지 않을 때 다시 시도하기까지 기다리는 시간(초)
+EMBEDDING_COOLDOWN = float(os.environ.get("EMBEDDING_COOLDOWN", 60))
+
+
+class EmbeddingUnavailable(ConnectionError):
+    """
+    임베딩 API에 연결할 수 없음 (연결 실패, 타임아웃, 5xx 또는 cooldown 중).
+    """
+
+
+def content_key(model, text):
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    SQLite 기반 임베딩 캐시. 여러 프로세스가 같은 파일을 공유할 수 있습니다.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used)")
+
+    def _connect(self):
+        # sqlite3 연결은 스레드 간 공유하지 않음
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys):
+        if not keys:
+            return {}
+        conn = self._connect()
+        placeholders = ",".join("?" * len(keys))
+        rows = conn.execute(
+            f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", list(keys)
+        ).fetchall()
+        if rows:
+            with conn:
+                conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE key IN ({','.join('?' * len(rows))})",
+                    [time.time(), *[key for key, _ in rows]],
+                )
+        return {key: np.frombuffer(blob, dtype=np.float32) for key, blob in rows}
+
+    def put_many(self, items):
+        if not items:
+            return
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                 for key, vector in items.items()],
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+
+def _unreachable(e):
+    from llm_client import LLMServerError, LLMTimeoutError, classify_error
+
+    return isinstance(e, ConnectionError) or isinstance(classify_error(e), (LLMTimeoutError, LLMServerError))
+
+
+class EmbeddingClient:
+    """
+    쿼리 임베딩 백엔드를 감싸는 클라이언트. backend가 없으면 client(OpenAI 호환 API)의 model을 씁니다.
+
+    stats에는 캐시 적중/미스, 실제 백엔드 호출 횟수, 중복 병합 횟수가 누적됩니다.
+    """
+
+    def __init__(self, client=None, model="embedding-query", cache=None, cooldown=EMBEDDING_COOLDOWN, backend=None):
+        self.backend = backend if backend is not None else RemoteBackend(client, query_model=model)
+        self.model = self.backend.query_model
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.cooldown = cooldown
+        self.stats = {"hits": 0, "misses": 0, "requests": 0, "deduped": 0, "unavailable": 0}
+        self._inflight = {}
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def available(self):
+        """
+        최근 연결 실패 후 cooldown 중이 아니면 True.
+        """
+        return time.monotonic() >= self._down_until
+
+    def embed(self, text):
+        return self.embed_many([text])[0]
+
+    @traced("embed")
+    def embed_many(self, texts):
+        """
+        텍스트 리스트의 임베딩을 입력 순서대로 반환합니다.
+        """
+        for text in texts:
+            if not text.strip():  # 빈 문자열 처리
+                raise ValueError("Input text is empty.")
+
+        keys = [content_key(self.model, text) for text in texts]
+        unique = dict(zip(keys, texts))
+        results = self.cache.get_many(list(unique))
+
+        owned, waiting = {}, {}
+        with self._lock:
+            self.stats["hits"] += len(results)
+            for key, text in unique.items():
+                if key in results:
+                    continue
+                if key in self._inflight:
+                    waiting[key] = self._inflight[key]
+                    self.stats["deduped"] += 1
+                else:
+                    owned[key] = self._inflight[key] = Future()
+            self.stats["misses"] += len(owned)
+            if owned and not self.available():
+                for key in owned:
+                    self._inflight.pop(key).set_exception(EmbeddingUnavailable("임베딩 API cooldown 중"))
+                self.stats["unavailable"] += 1
+                raise EmbeddingUnavailable("임베딩 API cooldown 중")
+
+        if owned:
+            try:
+                vectors = self._request([unique[key] for key in owned])
+                fetched = dict(zip(owned, vectors))
+                self.cache.put_many(fetched)
+                for key, future in owned.items():
+                    future.set_result(fetched[key])
+                results.update(fetched)
+            except Exception as e:
+                error = e
+                if _unreachable(e):
+                    with self._lock:
+                        self._down_until = time.monotonic() + self.cooldown
+                        self.stats["unavailable"] += 1
+                    error = EmbeddingUnavailable(str(e))
+                for future in owned.values():
+                    future.set_exception(error)
+                if error is e:
+                    raise
+                raise error from e
+            finally:
+                with self._lock:
+                    for key in owned:
+                        self._inflight.pop(key, None)
+
+        for key, future in waiting.items():
+            results[key] = future.result()
+
+        return [results[key] for key in keys]
+
+    def _request(self, texts):
+        with self._lock:
+            self.stats["requests"] += 1
+        return list(self.backend.embed_queries(texts))
+
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+###############################################################################
+# 로컬 가짜 임베딩 서버 (/v1/embeddings)
+###############################################################################
+
+class StubEmbeddingServer(StubServer):
+    """
+    OpenAI embeddings API를 흉내 내는 로컬 HTTP 서버. 텍스트 해시로 만든 결정적 벡터를 돌려줍니다.
+    requests(요청 수)와 inputs(받은 텍스트 수)를 세고, down=True이면 503을 반환합니다.
+
+        with StubEmbeddingServer() as server:
+            EmbeddingClient(openai.OpenAI(api_key="test", base_url=server.url, max_retries=0))
+    """
+
+    def __init__(self, dim=32, latency=0.0):
+        from http.server import BaseHTTPRequestHandler
+
+        self.dim = dim
+        self.latency = latency
+        self.down = False
+        self.requests = 0
+        self.inputs = 0
+        lock = threading.Lock()
+        stub = self
+
+        class Handler(StubHandler, BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                texts = body.get("input", [])
+                texts = [texts] if isinstance(texts, str) else list(texts)
+                with lock:
+                    stub.requests += 1
+                    stub.inputs += len(texts)
+                time.sleep(stub.latency)
+                if stub.down:
+                    self.send_json(503, {"error": {"message": "unavailable", "type": "server_error"}})
+                    return
+                self.send_json(200, {
+                    "object": "list",
+                    "model": body.get("model", ""),
+                    "data": [{"object": "embedding", "index": i, "embedding": stub.embed(text).tolist()}
+                             for i, text in enumerate(texts)],
+                    "usage": {"prompt_tokens": 0, "total_tokens": 0},
+                })
+
+        self.serve(Handler, "/v1")
+
+    def embed(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+
+
+###############################################################################
+# 자체 점검: 배치/중복/캐시 적중과 cooldown 경로 (네트워크 없이 가짜 서버 사용)
+###############################################################################
+
+def self_check(workdir, cooldown=0.3, threads=8):
+    """
+    가짜 서버에 대해 시나리오를 차례로 실행하고 [(이름, (요청 수, 텍스트 수), 기대값, 비고)]와 stats를 반환합니다.
+    """
+    import openai
+    from concurrent.futures import ThreadPoolExecutor
+
+    texts = ["데이터 분석 경험", "SQL, Python", "협업 프로젝트"]
+    results = []
+    with StubEmbeddingServer(latency=0.05) as server, ThreadPoolExecutor(max_workers=threads) as pool:
+        client = EmbeddingClient(
+            openai.OpenAI(api_key="test", base_url=server.url, max_retries=0),
+            cache=EmbeddingCache(os.path.join(workdir, "cache.sqlite")), cooldown=cooldown,
+        )
+
+        def step(name, expected, fn):
+            before = (server.requests, server.inputs)
+            try:
+                fn()
+                note = f"적중률 {client.hit_rate():.2f}"
+            except EmbeddingUnavailable as e:
+                note = f"EmbeddingUnavailable: {str(e)[:40]}"
+            results.append((name, (server.requests - before[0], server.inputs - before[1]), expected, note))
+
+        # 기대값: (서버 요청 수, 서버가 받은 텍스트 수)
+        step("세 필드 배치 (캐시 없음)", (1, 3), lambda: client.embed_many(texts))
+        step("같은 배치 반복 (캐시 적중)", (0, 0), lambda: client.embed_many(texts))
+        step("배치 안 중복 텍스트", (1, 2), lambda: client.embed_many(["중복", "중복", "새 텍스트"]))
+        step(f"동시 {threads}개 스레드 같은 텍스트", (1, 1),
+             lambda: list(pool.map(lambda _: client.embed("동시 요청"), range(threads))))
+
+        server.down = True
+        step("서버 장애 (503)", (1, 1), lambda: client.embed("장애 중 새 텍스트"))
+        step("cooldown 중 새 텍스트", (0, 0), lambda: client.embed("장애 중 다른 텍스트"))
+        step("cooldown 중 캐시된 텍스트", (0, 0), lambda: client.embed_many(texts))
+        server.down = False
+        time.sleep(cooldown)
+        step("cooldown 후 복구", (1, 1), lambda: client.embed("장애 중 새 텍스트"))
+    return results, client.stats
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results, stats = self_check(workdir)
+    failed = []
+    for name, (requests, inputs), expected, note in results:
+        mark = "" if (requests, inputs) == expected else "  ← 기대와 다름"
+        print(f"{name:<26} 요청 {requests} / 텍스트 {inputs} (기대 {expected[0]} / {expected[1]})  {note}{mark}")
+        if (requests, inputs) != expected:
+            failed.append(name)
+    print(f"stats: {stats}")
+    print("[FAIL] " + ", ".join(failed) if failed else "[OK] 임베딩 클라이언트 자체 점검 통과")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,224 @@
+import os
+import json
+import shutil
+import hashlib
+import pickle
+import argparse
+import threading
+import numpy as np
+
+
+###############################################################################
+# 공고 임베딩 저장소
+# - org_sum / work_sum / skills_sum 임베딩을 필드별 float32 행렬 파일로 저장
+# - 각 행은 미리 L2 정규화 → 코사인 유사도 = 내적
+# - numpy.memmap으로 로드하므로 여러 프로세스/세션이 OS 페이지 캐시를 공유
+###############################################################################
+
+STORE_VERSION = 1
+FIELDS = ("org_sum", "work_sum", "skills_sum")
+DEFAULT_STORE_DIR = os.environ.get("EMBEDDING_STORE_DIR", "embedding_store")
+MANIFEST_NAME = "manifest.json"
+# model 항목이 없는 (이전에 만든) 저장소는 Upstage 문서 임베딩 모델로 만든 것
+DEFAULT_PASSAGE_MODEL = "embedding-passage"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def normalize_rows(matrix):
+    """
+    행 단위 L2 정규화. 영벡터는 그대로 둡니다.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _header_hash(fields, rows, dim):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([list(fields), int(rows), int(dim)]).encode())
+    return digest
+
+
+def content_hash(store, chunk_size=65536):
+    """
+    저장소 임베딩 내용의 해시. 디스크의 검색 인덱스(ann_index.py / compact_index.py)가
+    같은 임베딩으로 만든 것인지 확인할 때 씁니다.
+    write_store가 manifest에 기록한 값이 있으면 그대로 쓰고, 없으면 필드 행렬을 청크 단위로 읽어 계산합니다.
+    """
+    manifest = getattr(store, "manifest", None) or {}
+    if manifest.get("content_hash"):
+        return manifest["content_hash"]
+    digest = _header_hash(store.fields, len(store), store.dim)
+    for field in store.fields:
+        matrix = store[field]
+        for start in range(0, len(store), chunk_size):
+            digest.update(np.ascontiguousarray(matrix[start:start + chunk_size], dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    디스크에 저장된 공고 임베딩 행렬을 memmap으로 읽어오는 읽기 전용 저장소.
+    store["org_sum"]처럼 기존 embeddings.pkl 딕셔너리와 같은 방식으로 접근합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+
+        if self.manifest.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"지원하지 않는 임베딩 저장소 버전입니다: {self.manifest.get('version')}"
+            )
+
+        self.rows = self.manifest["rows"]
+        self.dim = self.manifest["dim"]
+        # 공고를 임베딩한 모델 (쿼리 임베딩 백엔드와 맞아야 함, embedding_backend.py)
+        self.model = self.manifest.get("model", DEFAULT_PASSAGE_MODEL)
+        self._matrices = {}
+        for field in self.manifest["fields"]:
+            self._matrices[field] = np.memmap(
+                os.path.join(path, f"{field}.f32"),
+                dtype=np.float32,
+                mode="r",
+                shape=(self.rows, self.dim),
+            )
+
+    @property
+    def fields(self):
+        return tuple(self._matrices)
+
+    def __getitem__(self, field):
+        return self._matrices[field]
+
+    def __contains__(self, field):
+        return field in self._matrices
+
+    def __len__(self):
+        return self.rows
+
+
+def write_store(matrices, out_dir, source=None, model=DEFAULT_PASSAGE_MODEL):
+    """
+    필드별 임베딩 행렬을 정규화하여 out_dir에 저장합니다. model: 임베딩에 쓴 모델 이름 (manifest에 기록).
+    임시 디렉토리에 먼저 쓴 뒤 교체하므로, 실행 중인 앱이 반쯤 쓰인 파일을 읽지 않습니다.
+    """
+    shapes = {field: np.shape(matrix) for field, matrix in matrices.items()}
+    if len({shape for shape in shapes.values()}) != 1:
+        raise ValueError(f"필드별 임베딩 행렬의 크기가 다릅니다: {shapes}")
+    rows, dim = next(iter(shapes.values()))
+
+    tmp_dir = f"{out_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    digest = _header_hash(matrices, rows, dim)
+    for field, matrix in matrices.items():
+        normalized = normalize_rows(matrix)
+        normalized.tofile(os.path.join(tmp_dir, f"{field}.f32"))
+        digest.update(normalized.tobytes())
+
+    manifest = {
+        "version": STORE_VERSION,
+        "fields": list(matrices),
+        "rows": int(rows),
+        "dim": int(dim),
+        "dtype": "float32",
+        "normalized": True,
+        "source": source,
+        "model": model,
+        "content_hash": digest.hexdigest(),
+    }
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+
+    # 같은 프로세스에서 이전 버전을 들고 있지 않도록 싱글톤 초기화
+    with _stores_lock:
+        _stores.pop(os.path.abspath(out_dir), None)
+    return manifest
+
+
+def load_store(path=DEFAULT_STORE_DIR):
+    """
+    프로세스 단위 싱글톤으로 임베딩 저장소를 반환합니다.
+    처음 한 번만 manifest를 읽고 memmap을 열며, 이후 호출은 비용이 거의 없습니다.
+    """
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = EmbeddingStore(path)
+                _stores[key] = store
+    return store
+
+
+###############################################################################
+# 인덱스 빌드
+###############################################################################
+
+def embed_texts(client, texts, model="embedding-passage", batch_size=100):
+    """
+    텍스트 리스트를 batch_size 단위로 묶어 임베딩합니다.
+    """
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        batch = [text if text.strip() else " " for text in texts[start:start + batch_size]]
+        response = client.embeddings.create(input=batch, model=model)
+        vectors.extend(item.embedding for item in response.data)
+    return np.array(vectors, dtype=np.float32)
+
+
+def build_from_excel(xlsx_path, out_dir, client, model=DEFAULT_PASSAGE_MODEL):
+    """
+    processed_final_summaries.xlsx의 요약 열을 임베딩하여 저장소를 생성합니다.
+    """
+    import pandas as pd
+
+    db = pd.read_excel(xlsx_path, usecols=list(FIELDS))
+    matrices = {
+        field: embed_texts(client, db[field].fillna("").astype(str).tolist(), model=model)
+        for field in FIELDS
+    }
+    return write_store(matrices, out_dir, source=os.path.basename(xlsx_path), model=model)
+
+
+def build_from_pickle(pkl_path, out_dir):
+    """
+    기존 embeddings.pkl을 API 호출 없이 저장소 형식으로 변환합니다.
+    """
+    with open(pkl_path, "rb") as f:
+        data = pickle.load(f)
+    matrices = {field: np.asarray(data[field], dtype=np.float32) for field in FIELDS}
+    return write_store(matrices, out_dir, source=os.path.basename(pkl_path))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공고 임베딩 저장소 빌드")
+    parser.add_argument("--xlsx", default="data/processed_final_summaries.xlsx")
+    parser.add_argument("--from-pickle", help="기존 embeddings.pkl을 변환 (API 호출 없음)")
+    parser.add_argument("--out", default=DEFAULT_STORE_DIR)
+    parser.add_argument("--model", default=DEFAULT_PASSAGE_MODEL)
+    args = parser.parse_args()
+
+    if args.from_pickle:
+        manifest = build_from_pickle(args.from_pickle, args.out)
+    else:
+        from openai import OpenAI
+
+        # Upstage solar 임베딩 API
+        upstage_client = OpenAI(
+            api_key=os.environ.get("UPSTAGE_API_KEY", ""),
+            base_url="https://api.upstage.ai/v1/solar"
+        )
+        manifest = build_from_excel(args.xlsx, args.out, upstage_client, model=args.model)
+
+    print(f"임베딩 저장소 생성 완료: {args.out} ({manifest['rows']} x {manifest['dim']})")
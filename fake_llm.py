@@ -0,0 +1,168 @@
+import re
+import time
+import hashlib
+import threading
+from types import SimpleNamespace
+import numpy as np
+
+
+###############################################################################
+# 테스트/부하 측정용 가짜 LLM 클라이언트
+# - openai.OpenAI와 같은 모양(chat.completions.create, embeddings.create)으로 호출
+# - 프롬프트 종류(채용 공고, 뉴스 키워드, 클러스터 요약 등)에 맞는 형식의 고정 응답 생성
+# - 호출마다 latency초 지연, stream=True이면 청크 단위로 응답
+# - 임베딩은 텍스트 해시로 만든 결정적 난수 벡터 (같은 텍스트 → 같은 벡터)
+###############################################################################
+
+
+def _posting(prompt):
+    job = re.search(r"직무 이름: (.+)", prompt)
+    company = re.search(r"회사 이름: (.+)", prompt)
+    job = job.group(1).strip() if job else "해당 직무"
+    company = company.group(1).strip() if company else "해당 회사"
+    return (
+        f"1. 조직 설명: {company}의 {job} 조직은 데이터 기반으로 서비스를 개선하는 팀입니다.\n"
+        f"2. 직무 설명: {job} 담당자는 요구사항 분석, 설계, 개발 및 운영을 담당합니다.\n"
+        f"3. 필요 역량: Python, SQL 활용 능력과 협업 및 커뮤니케이션 역량이 필요합니다."
+    )
+
+
+# (프롬프트에 포함된 문구, 응답 생성 함수) — 위에서부터 처음 일치하는 응답 사용
+RESPONSES = [
+    ("조직 설명: [", _posting),
+    ("트렌드 관련 키워드 생성 전문가", lambda prompt: (
+        "- 키워드 1: 생성형 AI 서비스\n- 키워드 2: 데이터 플랫폼 전환\n- 키워드 3: 디지털 금융 규제"
+    )),
+    ("필요한 역량(기술적 3개, 비기술적 3개)", lambda prompt: (
+        "1. 기술적 역량:\n- Python: 데이터 처리\n- SQL: 데이터 추출\n- 클라우드: 서비스 운영\n\n"
+        "2. 비기술적 역량:\n- 소통: 이해관계자 협업\n- 문제 해결: 원인 분석\n- 주도성: 과제 추진"
+    )),
+    ("최종 클러스터", lambda prompt: (
+        "최종 클러스터: 1, 2, 3\n\n1. 산업 전반의 AI 도입 확대\n: 여러 기업이 AI 투자를 늘리고 있음.\n\n"
+        "2. 데이터 규제 변화\n: 데이터 활용 규제가 완화되고 있음.\n\n"
+        "3. 클라우드 전환 가속\n: 주요 기업이 클라우드로 전환하고 있음."
+    )),
+]
+DEFAULT_RESPONSE = (
+    "1. 해당 직무에서 가장 중요한 기술은 무엇이라고 생각하나요?\n"
+    "2. 최근 프로젝트에서 겪은 문제와 해결 과정을 설명해주세요.\n"
+    "3. 이 경험을 직무에 어떻게 활용할 수 있나요?"
+)
+
+
+def respond(prompt):
+    for marker, make_response in RESPONSES:
+        if marker in prompt:
+            return make_response(prompt)
+    return DEFAULT_RESPONSE
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+
+
+def _usage(messages, content):
+    return SimpleNamespace(
+        prompt_tokens=sum(len(m["content"]) for m in messages) // 2,
+        completion_tokens=len(content) // 2,
+    )
+
+
+class FakeLLM:
+    """
+    가짜 OpenAI 클라이언트. calls에 종류별 호출 수를 기록합니다.
+
+        client = FakeLLM(latency=0.05)
+        client.chat.completions.create(model="gpt-4o-mini", messages=[...])
+    """
+
+    def __init__(self, latency=0.05, embedding_latency=0.01, dim=64, chunk_size=8):
+        self.latency = latency
+        self.embedding_latency = embedding_latency
+        self.dim = dim
+        self.chunk_size = chunk_size
+        self.calls = {"chat": 0, "embeddings": 0}
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_chat))
+        self.embeddings = SimpleNamespace(create=self._create_embeddings)
+
+    def _count(self, name):
+        with self._lock:
+            self.calls[name] += 1
+
+    def _create_chat(self, model, messages, stream=False, **params):
+        self._count("chat")
+        content = respond("\n".join(m["content"] for m in messages))
+        if stream:
+            # stream_options={"include_usage": True}이면 마지막에 usage만 담은 청크를 보냄 (OpenAI API와 같음)
+            include_usage = (params.get("stream_options") or {}).get("include_usage", False)
+            return self._stream(content, _usage(messages, content) if include_usage else None)
+
+        time.sleep(self.latency)
+        return SimpleNamespace(
+            model=model, usage=_usage(messages, content),
+            choices=[SimpleNamespace(message=SimpleNamespace(role="assistant", content=content))],
+        )
+
+    def _stream(self, content, usage=None):
+        # 첫 청크 전에 지연의 절반, 나머지는 청크에 나누어 지연
+        time.sleep(self.latency / 2)
+        pieces = [content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size)]
+        for piece in pieces:
+            time.sleep(self.latency / 2 / len(pieces))
+            yield _chunk(piece)
+        if usage is not None:
+            yield SimpleNamespace(choices=[], usage=usage)
+
+    def embed(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+
+    def _create_embeddings(self, input, model):
+        self._count("embeddings")
+        time.sleep(self.embedding_latency)
+        texts = [input] if isinstance(input, str) else list(input)
+        return SimpleNamespace(
+            model=model,
+            data=[SimpleNamespace(index=i, embedding=self.embed(text).tolist()) for i, text in enumerate(texts)],
+        )
+
+
+def make_fake_pipeline(workdir, latency=0.05, dim=64, **kwargs):
+    """
+    FakeLLM을 LLM / 임베딩 클라이언트로 쓰는 CareerGuidePipeline을 만듭니다.
+    캐시, 임베딩 저장소, 뉴스 저장소는 workdir 안에 새로 만듭니다 (실제 캐시 파일을 건드리지 않음).
+    뉴스는 news_client.FakeNewsClient의 합성 기사를 쓰므로 네트워크 호출이 없습니다.
+    공고 엑셀과 공고 DB 경로는 현재 디렉토리가 아닌 이 파일 위치 기준입니다.
+    dim: 가짜 임베딩 차원 (posting_index를 넘길 때는 그 세그먼트 임베딩 차원과 같아야 함)
+    반환: (pipeline, fake)
+    """
+    import os
+    from career_guide import create_pipeline
+    from llm_cache import LLMCache
+    from embedding_client import EmbeddingCache
+    from embedding_store import build_from_excel
+    from news_client import FakeNewsClient
+    from news_store import NewsStore
+    from posting_store import DATA_DIR, STORE_DIR, TABLES, PostingStore
+
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(repo_dir, DATA_DIR)  # DATA_DIR이 절대 경로이면 그대로
+    fake = FakeLLM(latency=latency, dim=dim)
+    store_dir = os.path.join(workdir, "embedding_store")
+    build_from_excel(os.path.join(data_dir, TABLES["summaries"]), store_dir, fake)
+    # 가짜 LLM에는 계정 한도가 없으므로 속도 제한은 사실상 끔 (재시도/오류 변환은 그대로)
+    kwargs.setdefault("rate_limits", {"rpm": 1e6, "tpm": 1e9})
+    if "postings" not in kwargs:
+        kwargs["postings"] = PostingStore(os.path.join(repo_dir, STORE_DIR), data_dir)
+    if "news_store" not in kwargs:
+        kwargs["news_store"] = NewsStore(os.path.join(workdir, "news_store.sqlite"), client=FakeNewsClient())
+    # 저장소의 세그먼트 공고 인덱스(posting_index/)가 있어도 workdir의 임베딩 저장소를 사용
+    kwargs.setdefault("posting_index", None)
+    pipeline = create_pipeline(
+        llm_client=fake, embedding_api_client=fake,
+        llm_cache=LLMCache(os.path.join(workdir, "llm_cache.sqlite")),
+        embedding_cache=EmbeddingCache(os.path.join(workdir, "embedding_cache.sqlite")),
+        store_dir=store_dir, **kwargs
+    )
+    return pipeline, fake
@@ -0,0 +1,171 @@
+import os
+import time
+from functools import lru_cache
+import requests
+from llm_client import ERRORS
+from tracing import traced
+
+
+###############################################################################
+# 취업 준비 가이드 서비스 클라이언트
+# - GuideClient: api.py(HTTP API)를 호출하는 클라이언트
+# - CareerGuidePipeline과 같은 이름/반환 형식의 메서드를 제공하므로 demo.py는 어느 쪽이든 그대로 사용
+# - get_guide_service(): CAREER_GUIDE_API_URL이 있으면 HTTP 클라이언트, 없으면 프로세스 내 파이프라인
+# - 서버의 LLM 오류 응답은 같은 종류의 llm_client.LLMError 하위 예외로 다시 발생
+# - 메서드 호출은 파이프라인과 같은 이름의 span으로 기록 (HTTP 왕복 시간, tracing.py)
+###############################################################################
+
+API_URL = os.environ.get("CAREER_GUIDE_API_URL", "")
+
+# (연결, 응답) 타임아웃(초). 면접 질문 단계는 뉴스 검색과 LLM 호출이 이어지므로 길게 잡음
+API_TIMEOUT = (3.05, float(os.environ.get("CAREER_GUIDE_API_TIMEOUT", 300)))
+
+
+def raise_for_status(response):
+    """
+    오류 응답을 예외로 바꿉니다. api.py의 LLM 오류 응답은 같은 LLMError 하위 예외로 변환합니다.
+    """
+    if response.status_code < 400:
+        return
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = {}
+    if isinstance(payload, dict) and payload.get("error") in ERRORS:
+        retry_after = response.headers.get("Retry-After")
+        raise ERRORS[payload["error"]](payload.get("detail", ""), response.status_code,
+                                       float(retry_after) if retry_after else None)
+    response.raise_for_status()
+
+
+class RemoteStream:
+    """
+    스트리밍 응답을 텍스트 청크로 yield하는 반복 가능한 객체 (llm_stream.ChatStream과 같은 속성).
+    """
+
+    def __init__(self, session, url, payload, timeout=API_TIMEOUT):
+        self.session = session
+        self.url = url
+        self.payload = payload
+        self.timeout = timeout
+
+        self.text = ""
+        self.ttft = None
+        self.latency = None
+        self.cache_hit = False
+
+    def __iter__(self):
+        start = time.perf_counter()
+        chunks = []
+        try:
+            with self.session.post(self.url, json=self.payload, stream=True, timeout=self.timeout) as response:
+                raise_for_status(response)
+                response.encoding = "utf-8"
+                for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                    if not chunk:
+                        continue
+                    if self.ttft is None:
+                        self.ttft = time.perf_counter() - start
+                    chunks.append(chunk)
+                    yield chunk
+        finally:
+            self.text = "".join(chunks)
+            self.latency = time.perf_counter() - start
+
+    def metrics(self):
+        return {"ttft": self.ttft, "latency": self.latency, "cache_hit": self.cache_hit}
+
+    def format_metrics(self):
+        if self.latency is None:
+            return ""
+        ttft = f"{self.ttft:.2f}s" if self.ttft is not None else "-"
+        return f"첫 토큰 {ttft} · 전체 {self.latency:.2f}s (API)"
+
+
+class GuideClient:
+    """
+    api.py 서버에 연결하는 클라이언트. 커넥션은 세션 하나로 재사용합니다.
+
+        client = GuideClient("http://127.0.0.1:8000")
+        client.generate_job_posting("데이터 분석가", "카카오")
+    """
+
+    def __init__(self, base_url, timeout=API_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _post(self, path, payload):
+        response = self.session.post(self.base_url + path, json=payload, timeout=self.timeout)
+        raise_for_status(response)
+        return response.json()
+
+    def _maybe_stream(self, path, payload, key, stream):
+        if stream:
+            return RemoteStream(self.session, self.base_url + path + "/stream", payload, self.timeout)
+        return self._post(path, payload)[key]
+
+    def health(self):
+        response = self.session.get(self.base_url + "/health", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @traced()
+    def generate_job_posting(self, job, company, stream=False):
+        return self._maybe_stream("/job-posting", {"job": job, "company": company}, "job_posting", stream)
+
+    @traced()
+    def required_skills(self, job, job_posting, top_n=3, stream=False):
+        payload = {"job": job, "job_posting": job_posting, "top_n": top_n}
+        return self._maybe_stream("/required-skills", payload, "skills", stream)
+
+    @traced()
+    def generate_personal_statement(self, job, selected_categories, activities, skills):
+        payload = {"job": job, "categories": list(selected_categories), "activities": list(activities), "skills": skills}
+        return self._post("/personal-statement", payload)["personal_statement"]
+
+    @traced()
+    def interview(self, job, company, job_posting, personal_statement, include_news=True):
+        """
+        CareerGuidePipeline.interview와 같은 (결과 dict, 단계별 소요 시간)을 반환합니다.
+        뉴스 레코드는 DataFrame으로 되돌립니다.
+        """
+        payload = {"job": job, "company": company, "job_posting": job_posting,
+                   "personal_statement": personal_statement, "include_news": include_news}
+        data = self._post("/interview", payload)
+        results = data["results"]
+        if "news" in results:
+            import pandas as pd
+            from news_client import NEWS_COLUMNS
+
+            frame = lambda records: pd.DataFrame(records, columns=NEWS_COLUMNS)
+            results["news"] = [frame(records) for records in results["news"]]
+            results["clusters"] = [
+                ({int(cid): frame(records) for cid, records in cluster["news_dict"].items()}, cluster["text"])
+                for cluster in results["clusters"]
+            ]
+        return results, data["timings"]
+
+    @traced()
+    def generate_q2(self, job, company, keyword, topic, text):
+        payload = {"job": job, "company": company, "keyword": keyword, "topic": topic, "text": text}
+        return self._post("/news-questions", payload)["questions"]
+
+    @traced()
+    def generate_guide(self, job, company, top_n=3, max_keywords=10):
+        return self._post("/guide", {"job": job, "company": company, "top_n": top_n, "max_keywords": max_keywords})
+
+    def close(self):
+        self.session.close()
+
+
+@lru_cache(maxsize=None)
+def get_guide_service():
+    """
+    demo.py가 사용하는 서비스 (프로세스 단위 싱글톤).
+    """
+    if API_URL:
+        return GuideClient(API_URL)
+
+    from career_guide import get_pipeline
+    return get_pipeline()
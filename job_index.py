@@ -0,0 +1,304 @@
+import re
+import time
+import bisect
+import argparse
+from functools import lru_cache
+from collections import defaultdict
+import numpy as np
+
+
+###############################################################################
+# 공고 직무명(job 열) 역색인
+# - 토큰 역색인: 공백 토큰 + Kiwi 형태소(명사/외국어/숫자) 토큰
+# - 정확 일치: 정규화한 직무명 전체가 같은 공고
+# - 접두 일치: 정렬된 토큰 사전에서 bisect로 검색
+# - 퍼지 일치: 문자 bigram 역색인 (오타, 띄어쓰기 차이 대응)
+# - 점수는 질의 토큰 idf 합 대비 일치한 idf 비율(0~1)로 정규화하여 순위 반환
+# - 질의 토큰화: 사전에 이미 있는 공백 토큰은 그대로 쓰고 나머지만 형태소 분석, 결과는 LRU 캐시
+#   (Kiwi 토크나이저를 써도 같은 직무명을 다시 분석하지 않음)
+# - 후보 점수 합산: 후보가 DB의 상당 부분이면 np.bincount(minlength=DB 크기), 아니면 가장 긴
+#   posting(정렬됨)에 짧은 posting들의 합을 이진 탐색으로 끼워 넣음 (긴 posting은 다시 정렬하지 않음)
+# - 퍼지 일치: 질의에서 가장 드문 bigram 6개만 사용, 후보는 그중 posting 길이 합이
+#   fuzzy_max_postings(2천)를 넘기 전까지의 bigram으로만 생성 (나머지는 후보 점수에만 반영)
+# - 정확 일치만으로 k개가 차면 (search_db의 k=1) 토큰/퍼지 단계를 건너뜀
+#
+#   python job_index.py                     # 운영과 같은 Kiwi 토크나이저, 2만 건
+#   python job_index.py --tokenizer space --n 1000000
+###############################################################################
+
+PREFIX_WEIGHT = 0.5
+FUZZY_WEIGHT = 0.3
+FUZZY_MAX_GRAMS = 6
+KIWI_TAGS = ("NN", "SL", "SH", "SN")
+QUERY_CACHE_SIZE = 4096
+
+
+def normalize(text):
+    text = re.sub(r"[^\w\s]", " ", str(text).lower())
+    return " ".join(text.split())
+
+
+def char_bigrams(text):
+    compact = text.replace(" ", "")
+    if len(compact) < 2:
+        return {compact} if compact else set()
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+def make_tokenizer(kiwi=None, cache_size=0):
+    """
+    정규화된 문자열을 토큰 집합으로 바꾸는 함수를 반환합니다.
+    kiwi가 주어지면 붙여 쓴 한국어 직무명(예: '쇼핑검색개인화')도 형태소 단위로 분리합니다.
+    cache_size > 0이면 결과(frozenset)를 LRU 캐시에 보관합니다 — 스냅샷마다 역색인을 다시 만들 때
+    같은 토크나이저를 넘기면 새로 추가된 직무명만 형태소 분석합니다.
+    """
+    def tokenize(text):
+        tokens = set(text.split())
+        if kiwi is not None and text:
+            tokens.update(
+                token.form.lower() for token in kiwi.tokenize(text)
+                if token.tag.startswith(KIWI_TAGS)
+            )
+        return tokens
+
+    if cache_size:
+        return lru_cache(maxsize=cache_size)(lambda text: frozenset(tokenize(text)))
+    return tokenize
+
+
+def _build_postings(sets_per_doc):
+    postings = defaultdict(list)
+    for doc_id, items in enumerate(sets_per_doc):
+        for item in items:
+            postings[item].append(doc_id)
+    return {item: np.array(ids, dtype=np.int32) for item, ids in postings.items()}
+
+
+class JobIndex:
+    """
+    직무명 검색용 역색인. jobs는 DB의 job 열(순서 = DB 행 순서)입니다.
+    """
+
+    def __init__(self, jobs, tokenize=None, max_postings=20_000, fuzzy_max_postings=2_000,
+                 fuzzy_max_grams=FUZZY_MAX_GRAMS, query_cache_size=QUERY_CACHE_SIZE):
+        self.tokenize = tokenize or make_tokenizer()
+        self._tokenize_words = lru_cache(maxsize=query_cache_size)(lambda text: frozenset(self.tokenize(text)))
+        self.max_postings = max_postings
+        self.fuzzy_max_postings = fuzzy_max_postings
+        self.fuzzy_max_grams = fuzzy_max_grams
+
+        normalized = [normalize(job) if isinstance(job, str) else "" for job in jobs]
+        self.size = len(normalized)
+
+        self.exact = defaultdict(list)
+        for doc_id, text in enumerate(normalized):
+            if text:
+                self.exact[text].append(doc_id)
+
+        self.tokens = _build_postings(self.tokenize(text) for text in normalized)
+        self.vocab = sorted(self.tokens)
+        self.bigrams = _build_postings(char_bigrams(text) for text in normalized)
+
+    def query_tokens(self, text):
+        """
+        정규화된 질의의 토큰 집합. 사전에 있는 공백 토큰은 형태소 분석 없이 그대로 쓰고,
+        사전에 없는 단어만 토크나이저(Kiwi)에 넘깁니다 (같은 단어 조합은 캐시).
+        """
+        words = text.split()
+        unknown = [word for word in words if word not in self.tokens]
+        tokens = set(words)
+        if unknown:
+            tokens.update(self._tokenize_words(" ".join(unknown)))
+        return tokens
+
+    def _idf(self, postings, item):
+        df = len(postings.get(item, ()))
+        return np.log((self.size + 1) / (df + 1)) + 1.0
+
+    def _prefix_matches(self, token, limit=32):
+        start = bisect.bisect_left(self.vocab, token)
+        matches = []
+        for item in self.vocab[start:start + limit + 1]:
+            if not item.startswith(token):
+                break
+            if item != token:
+                matches.append(item)
+        return matches
+
+    def _dense(self, n_ids):
+        # 후보가 DB의 상당 부분이면 정렬(np.unique)/이진 탐색보다 DB 크기 배열에 바로 더하는 편이 빠름
+        return n_ids * 8 > self.size
+
+    @staticmethod
+    def _union(docs, scores, ids, weights):
+        """
+        정렬된 (docs, scores)에 정렬된 고유 행 번호 ids의 점수 weights(스칼라 또는 배열)를 더합니다.
+        새 행 번호는 순서를 유지하며 끼워 넣으므로 전체를 다시 정렬하지 않습니다 (np.unique보다 빠름).
+        """
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), ids.shape)
+        pos = np.searchsorted(docs, ids)
+        if len(docs):
+            hit = docs[np.minimum(pos, len(docs) - 1)] == ids
+        else:
+            hit = np.zeros(len(ids), dtype=bool)
+        scores[pos[hit]] += weights[hit]
+        miss = ~hit
+        return np.insert(docs, pos[miss], ids[miss]), np.insert(scores, pos[miss], weights[miss])
+
+    def _accumulate(self, weighted_postings, max_postings, require_short=False, budget=False):
+        """
+        (posting 배열, 가중치) 목록을 문서별 점수로 합산합니다.
+        짧은 posting으로 후보를 만들고, 긴 posting(흔한 토큰)은 후보에 대해서만
+        정렬된 배열 이진 탐색으로 점수를 더하므로 DB 크기와 무관하게 빠릅니다.
+        require_short=True이면 짧은 posting이 하나도 없을 때 후보를 만들지 않습니다.
+        budget=True이면 max_postings를 posting 하나가 아닌 후보 생성 posting 길이의 합 상한으로 씁니다
+        (드문 것부터 합이 넘기 전까지만 후보 생성, 나머지는 후보 점수에만 반영).
+        """
+        weighted_postings = sorted(weighted_postings, key=lambda item: len(item[0]))
+        lengths = np.array([len(ids) for ids, _ in weighted_postings], dtype=np.int64)
+        if budget:
+            n_gen = int(np.searchsorted(np.cumsum(lengths), max_postings, side="right"))
+        else:
+            n_gen = int((lengths <= max_postings).sum())
+        if not weighted_postings or (require_short and n_gen == 0):
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        n_gen = n_gen or 1
+        generators, rest = weighted_postings[:n_gen], weighted_postings[n_gen:]
+
+        if self._dense(sum(len(ids) for ids, _ in generators)):
+            ids = np.concatenate([ids for ids, _ in generators])
+            weights = np.repeat([w for _, w in generators], [len(ids) for ids, _ in generators])
+            dense = np.bincount(ids, weights=weights, minlength=self.size)
+            docs = np.flatnonzero(dense != 0).astype(np.int32)  # 불리언 배열의 nonzero가 실수 배열보다 몇 배 빠름
+            for ids, w in rest:
+                dense[ids] += w  # posting 안의 행 번호는 중복이 없음
+            return docs, dense[docs]
+
+        # 짧은 생성 posting끼리만 합친 뒤 가장 긴 posting(정렬됨)에 한 번에 끼워 넣음 (긴 posting은 정렬하지 않음)
+        docs, w = generators[-1]
+        scores = np.full(len(docs), w, dtype=np.float64)
+        if len(generators) > 1:
+            ids = np.concatenate([ids for ids, _ in generators[:-1]])
+            weights = np.repeat([w for _, w in generators[:-1]], [len(ids) for ids, _ in generators[:-1]])
+            small, inverse = np.unique(ids, return_inverse=True)
+            docs, scores = self._union(docs, scores, small, np.bincount(inverse, weights=weights))
+        for ids, w in rest:
+            pos = np.minimum(np.searchsorted(ids, docs), len(ids) - 1)
+            scores += w * (ids[pos] == docs)
+        return docs, scores
+
+    def search(self, query, k=5, fuzzy=True):
+        """
+        (행 번호, 점수) 리스트를 점수 높은 순으로 반환합니다.
+        정확 일치는 점수 1.0 이상으로 항상 가장 앞에 옵니다.
+        """
+        text = normalize(query)
+        if not text:
+            return []
+
+        exact = self.exact.get(text, [])
+        if len(exact) >= k:
+            # 정확 일치(점수 2.0)만으로 k개가 차면 다른 단계는 순위를 바꾸지 못함 (search_db의 k=1 일치)
+            return [(doc_id, 2.0) for doc_id in exact[:k]]
+        results = {doc_id: 2.0 for doc_id in exact}
+
+        # 토큰 일치 + 접두 일치
+        tokens = self.query_tokens(text)
+        total = sum(self._idf(self.tokens, token) for token in tokens) or 1.0
+        weighted = []
+        for token in tokens:
+            idf = self._idf(self.tokens, token)
+            if token in self.tokens:
+                weighted.append((self.tokens[token], idf / total))
+                continue
+            matches = self._prefix_matches(token)
+            if matches:
+                # 한 질의 토큰이 여러 사전 토큰으로 확장되어도 공고마다 한 번만 점수를 더함
+                ids = np.unique(np.concatenate([self.tokens[match] for match in matches]))
+                weighted.append((ids, PREFIX_WEIGHT * idf / total))
+        docs, scores = self._accumulate(weighted, self.max_postings)
+
+        # 퍼지 일치 (문자 bigram): 모든 토큰이 일치한 공고가 없을 때만 수행
+        # 가장 드문 fuzzy_max_grams개 bigram만 사용 (흔한 bigram은 idf가 낮아 순위에 거의 영향 없음).
+        # 후보는 그중 드문 것부터 posting 길이 합이 fuzzy_max_postings 이하인 것으로만 만들고 (DB 크기와 무관),
+        # 나머지는 그 후보의 점수에만 이진 탐색으로 더함
+        if fuzzy and not (scores >= 0.999).any():
+            grams = char_bigrams(text)
+            gram_total = sum(self._idf(self.bigrams, g) for g in grams) or 1.0
+            rare = sorted((g for g in grams if g in self.bigrams), key=lambda g: len(self.bigrams[g]))
+            gram_postings = [
+                (self.bigrams[g], FUZZY_WEIGHT * self._idf(self.bigrams, g) / gram_total)
+                for g in rare[:self.fuzzy_max_grams]
+            ]
+            fuzzy_docs, fuzzy_scores = self._accumulate(
+                gram_postings, self.fuzzy_max_postings, require_short=True, budget=True
+            )
+            if len(fuzzy_docs):
+                docs, scores = self._union(docs, scores.astype(np.float64), fuzzy_docs, fuzzy_scores)
+
+        if len(docs):
+            n_top = min(k + len(results), len(docs))
+            top = np.arange(len(docs))
+            if n_top < len(docs):
+                # 전체 정렬 대신 n_top번째 점수를 기준으로 자름. 동점은 행 번호가 작은 순 (docs는 오름차순)
+                cutoff = np.partition(scores, len(docs) - n_top)[len(docs) - n_top]
+                above = np.flatnonzero(scores > cutoff)
+                top = np.concatenate([above, np.flatnonzero(scores == cutoff)[:n_top - len(above)]])
+            for doc_id, score in zip(docs[top], scores[top]):
+                results[int(doc_id)] = max(results.get(int(doc_id), 0.0), float(score))
+
+        ranked = sorted(results.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
+
+
+###############################################################################
+# 벤치마크: 합성 직무명 코퍼스에서 검색 latency 측정
+###############################################################################
+
+def make_synthetic_jobs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    companies = ["네이버", "카카오", "토스", "쿠팡", "라인", "배민", "당근", "삼성", "LG", "현대"]
+    teams = ["쇼핑", "검색", "광고", "결제", "물류", "지도", "금융", "커머스", "콘텐츠", "보안"]
+    roles = ["백엔드개발", "프론트엔드개발", "데이터분석", "머신러닝엔지니어", "서비스기획",
+             "프로덕트디자인", "데이터엔지니어", "인프라운영", "iOS개발", "Android개발"]
+    return [
+        f"{companies[rng.integers(10)]}{teams[rng.integers(10)]} "
+        f"{teams[rng.integers(10)]}{roles[rng.integers(10)]}{rng.integers(n // 10 + 1)}"
+        for _ in range(n)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="직무명 역색인 검색 벤치마크")
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5, help="결과 수 (search_db는 k=1)")
+    parser.add_argument("--tokenizer", choices=("kiwi", "space"), default="kiwi",
+                        help="kiwi: 운영(career_guide._job_index)과 같은 형태소 토크나이저, space: 공백 토큰만")
+    args = parser.parse_args()
+
+    tokenize = None
+    if args.tokenizer == "kiwi":
+        import kr_text
+
+        kiwi = kr_text.get_kiwi()  # 모델 로딩은 빌드 시간에서 제외
+        kiwi.tokenize("워밍업")
+        tokenize = make_tokenizer(kiwi)
+
+    jobs = make_synthetic_jobs(args.n)
+    start = time.perf_counter()
+    index = JobIndex(jobs, tokenize=tokenize)
+    print(f"[{args.tokenizer}] build {time.perf_counter() - start:.1f}s ({args.n:,} jobs, {len(index.vocab):,} tokens)")
+
+    queries = [jobs[i] for i in range(0, args.n, max(1, args.n // args.queries))][:args.queries]
+    for name, qs in [("exact", queries),
+                     ("partial", [q.split()[-1] for q in queries]),
+                     ("typo", [q[:-2] for q in queries])]:
+        # 첫 조회(질의 토큰화 포함)와 같은 질의 반복(토큰 캐시 적중, 3회 중 최소 — 1코어 환경의 잡음 제외)
+        timings = []
+        for _ in range(4):
+            start = time.perf_counter()
+            for q in qs:
+                index.search(q, k=args.k)
+            timings.append((time.perf_counter() - start) * 1000 / len(qs))
+        print(f"{name:<8} 첫 조회 {timings[0]:.3f} ms/query  반복 {min(timings[1:]):.3f} ms/query")
@@ -0,0 +1,208 @@
+import os
+import time
+import argparse
+import threading
+import numpy as np
+
+import kr_text
+
+
+###############################################################################
+# 채용 공고 키워드 추출 모델 (코퍼스 IDF)
+# - 공고 DB([DB]preprocessed_final.xlsx)의 org / work / skills 열을 공고 하나당 문서 하나로 보고
+#   명사별 문서 빈도(df)에서 IDF를 한 번만 계산
+# - 정렬된 어휘(vocab) 배열 + float32 IDF 배열로 .npz에 저장
+# - 새 공고는 토큰 → 어휘 번호로 바꾼 희소 tf 벡터와 IDF의 내적 한 번으로 점수 계산
+#   (요청마다 TfidfVectorizer를 새로 학습하지 않음)
+#
+#   python keyword_model.py build   # IDF 모델 생성
+#   python keyword_model.py eval    # 기존 방식 대비 latency / 키워드 품질 비교
+###############################################################################
+
+MODEL_VERSION = 1
+DEFAULT_MODEL_PATH = os.environ.get("KEYWORD_MODEL_PATH", "keyword_idf.npz")
+TEXT_COLUMNS = ("org", "work", "skills")
+STOPWORDS = "posting"
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def posting_texts(store=None):
+    """
+    공고 DB의 (공고 텍스트 리스트, 직군 리스트)를 반환합니다.
+    """
+    from posting_store import PostingStore
+
+    store = store or PostingStore()
+    db = store.frame(*TEXT_COLUMNS, "category", table="preprocessed")
+    texts = db[list(TEXT_COLUMNS)].fillna("").astype(str).agg(" ".join, axis=1).tolist()
+    return texts, db["category"].astype(str).tolist()
+
+
+class KeywordModel:
+    """
+    어휘와 IDF 배열로 공고 키워드를 점수화합니다.
+    """
+
+    def __init__(self, vocab, idf, n_docs):
+        self.vocab = np.asarray(vocab)
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.n_docs = int(n_docs)
+        self.index = {term: i for i, term in enumerate(self.vocab.tolist())}
+        # 코퍼스에 없는 단어는 df=0인 단어와 같은 IDF
+        self.oov_idf = np.float32(np.log((self.n_docs + 1) / 1) + 1.0)
+
+    @classmethod
+    def fit(cls, token_lists):
+        """
+        공고별 토큰 리스트에서 IDF(sklearn smooth_idf와 같은 식)를 계산합니다.
+        """
+        df = {}
+        for tokens in token_lists:
+            for term in set(tokens):
+                df[term] = df.get(term, 0) + 1
+        vocab = sorted(df)
+        counts = np.array([df[term] for term in vocab], dtype=np.float64)
+        n_docs = len(token_lists)
+        idf = np.log((n_docs + 1) / (counts + 1)) + 1.0
+        return cls(vocab, idf, n_docs)
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, version=MODEL_VERSION, vocab=self.vocab,
+                            idf=self.idf, n_docs=self.n_docs)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        data = np.load(path, allow_pickle=False)
+        if int(data["version"]) != MODEL_VERSION:
+            raise ValueError(f"지원하지 않는 키워드 모델 버전입니다: {int(data['version'])}")
+        return cls(data["vocab"], data["idf"], int(data["n_docs"]))
+
+    def scores(self, tokens):
+        """
+        (단어 리스트, 점수 배열)을 반환합니다. 점수 = (1 + log tf) * idf.
+        """
+        terms, tf = np.unique(np.asarray(list(tokens), dtype=object), return_counts=True)
+        if len(terms) == 0:
+            return [], np.empty(0, dtype=np.float32)
+        ids = np.array([self.index.get(term, -1) for term in terms])
+        idf = np.where(ids >= 0, self.idf[ids], self.oov_idf)
+        return terms.tolist(), (1.0 + np.log(tf)) * idf
+
+    def extract(self, tokens, k=10):
+        """
+        점수가 높은 순으로 키워드 k개를 반환합니다.
+        """
+        terms, scores = self.scores(tokens)
+        if not terms:
+            return []
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [terms[i] for i in top]
+
+
+def build(path=DEFAULT_MODEL_PATH, store=None):
+    texts, _ = posting_texts(store)
+    model = KeywordModel.fit(kr_text.nouns_many(texts, stopwords=STOPWORDS))
+    model.save(path)
+    return model
+
+
+def get_keyword_model(path=DEFAULT_MODEL_PATH):
+    """
+    프로세스 단위 싱글톤. 모델 파일이 없으면 공고 DB에서 한 번 생성하여 저장합니다.
+    """
+    model = _models.get(path)
+    if model is None:
+        with _models_lock:
+            model = _models.get(path)
+            if model is None:
+                model = KeywordModel.load(path) if os.path.exists(path) else build(path)
+                _models[path] = model
+    return model
+
+
+###############################################################################
+# 평가: 기존 방식(공고 하나로 TfidfVectorizer 학습) 대비 latency와 키워드 품질
+# - 구체성: 선택한 키워드의 평균 문서 빈도 비율 (낮을수록 공고 고유 키워드)
+# - 직군 순도: 키워드가 등장하는 공고 중 같은 직군(category) 공고의 비율 (높을수록 직무 특화)
+# 각 공고는 자기 자신을 뺀 나머지 공고로 학습한 IDF로 평가 (leave-one-out)
+###############################################################################
+
+def legacy_extract(tokens, k=10):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(max_features=k)
+    vectorizer.fit_transform(tokens)
+    return list(vectorizer.get_feature_names_out())
+
+
+def evaluate(k=10, repeat=20):
+    texts, categories = posting_texts()
+    token_lists = kr_text.nouns_many(texts, stopwords=STOPWORDS)
+    n = len(token_lists)
+
+    doc_sets = [set(tokens) for tokens in token_lists]
+    postings = {}
+    for doc_id, terms in enumerate(doc_sets):
+        for term in terms:
+            postings.setdefault(term, []).append(doc_id)
+
+    def quality(doc_id, keywords):
+        df_ratio, purity = [], []
+        for term in keywords:
+            others = [d for d in postings.get(term, []) if d != doc_id]
+            df_ratio.append(len(others) / (n - 1))
+            if others:
+                purity.append(np.mean([categories[d] == categories[doc_id] for d in others]))
+        return np.mean(df_ratio) if df_ratio else 0.0, np.mean(purity) if purity else 0.0
+
+    full = KeywordModel.fit(token_lists)
+    legacy_q, model_q = [], []
+    for doc_id, tokens in enumerate(token_lists):
+        if not tokens:
+            continue
+        # leave-one-out: 평가 대상 공고의 df 기여분을 빼서 IDF 재계산
+        model = KeywordModel(full.vocab, full.idf, full.n_docs)
+        ids = [full.index[term] for term in doc_sets[doc_id]]
+        df = (n + 1) / np.exp(full.idf[ids].astype(np.float64) - 1.0) - 1.0
+        model.idf = full.idf.copy()
+        model.idf[ids] = np.log(n / df) + 1.0
+        model.n_docs = n - 1
+
+        legacy_q.append(quality(doc_id, legacy_extract(tokens, k)))
+        model_q.append(quality(doc_id, model.extract(tokens, k)))
+
+    sample = [tokens for tokens in token_lists if tokens][:50]
+    timings = {}
+    for name, extract in [("기존 TfidfVectorizer", legacy_extract), ("코퍼스 IDF", full.extract)]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for tokens in sample:
+                extract(tokens, k)
+        timings[name] = (time.perf_counter() - start) * 1000 / (repeat * len(sample))
+
+    print(f"공고 {n}개, 어휘 {len(full.vocab)}개, top-{k}")
+    print(f"{'방식':<22} {'latency':>10} {'평균 df 비율':>12} {'직군 순도':>10}")
+    for name, q in [("기존 TfidfVectorizer", legacy_q), ("코퍼스 IDF", model_q)]:
+        q = np.array(q)
+        print(f"{name:<22} {timings[name]:>7.3f} ms {q[:, 0].mean():>12.3f} {q[:, 1].mean():>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공고 키워드 추출 IDF 모델")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="공고 DB로 IDF 모델 생성")
+    build_parser.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    eval_parser = subparsers.add_parser("eval", help="기존 방식 대비 latency / 품질 비교")
+    eval_parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        model = build(args.out)
+        print(f"키워드 모델 생성 완료: {args.out} (공고 {model.n_docs}개, 어휘 {len(model.vocab)}개, "
+              f"{os.path.getsize(args.out) / 1024:.1f} KB)")
+    else:
+        evaluate(k=args.k)
@@ -0,0 +1,182 @@
+import os
+import re
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from tracing import traced
+
+
+###############################################################################
+# 한국어 텍스트 전처리 (Kiwi 명사 추출)
+# - Kiwi는 프로세스당 한 번만 생성하고, 여러 문서는 Kiwi의 다중 문서 API로
+#   작업 스레드(num_workers)에서 한 번에 분석
+# - 불용어는 처음 사용할 때 frozenset으로 한 번만 만들고 이후 수정하지 않음
+#   (기존 Kr_preprocessing2가 공유 Stopwords 객체에 불용어를 계속 추가하던 문제 해결)
+# - (불용어 집합, 텍스트)별 명사 추출 결과를 LRU로 메모이제이션
+###############################################################################
+
+KIWI_NUM_WORKERS = int(os.environ.get("KIWI_NUM_WORKERS", -1))  # -1 = CPU 코어 수
+NOUN_CACHE_SIZE = int(os.environ.get("NOUN_CACHE_SIZE", 100_000))
+MIN_NOUN_LENGTH = 2
+
+# 채용 공고 키워드 추출에서 추가로 제외하는 일반 명사 (NNG)
+POSTING_STOPWORDS = (
+    '토스', '서비스', '경험', '문제', '업무', '필요', '관련', '기술',
+    '다양', '해결', '이해', '제품', '보유', '작성', '이상', '과정', '주도',
+    '활용', '중요', '능력', '조직', '제안',
+)
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_kiwi():
+    """
+    모델 로딩 비용이 크므로 처음 사용할 때 한 번만 생성하여 모든 호출이 공유합니다.
+    """
+    from kiwipiepy import Kiwi
+    return Kiwi(num_workers=KIWI_NUM_WORKERS)
+
+
+@lru_cache(maxsize=None)
+def get_stopwords(name="default"):
+    """
+    불변 불용어 집합 (형태, 품사) 쌍과 불용 품사를 반환합니다.
+    name: "default"(Kiwi 기본 불용어) 또는 "posting"(기본 + POSTING_STOPWORDS)
+    """
+    from kiwipiepy.utils import Stopwords
+
+    base = Stopwords()
+    pairs = set(base.stopwords)
+    if name == "posting":
+        pairs.update((word, 'NNG') for word in POSTING_STOPWORDS)
+    elif name != "default":
+        raise ValueError(f"알 수 없는 불용어 집합입니다: {name}")
+    return frozenset(pairs), frozenset(base.stoptags)
+
+
+def clean(text):
+    text = text.strip()
+    return re.sub(r'[^\d\s\w]', ' ', text)
+
+
+def _extract(tokens, stopwords):
+    pairs, tags = stopwords
+    return tuple(
+        token.form for token in tokens
+        if 'NN' in token.tag and len(token.form) >= MIN_NOUN_LENGTH
+        and token.tag not in tags and (token.form, token.tag) not in pairs
+    )
+
+
+@traced("kiwi")
+def nouns_many(texts, stopwords="default"):
+    """
+    texts 각각의 명사 튜플 리스트를 반환합니다.
+    메모이제이션되지 않은 텍스트만 모아 Kiwi 다중 문서 API로 한 번에 분석합니다.
+    """
+    texts = list(texts)
+    stopset = get_stopwords(stopwords)
+    keys = [(stopwords, text) for text in texts]
+
+    results = {}
+    with _memo_lock:
+        for key in keys:
+            if key in _memo:
+                _memo.move_to_end(key)
+                results[key] = _memo[key]
+
+    missing = list(dict.fromkeys(key for key in keys if key not in results))
+    if missing:
+        analyzed = get_kiwi().tokenize([clean(text) for _, text in missing])
+        for key, tokens in zip(missing, analyzed):
+            results[key] = _extract(tokens, stopset)
+
+        with _memo_lock:
+            for key in missing:
+                _memo[key] = results[key]
+            while len(_memo) > NOUN_CACHE_SIZE:
+                _memo.popitem(last=False)
+
+    return [results[key] for key in keys]
+
+
+def nouns(text, stopwords="default"):
+    return nouns_many([text], stopwords)[0]
+
+
+def preprocess(text, stopwords="default"):
+    """
+    명사를 공백으로 이은 문자열 (TF-IDF 입력용).
+    """
+    return ' '.join(nouns(text, stopwords))
+
+
+def preprocess_many(texts, stopwords="default"):
+    return [' '.join(words) for words in nouns_many(texts, stopwords)]
+
+
+def clear_cache():
+    with _memo_lock:
+        _memo.clear()
+
+
+###############################################################################
+# 벤치마크: 기존 방식(문서마다 tokenize + Stopwords 필터) 대비 처리량 (docs/sec)
+###############################################################################
+
+def make_synthetic_summaries(n, seed=0):
+    import random
+
+    rng = random.Random(seed)
+    subjects = ["정부", "금융당국", "삼성전자", "카카오뱅크", "네이버", "스타트업", "은행권", "증권사"]
+    topics = ["인공지능 반도체", "디지털 금융", "핀테크 규제", "클라우드 전환", "데이터 플랫폼",
+              "생성형 AI 서비스", "가상자산 시장", "전기차 배터리"]
+    actions = ["투자를 확대했다", "신규 서비스를 출시했다", "협력 방안을 발표했다",
+               "시장 점유율을 높이고 있다", "규제 완화를 요구했다", "기술 개발에 나섰다"]
+    return [
+        f"{rng.choice(subjects)}가 {rng.choice(topics)} 분야에서 {rng.choice(actions)}. "
+        f"업계는 {rng.choice(topics)}와 {rng.choice(topics)} 경쟁이 {rng.randint(2024, 2026)}년에도 "
+        f"이어질 것으로 보고 {rng.choice(subjects)}의 {rng.choice(topics)} 전략에 주목하고 있다. ({i})"
+        for i in range(n)
+    ]
+
+
+def legacy_preprocess(text, stopwords):
+    kiwi_tokens = get_kiwi().tokenize(clean(text), stopwords=stopwords)
+    return ' '.join(token.form for token in kiwi_tokens if 'NN' in token.tag and len(token.form) > 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="한국어 전처리 처리량 벤치마크 (docs/sec)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 30_000])
+    args = parser.parse_args()
+
+    from kiwipiepy.utils import Stopwords
+
+    get_kiwi().tokenize("모델 워밍업 문장")  # 첫 분석의 1회성 초기화 비용 제외
+    get_stopwords()
+    legacy_stopwords = Stopwords()
+    print(f"{'docs':>7} {'기존 (1건씩)':>14} {'배치':>14} {'배치 (메모 적중)':>18}")
+    for n in args.sizes:
+        docs = make_synthetic_summaries(n)
+
+        start = time.perf_counter()
+        legacy = [legacy_preprocess(doc, legacy_stopwords) for doc in docs]
+        legacy_rate = n / (time.perf_counter() - start)
+
+        clear_cache()
+        start = time.perf_counter()
+        batched = preprocess_many(docs)
+        batch_rate = n / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        preprocess_many(docs)
+        memo_rate = n / (time.perf_counter() - start)
+
+        assert batched == legacy, "배치 결과가 기존 방식과 다릅니다"
+        print(f"{n:>7} {legacy_rate:>10.0f} d/s {batch_rate:>10.0f} d/s {memo_rate:>14.0f} d/s")
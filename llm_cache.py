@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from tracing import record_usage
+
+
+###############################################################################
+# 결정적(temperature=0) LLM 호출 응답 캐시
+# - (모델, 메시지, 파라미터) 해시를 키로 SQLite에 응답 저장
+# - TTL이 지난 응답은 사용하지 않고, 최대 개수를 넘으면 오래 사용하지 않은 순으로 삭제
+#   (개수 확인은 evict_every번 저장할 때마다 한 번)
+# - WAL 모드 SQLite이므로 여러 워커 프로세스가 같은 파일을 공유해도 안전
+# - 적중/미스 횟수는 프로세스별(stats)과 파일 전체(shared_stats) 두 가지로 제공
+#   (조회마다 파일에 쓰지 않고 메모리에 모았다가 stats_flush_interval초마다 counters 테이블에 반영)
+# - 호출마다 usage와 캐시 적중을 tracing.py의 현재 span에 기록
+###############################################################################
+
+DEFAULT_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", "llm_cache.sqlite")
+DEFAULT_TTL = float(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))
+
+
+def make_key(model, messages, params):
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite 기반 프롬프트-응답 캐시.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=50_000,
+                 evict_every=100, stats_flush_interval=5.0):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.stats_flush_interval = stats_flush_interval
+        self.stats = {"hits": 0, "misses": 0, "bypass": 0}
+        self._pending = {"hits": 0, "misses": 0, "bypass": 0}  # 아직 counters에 반영하지 않은 횟수
+        self._flushed_at = time.monotonic()
+        self._inserts = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+            self._pending[name] += 1
+            due = time.monotonic() - self._flushed_at >= self.stats_flush_interval
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """
+        메모리에 모아 둔 적중/미스 횟수를 캐시 파일의 counters 테이블에 더합니다.
+        """
+        with self._lock:
+            pending = [(name, n) for name, n in self._pending.items() if n]
+            self._pending = dict.fromkeys(self._pending, 0)
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                pending,
+            )
+
+    def get(self, key):
+        """
+        캐시된 응답을 반환합니다. 없거나 TTL이 지났으면 None.
+        """
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+
+        self._count("misses" if row is None else "hits")
+        return None if row is None else row[0]
+
+    def set(self, key, response, model=None):
+        conn = self._connect()
+        now = time.time()
+        with self._lock:
+            self._inserts += 1
+            evict = self._inserts % self.evict_every == 0
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            if not evict:
+                return
+            # 최대 개수를 넘는 분량(다른 프로세스가 저장한 것 포함)을 한 번에 정리
+            count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def record_bypass(self):
+        self._count("bypass")
+
+    def shared_stats(self):
+        """
+        캐시 파일을 공유하는 모든 프로세스의 누적 적중/미스 횟수.
+        이 프로세스의 횟수는 바로 반영하고, 다른 프로세스 것은 최대 stats_flush_interval초 늦을 수 있습니다.
+        """
+        self.flush_stats()
+        rows = self._connect().execute("SELECT name, value FROM counters").fetchall()
+        stats = {"hits": 0, "misses": 0, "bypass": 0}
+        stats.update(dict(rows))
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._pending = dict.fromkeys(self._pending, 0)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM counters")
+
+
+def cached_chat_completion(client, cache, model, messages, cache_nondeterministic=False, **params):
+    """
+    chat.completions.create 응답 텍스트를 반환합니다.
+    temperature가 0인 호출만 캐시하며, 그 외 호출은 cache_nondeterministic=True일 때만 캐시합니다.
+    """
+    cacheable = cache is not None and (params.get("temperature", 1) == 0 or cache_nondeterministic)
+    if not cacheable:
+        if cache is not None:
+            cache.record_bypass()
+        response = client.chat.completions.create(model=model, messages=messages, **params)
+        record_usage(getattr(response, "usage", None))
+        return response.choices[0].message.content
+
+    key = make_key(model, messages, params)
+    content = cache.get(key)
+    if content is None:
+        response = client.chat.completions.create(model=model, messages=messages, **params)
+        record_usage(getattr(response, "usage", None))
+        content = response.choices[0].message.content
+        cache.set(key, content, model=model)
+    else:
+        record_usage(cache_hit=True)
+    return content
@@ -0,0 +1,583 @@
+import os
+import json
+import time
+import random
+import argparse
+import threading
+from types import SimpleNamespace
+from stub_server import StubHandler, StubServer
+
+
+###############################################################################
+# 속도 제한을 지키는 공용 LLM 클라이언트
+# - 호출 전에 프롬프트 토큰 수를 추정하여 RPM/TPM 토큰 버킷에서 미리 차감
+#   (응답의 usage로 실제 사용량과의 차이를 되돌림)
+# - 429/5xx/타임아웃은 지터를 준 지수 백오프로 재시도 (Retry-After 헤더가 있으면 우선)
+# - 동시 호출 수 상한을 AIMD로 조절: 성공하면 조금씩 늘리고 429를 받으면 절반으로 줄임
+# - 오류는 문자열 대신 LLMError 하위 예외로 전달
+# - openai.OpenAI와 같은 모양(chat.completions.create)이므로 기존 호출 코드에 그대로 주입
+#
+#   client = RateLimitedClient(openai.OpenAI(max_retries=0), rpm=500, tpm=200_000)
+#   python llm_client.py        # 로컬 모의 서버(429 재현)로 기존 방식과 비교
+###############################################################################
+
+# 계정 한도 (gpt-4o-mini 기준 기본값, 환경 변수로 조정)
+LLM_RPM = float(os.environ.get("LLM_RPM", 500))
+LLM_TPM = float(os.environ.get("LLM_TPM", 200_000))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 5))
+
+# 모델 컨텍스트 길이 (프롬프트 + max_tokens가 넘으면 호출하지 않음)
+MAX_CONTEXT_TOKENS = 128_000
+
+# max_tokens를 지정하지 않은 호출의 응답 토큰 예약량
+DEFAULT_COMPLETION_TOKENS = 1024
+
+API_ERROR_FORMAT = "API 호출 중 오류가 발생했습니다: {}"
+
+
+###############################################################################
+# 오류
+###############################################################################
+
+class LLMError(Exception):
+    """
+    LLM 호출 오류. retryable이면 같은 요청을 다시 보내 성공할 수 있는 오류입니다.
+    """
+    retryable = False
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class RateLimitError(LLMError):
+    retryable = True
+
+
+class LLMTimeoutError(LLMError):
+    """응답 시간 초과 또는 연결 실패."""
+    retryable = True
+
+
+class LLMServerError(LLMError):
+    retryable = True
+
+
+class LLMRequestError(LLMError):
+    """잘못된 요청, 인증 실패 등 재시도해도 실패하는 오류."""
+
+
+class TokenBudgetError(LLMError):
+    """프롬프트와 응답 토큰이 모델 컨텍스트 길이보다 큼."""
+
+
+ERRORS = {cls.__name__: cls for cls in (
+    LLMError, RateLimitError, LLMTimeoutError, LLMServerError, LLMRequestError, TokenBudgetError
+)}
+
+
+def _retry_after(response):
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def classify_error(e):
+    """
+    SDK/HTTP 예외를 LLMError 하위 예외로 변환합니다.
+    """
+    if isinstance(e, LLMError):
+        return e
+    status = getattr(e, "status_code", None)
+    retry_after = _retry_after(getattr(e, "response", None))
+    message = str(e)
+    if status == 429:
+        return RateLimitError(message, status, retry_after)
+    if status is not None and status >= 500:
+        return LLMServerError(message, status, retry_after)
+    if status is not None:
+        return LLMRequestError(message, status)
+    name = type(e).__name__
+    if isinstance(e, (TimeoutError, ConnectionError)) or "Timeout" in name or "Connection" in name:
+        return LLMTimeoutError(message)
+    return LLMError(message)
+
+
+###############################################################################
+# 토큰 추정
+###############################################################################
+
+def _tiktoken_encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("o200k_base")
+
+
+_encoding = None
+_encoding_loaded = False
+
+
+def estimate_tokens(text):
+    """
+    텍스트의 토큰 수. tiktoken이 설치되어 있으면 정확히 세고, 없으면 보수적으로 추정합니다
+    (ASCII 4글자당 1토큰, 한글 등 그 외 문자는 1글자당 1토큰).
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding, _encoding_loaded = _tiktoken_encoding(), True
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    ascii_chars = sum(ch.isascii() for ch in text)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def estimate_messages_tokens(messages):
+    # 메시지마다 역할/구분자 토큰 몇 개가 추가됨
+    return sum(estimate_tokens(message.get("content") or "") + 4 for message in messages) + 2
+
+
+###############################################################################
+# 토큰 버킷 + AIMD 동시 실행 제한
+###############################################################################
+
+class TokenBucket:
+    """
+    초당 rate만큼 채워지고 최대 capacity까지 쌓이는 버킷.
+    acquire는 amount만큼 쌓일 때까지 기다린 뒤 차감합니다.
+    amount가 capacity보다 크면 버킷이 가득 찼을 때 차감하고 잔량을 음수로 남깁니다 (그만큼 다음 호출이 기다림).
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount):
+        """
+        차감까지 기다린 시간(초)을 반환합니다.
+        """
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                needed = min(amount, self.capacity)
+                if self.level >= needed:
+                    self.level -= amount
+                    return time.monotonic() - start
+                self._cond.wait((needed - self.level) / self.rate)
+
+    def refund(self, amount):
+        """
+        예약량과 실제 사용량의 차이를 되돌립니다 (음수이면 추가 차감, 잔량이 음수가 될 수 있음).
+        """
+        with self._cond:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+            self._cond.notify_all()
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD 동시 실행 제한. 성공할 때마다 limit을 1/limit씩 늘리고(약 limit번 성공에 +1),
+    429를 받으면 decrease배로 줄입니다. 동시에 받은 여러 429에 한 번만 줄이도록 cooldown초 동안은 다시 줄이지 않습니다.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, decrease=0.5, cooldown=1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, success=True):
+        with self._cond:
+            self.in_flight -= 1
+            if success:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def on_rate_limited(self):
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self._last_decrease = now
+
+
+###############################################################################
+# 클라이언트
+###############################################################################
+
+class RateLimitedClient:
+    """
+    OpenAI 호환 클라이언트를 감싸 속도 제한, 재시도, 동시 실행 조절을 적용합니다.
+    chat.completions.create만 제공하며, 실패하면 LLMError 하위 예외를 발생시킵니다.
+
+    client: chat.completions.create를 제공하는 클라이언트 (SDK 자체 재시도는 끄는 것을 권장: max_retries=0)
+    rpm, tpm: 분당 요청/토큰 한도. burst초 분량까지 몰아서 보낼 수 있습니다.
+    headroom: 한도 대비 실제 사용 비율. 요청 도착 시각이 흔들려 서버 쪽 버킷이 잠깐 모자라는 경우를 피합니다.
+    """
+
+    def __init__(self, client, rpm=LLM_RPM, tpm=LLM_TPM, burst=1.0, headroom=0.9, max_retries=LLM_MAX_RETRIES,
+                 base_delay=0.5, max_delay=20.0, initial_concurrency=4, min_concurrency=1,
+                 max_concurrency=32, max_context_tokens=MAX_CONTEXT_TOKENS):
+        self.client = client
+        rpm, tpm = rpm * headroom, tpm * headroom
+        self.requests = TokenBucket(rpm / 60, max(1.0, rpm / 60 * burst))
+        self.tokens = TokenBucket(tpm / 60, tpm / 60 * burst)
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, min_concurrency, max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_context_tokens = max_context_tokens
+        self.stats = {"calls": 0, "attempts": 0, "retries": 0, "rate_limited": 0, "errors": 0,
+                      "estimated_tokens": 0, "used_tokens": 0, "throttled_seconds": 0.0}
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self.stats[name] += amount
+
+    def _backoff(self, attempt, error):
+        if error.retry_after is not None:
+            return min(self.max_delay, error.retry_after)
+        # full jitter: 동시에 실패한 호출들이 같은 시각에 다시 몰리지 않도록 분산
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def create(self, model, messages, stream=False, **params):
+        prompt_tokens = estimate_messages_tokens(messages)
+        reserved = prompt_tokens + params.get("max_tokens", DEFAULT_COMPLETION_TOKENS)
+        if reserved > self.max_context_tokens:
+            raise TokenBudgetError(
+                f"프롬프트 약 {prompt_tokens}토큰 + 응답 {reserved - prompt_tokens}토큰이 "
+                f"컨텍스트 길이 {self.max_context_tokens}를 넘습니다."
+            )
+        self._count(calls=1, estimated_tokens=prompt_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            waited = self.requests.acquire(1) + self.tokens.acquire(reserved)
+            self.concurrency.acquire()
+            self._count(attempts=1, throttled_seconds=waited)
+            try:
+                response = self.client.chat.completions.create(
+                    model=model, messages=messages, stream=stream, **params)
+            except Exception as e:
+                error = classify_error(e)
+                self.concurrency.release(success=False)
+                # 요청이 처리되지 않았으므로 예약한 토큰은 돌려줌
+                self.tokens.refund(reserved)
+                if isinstance(error, RateLimitError):
+                    self.concurrency.on_rate_limited()
+                    self._count(rate_limited=1)
+                if not error.retryable or attempt == self.max_retries:
+                    self._count(errors=1)
+                    raise error from e
+                self._count(retries=1)
+                time.sleep(self._backoff(attempt, error))
+                continue
+
+            if stream:
+                # 스트림은 다 읽거나 닫힐 때까지 동시 실행 슬롯을 잡고 있음 (_SlotStream)
+                return _SlotStream(self, response, reserved)
+
+            self.concurrency.release(success=True)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                used = usage.prompt_tokens + usage.completion_tokens
+                self.tokens.refund(reserved - used)
+                self._count(used_tokens=used)
+            return response
+
+    def format_stats(self):
+        s = self.stats
+        return (f"호출 {s['calls']} · 시도 {s['attempts']} · 재시도 {s['retries']} · 429 {s['rate_limited']} · "
+                f"실패 {s['errors']} · 대기 {s['throttled_seconds']:.1f}s · 동시 실행 상한 {self.concurrency.limit:.1f}")
+
+
+class _SlotStream:
+    """
+    스트리밍 응답을 감싸 동시 실행 슬롯과 예약 토큰을 정확히 한 번 정리합니다.
+    끝까지 읽거나, 읽는 중 오류가 나거나, close()되거나, 한 번도 읽지 않고 버려져 GC될 때 정리합니다
+    (제너레이터의 finally는 시작하지 않은 스트림에서는 실행되지 않아 슬롯이 새어 나감).
+    마지막 청크에 usage가 있으면 (stream_options={"include_usage": True}) 예약량과의 차이를 되돌립니다.
+    """
+
+    def __init__(self, owner, response, reserved):
+        self.owner = owner
+        self.response = response
+        self.reserved = reserved
+        self.usage = None
+        self._chunks = iter(response)
+        self._done = False
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._finish(success=True)
+            raise
+        except Exception as e:
+            self._finish(success=False)
+            raise classify_error(e) from e
+        if getattr(chunk, "usage", None) is not None:
+            self.usage = chunk.usage
+        return chunk
+
+    def _finish(self, success):
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+        owner = self.owner
+        owner.concurrency.release(success=success)
+        if self.usage is not None:
+            used = self.usage.prompt_tokens + self.usage.completion_tokens
+            owner.tokens.refund(self.reserved - used)
+            owner._count(used_tokens=used)
+        else:
+            owner._count(used_tokens=self.reserved)
+
+    def close(self):
+        """
+        다 읽지 않은 스트림을 닫고 슬롯을 반환합니다 (성공으로 세지 않음).
+        """
+        if self._done:
+            return
+        close = getattr(self.response, "close", None)
+        try:
+            if close is not None:
+                close()
+        finally:
+            self._finish(success=False)
+
+    def __del__(self):
+        if not getattr(self, "_done", True):
+            self.close()
+
+
+###############################################################################
+# 429를 재현하는 로컬 모의 서버 (/v1/chat/completions)
+###############################################################################
+
+class MockRateLimitServer(StubServer):
+    """
+    OpenAI chat.completions API를 흉내 내는 로컬 HTTP 서버.
+    rpm/tpm(분당 한도, burst초 분량까지 허용)이나 max_concurrent(동시 처리 수)를 넘으면
+    Retry-After 헤더와 함께 429를 반환합니다. 처리되는 요청은 latency초 후에 응답합니다.
+
+        with MockRateLimitServer(rpm=600, tpm=100_000) as server:
+            client = openai.OpenAI(api_key="test", base_url=server.url, max_retries=0)
+    """
+
+    def __init__(self, rpm=600, tpm=100_000, burst=1.0, max_concurrent=8, latency=0.05, completion_tokens=20):
+        from http.server import BaseHTTPRequestHandler
+
+        self.latency = latency
+        self.completion_tokens = completion_tokens
+        self.max_concurrent = max_concurrent
+        self.requests_bucket = TokenBucket(rpm / 60, max(1.0, rpm / 60 * burst))
+        self.tokens_bucket = TokenBucket(tpm / 60, tpm / 60 * burst)
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0}
+        self.in_flight = 0
+        lock = threading.Lock()
+        mock = self
+
+        def admit(tokens):
+            # 대기하지 않고 즉시 판단 (버킷이 모자라면 거절)
+            with lock:
+                mock.stats["requests"] += 1
+                if mock.in_flight >= mock.max_concurrent:
+                    return "concurrency", 1.0
+                for bucket, amount, name in ((mock.requests_bucket, 1, "requests"),
+                                             (mock.tokens_bucket, tokens, "tokens")):
+                    with bucket._cond:
+                        bucket._refill()
+                        if bucket.level < amount:
+                            return name, (amount - bucket.level) / bucket.rate
+                mock.requests_bucket.level -= 1
+                mock.tokens_bucket.level -= tokens
+                mock.in_flight += 1
+                return None, 0.0
+
+        class Handler(StubHandler, BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                messages = body.get("messages", [])
+                prompt_tokens = estimate_messages_tokens(messages)
+                completion_tokens = min(body.get("max_tokens") or mock.completion_tokens, mock.completion_tokens)
+
+                limited, retry_after = admit(prompt_tokens + completion_tokens)
+                if limited:
+                    with lock:
+                        mock.stats["rate_limited"] += 1
+                    self.send_json(429, {"error": {"message": f"Rate limit reached ({limited})",
+                                               "type": "requests", "code": "rate_limit_exceeded"}},
+                               {"retry-after-ms": str(int(retry_after * 1000) + 1)})
+                    return
+
+                try:
+                    time.sleep(mock.latency)
+                    content = " ".join(["ok"] * completion_tokens)
+                    if body.get("stream"):
+                        usage = None
+                        if (body.get("stream_options") or {}).get("include_usage"):
+                            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                                     "total_tokens": prompt_tokens + completion_tokens}
+                        self._send_stream(body.get("model", ""), content, usage)
+                    else:
+                        self.send_json(200, {
+                            "id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()),
+                            "model": body.get("model", ""),
+                            "choices": [{"index": 0, "finish_reason": "stop",
+                                         "message": {"role": "assistant", "content": content}}],
+                            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                                      "total_tokens": prompt_tokens + completion_tokens},
+                        })
+                    with lock:
+                        mock.stats["ok"] += 1
+                finally:
+                    with lock:
+                        mock.in_flight -= 1
+
+            def _send_stream(self, model, content, usage=None):
+                events = []
+                for piece in content.split(" "):
+                    chunk = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": model, "choices": [{"index": 0, "delta": {"content": piece + " "},
+                                                          "finish_reason": None}]}
+                    events.append(f"data: {json.dumps(chunk)}\n\n")
+                if usage is not None:
+                    chunk = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": model, "choices": [], "usage": usage}
+                    events.append(f"data: {json.dumps(chunk)}\n\n")
+                events.append("data: [DONE]\n\n")
+                self.send_body(200, "".join(events).encode("utf-8"), "text/event-stream")
+
+        self.serve(Handler, "/v1")
+
+
+###############################################################################
+# 벤치마크: 기존 방식(bare try/except, 재시도 없음) vs RateLimitedClient
+###############################################################################
+
+def check_stream_slots(latency=0.01):
+    """
+    스트림을 끝까지 읽기 / 중간에 닫기 / 한 번도 읽지 않고 버리기 후 동시 실행 슬롯이 모두 반환되는지,
+    usage 청크로 예약 토큰이 정산되는지 확인합니다.
+    """
+    import gc
+    import openai
+
+    messages = [{"role": "user", "content": "스트림 슬롯 확인"}]
+    with MockRateLimitServer(rpm=6000, tpm=1_000_000, latency=latency) as server:
+        client = RateLimitedClient(openai.OpenAI(api_key="test", base_url=server.url, max_retries=0))
+
+        def open_stream():
+            return client.chat.completions.create(model="gpt-4o-mini", messages=messages, max_tokens=50,
+                                                  stream=True, stream_options={"include_usage": True})
+
+        list(open_stream())
+        finished = client.concurrency.in_flight
+        stream = open_stream()
+        next(stream)
+        stream.close()
+        closed = client.concurrency.in_flight
+        open_stream()  # 반복하지 않고 버림
+        gc.collect()
+        abandoned = client.concurrency.in_flight
+
+    reserved = estimate_messages_tokens(messages) + 50
+    ok = finished == closed == abandoned == 0 and client.stats["used_tokens"] < 3 * reserved
+    print(f"[stream] 끝까지 읽음 {finished} / 중간에 닫음 {closed} / 읽지 않고 버림 {abandoned} (사용 중 슬롯)  "
+          f"정산 토큰 {client.stats['used_tokens']} (예약 {3 * reserved})  {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+def benchmark(n_calls=200, workers=32, rpm=1200, tpm=400_000, max_concurrent=8, latency=0.5):
+    """
+    모의 서버 한도를 넘는 부하(workers개 스레드)를 주고 성공률, 처리량, 429 수를 비교합니다.
+    RateLimitedClient에는 서버와 같은 RPM/TPM을 알려 주지만 동시 처리 한도는 AIMD로 찾아야 합니다.
+    기본값은 동시 처리 한도가 병목인 경우이며, --tpm 60000 --latency 0.05이면 TPM이 병목입니다.
+    """
+    import openai
+    from concurrent.futures import ThreadPoolExecutor
+
+    prompt = "다음 채용 공고의 필요 역량을 정리하세요. " * 20
+    messages = [{"role": "user", "content": prompt}]
+    print(f"프롬프트 추정 토큰 {estimate_messages_tokens(messages)}, 호출 {n_calls}회, 스레드 {workers}개, "
+          f"서버 한도 {rpm:.0f} RPM / {tpm:.0f} TPM / 동시 {max_concurrent}")
+
+    def legacy(client):
+        try:
+            return client.chat.completions.create(model="gpt-4o-mini", messages=messages,
+                                                  max_tokens=20, temperature=0).choices[0].message.content
+        except Exception as e:
+            return API_ERROR_FORMAT.format(str(e))
+
+    def limited(client):
+        try:
+            return client.chat.completions.create(model="gpt-4o-mini", messages=messages,
+                                                  max_tokens=20, temperature=0).choices[0].message.content
+        except LLMError as e:
+            return API_ERROR_FORMAT.format(str(e))
+
+    for name, call, wrap in [("기존 (재시도 없음)", legacy, lambda client: client),
+                             ("RateLimitedClient", limited,
+                              lambda client: RateLimitedClient(client, rpm=rpm, tpm=tpm, max_retries=8))]:
+        with MockRateLimitServer(rpm=rpm, tpm=tpm, max_concurrent=max_concurrent, latency=latency) as server:
+            client = wrap(openai.OpenAI(api_key="test", base_url=server.url, max_retries=0))
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda _: call(client), range(n_calls)))
+            elapsed = time.perf_counter() - start
+            failed = sum(result.startswith(API_ERROR_FORMAT.format("")) for result in results)
+            print(f"{name:<20} 성공 {n_calls - failed:4d}/{n_calls}  {(n_calls - failed) / elapsed:6.1f} 성공/s  "
+                  f"{elapsed:5.1f}s  서버 429 {server.stats['rate_limited']}")
+            if isinstance(client, RateLimitedClient):
+                print(f"{'':<20} {client.format_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="속도 제한 LLM 클라이언트 벤치마크 (로컬 모의 서버)")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--rpm", type=float, default=1200)
+    parser.add_argument("--tpm", type=float, default=400_000)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5, help="모의 서버 응답 지연(초)")
+    args = parser.parse_args()
+    check_stream_slots()
+    benchmark(args.calls, args.workers, args.rpm, args.tpm, args.max_concurrent, args.latency)
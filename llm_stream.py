@@ -0,0 +1,92 @@
+import time
+
+from llm_cache import make_key
+
+
+###############################################################################
+# 스트리밍 LLM 응답
+# - stream=True로 받은 청크를 순서대로 yield (st.write_stream에 그대로 전달 가능)
+# - 반복이 끝나면 .text에 전체 응답, .ttft에 첫 토큰까지 걸린 시간, .latency에 전체 시간 기록
+# - stream_options={"include_usage": True}로 요청해 마지막 청크의 usage를 .usage에 보관
+#   (tracing.TracedStream이 span의 토큰 사용량으로 기록)
+# - temperature=0 호출은 응답 캐시(llm_cache.py)를 함께 사용
+###############################################################################
+
+class ChatStream:
+    """
+    chat.completions 스트리밍 응답을 감싸는 반복 가능한 객체.
+
+    error_format이 주어지면 호출 중 예외를 해당 형식의 문자열로 yield합니다.
+    """
+
+    def __init__(self, client, model, messages, cache=None, cache_nondeterministic=False,
+                 error_format=None, **params):
+        self.client = client
+        self.model = model
+        self.messages = messages
+        self.cache = cache
+        self.params = params
+        self.error_format = error_format
+        self.cacheable = cache is not None and (params.get("temperature", 1) == 0 or cache_nondeterministic)
+
+        self.text = ""
+        self.ttft = None
+        self.latency = None
+        self.cache_hit = False
+        self.usage = None
+
+    def __iter__(self):
+        start = time.perf_counter()
+        chunks = []
+        key = make_key(self.model, self.messages, self.params) if self.cacheable else None
+
+        try:
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                self.cache_hit = True
+                self.ttft = time.perf_counter() - start
+                chunks.append(cached)
+                yield cached
+            else:
+                if self.cache is not None and not key:
+                    self.cache.record_bypass()
+                # stream_options는 응답 내용과 무관하므로 캐시 키(self.params)에 넣지 않음
+                response = self.client.chat.completions.create(
+                    model=self.model, messages=self.messages, stream=True,
+                    stream_options={"include_usage": True}, **self.params
+                )
+                for chunk in response:
+                    # usage는 choices가 빈 마지막 청크에만 담겨 옴
+                    if getattr(chunk, "usage", None) is not None:
+                        self.usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    if self.ttft is None:
+                        self.ttft = time.perf_counter() - start
+                    chunks.append(delta)
+                    yield delta
+
+                if key:
+                    self.cache.set(key, "".join(chunks), model=self.model)
+        except Exception as e:
+            if self.error_format is None:
+                raise
+            message = self.error_format.format(str(e))
+            chunks = [message]
+            yield message
+        finally:
+            self.text = "".join(chunks)
+            self.latency = time.perf_counter() - start
+
+    def metrics(self):
+        return {"ttft": self.ttft, "latency": self.latency, "cache_hit": self.cache_hit}
+
+    def format_metrics(self):
+        if self.latency is None:
+            return ""
+        ttft = f"{self.ttft:.2f}s" if self.ttft is not None else "-"
+        cached = " (캐시)" if self.cache_hit else ""
+        return f"첫 토큰 {ttft} · 전체 {self.latency:.2f}s{cached}"
@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import requests
+
+
+###############################################################################
+# HTTP API 부하 테스트
+# - 가짜 LLM(CAREER_GUIDE_FAKE_LLM=1)으로 api.py 서버를 띄우고 동시 요청을 보내 처리량 측정
+# - 요청마다 다른 (직무, 회사)를 사용하여 LLM 응답 캐시에 걸리지 않도록 함
+# - 결과: 성공/실패 수, RPS, 지연 시간 p50/p95/p99
+#
+#   python loadtest.py --endpoint guide --concurrency 16 --requests 400
+#   python loadtest.py --workers 4                          # uvicorn 워커 4개
+#   python loadtest.py --url http://127.0.0.1:8000          # 이미 떠 있는 서버에 요청
+###############################################################################
+
+JOB_POSTING = (
+    "1. 조직 설명: 데이터 기반으로 서비스를 개선하는 팀입니다.\n"
+    "2. 직무 설명: 요구사항 분석, 설계, 개발 및 운영을 담당합니다.\n"
+    "3. 필요 역량: Python, SQL 활용 능력과 협업 역량이 필요합니다."
+)
+
+# 엔드포인트별 요청 본문 (i: 요청 번호)
+PAYLOADS = {
+    "job-posting": lambda i: {"job": f"데이터 분석가 {i}", "company": f"회사 {i}"},
+    "required-skills": lambda i: {"job": f"데이터 분석가 {i}", "job_posting": JOB_POSTING},
+    "guide": lambda i: {"job": f"데이터 분석가 {i}", "company": f"회사 {i}"},
+}
+
+
+def start_server(port, workers=1, latency=0.05, timeout=600):
+    """
+    가짜 LLM 모드로 uvicorn 서버를 띄우고 /health가 응답할 때까지 기다립니다.
+    """
+    env = dict(os.environ, CAREER_GUIDE_FAKE_LLM="1", CAREER_GUIDE_FAKE_LATENCY=str(latency))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버가 종료되었습니다 (exit {process.returncode})")
+        try:
+            if requests.get(url + "/health", timeout=1).ok:
+                return process, url
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("서버 시작 대기 시간 초과")
+
+
+def run_load(url, endpoint="guide", n_requests=200, concurrency=16, warmup=None):
+    """
+    n_requests개의 요청을 concurrency개 스레드로 보내고 처리량과 지연 시간 분포를 반환합니다.
+    워커 프로세스마다 첫 요청 비용이 있으므로 concurrency개 요청을 먼저 보내고 측정에서 제외합니다.
+    """
+    make_payload = PAYLOADS[endpoint]
+    local = threading.local()
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def call(i):
+        start = time.perf_counter()
+        try:
+            ok = session().post(f"{url}/{endpoint}", json=make_payload(i), timeout=120).ok
+        except requests.RequestException:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    warmup = concurrency if warmup is None else warmup
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(-warmup, 0)))
+
+        start = time.perf_counter()
+        results = list(pool.map(call, range(n_requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies = np.array([latency for _, latency in results]) * 1000
+    ok = sum(ok for ok, _ in results)
+    return {
+        "endpoint": endpoint,
+        "requests": n_requests,
+        "ok": ok,
+        "failed": n_requests - ok,
+        "elapsed": elapsed,
+        "rps": n_requests / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def format_result(result):
+    return (f"{result['endpoint']:<16} {result['ok']}/{result['requests']} 성공  "
+            f"{result['rps']:.1f} req/s  p50 {result['p50_ms']:.0f}ms  "
+            f"p95 {result['p95_ms']:.0f}ms  p99 {result['p99_ms']:.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="취업 준비 가이드 API 부하 테스트")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (없으면 가짜 LLM 서버를 띄움)")
+    parser.add_argument("--endpoint", choices=list(PAYLOADS) + ["all"], default="all")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 프로세스 수")
+    parser.add_argument("--latency", type=float, default=0.05, help="가짜 LLM 호출당 지연(초)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if not url:
+        start = time.perf_counter()
+        process, url = start_server(args.port, workers=args.workers, latency=args.latency)
+        print(f"서버 준비 완료 ({time.perf_counter() - start:.1f}s, 워커 {args.workers}개, "
+              f"LLM 지연 {args.latency * 1000:.0f}ms)")
+
+    try:
+        endpoints = list(PAYLOADS) if args.endpoint == "all" else [args.endpoint]
+        for endpoint in endpoints:
+            print(format_result(run_load(url, endpoint, args.requests, args.concurrency)))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
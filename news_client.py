@@ -0,0 +1,301 @@
+import os
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from stub_server import StubHandler, StubServer
+
+
+###############################################################################
+# DeepSearch 뉴스 API 클라이언트
+# - requests.Session 하나를 재사용 (keep-alive, 호스트별 커넥션 풀)
+# - 연결/읽기 timeout, 429·5xx 응답과 연결 오류는 지수 backoff로 재시도
+# - page_size(최대 100)를 넘는 기사 수는 page 파라미터로 이어서 조회
+# - 여러 키워드를 스레드 풀로 동시에 조회
+# - base_url을 바꾸면 로컬 스텁 서버(아래 StubDeepSearchServer)로 오프라인 측정 가능
+###############################################################################
+
+DEEPSEARCH_BASE_URL = os.environ.get("DEEPSEARCH_BASE_URL", "https://api-v2.deepsearch.com")
+DEEPSEARCH_API_KEY = os.environ.get("DEEPSEARCH_API_KEY", "")
+ARTICLES_PATH = "/v1/articles"
+
+MAX_PAGE_SIZE = 100
+RETRY_STATUS = (429, 500, 502, 503, 504)
+NEWS_COLUMNS = ["Title", "Date", "Section", "Publisher", "Summary", "Content URL"]
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def extract_article(article):
+    """
+    DeepSearch 기사 JSON에서 앱이 사용하는 항목만 추출합니다.
+    """
+    published_at = article.get("published_at")
+    return {
+        "Title": article.get("title", "N/A"),
+        "Date": published_at.split("T")[0] if published_at else "N/A",
+        "Section": ", ".join(article.get("sections", ["N/A"])),
+        "Publisher": article.get("publisher", "N/A"),
+        "Summary": (article.get("summary") or "N/A").replace("\n", " "),
+        "Content URL": article.get("content_url", "N/A"),
+    }
+
+
+def to_frame(articles):
+    import pandas as pd
+
+    return pd.DataFrame([extract_article(article) for article in articles], columns=NEWS_COLUMNS)
+
+
+class NewsClient:
+    """
+    커넥션 풀을 공유하는 DeepSearch 기사 검색 클라이언트.
+    timeout은 (연결, 읽기) 초이며, 재시도는 urllib3 Retry가 처리합니다.
+    """
+
+    def __init__(self, base_url=DEEPSEARCH_BASE_URL, api_key=DEEPSEARCH_API_KEY,
+                 timeout=(3.05, 10), retries=3, backoff=0.5, pool_size=16, max_workers=8):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _get_page(self, keyword, page, page_size, date_from=None):
+        params = {"keyword": keyword, "page": page, "page_size": page_size, "api_key": self.api_key}
+        if date_from:
+            params["date_from"] = date_from
+        response = self.session.get(self.base_url + ARTICLES_PATH, params=params, timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"API 호출 실패: 상태 코드 {response.status_code}\n{response.text[:500]}")
+        return response.json()
+
+    def fetch_articles(self, keyword, limit=30, date_from=None):
+        """
+        keyword 기사 JSON을 최대 limit개까지 페이지를 넘겨 가며 가져옵니다.
+        """
+        page_size = min(limit, MAX_PAGE_SIZE)
+        articles = []
+        page = 1
+        while len(articles) < limit:
+            data = self._get_page(keyword, page, page_size, date_from)
+            batch = data.get("data", [])
+            articles.extend(batch)
+            total_pages = data.get("total_pages")
+            if len(batch) < page_size or (total_pages is not None and page >= total_pages):
+                break
+            page += 1
+        return articles[:limit]
+
+    def search(self, keyword, limit=30, date_from=None):
+        """
+        기사 DataFrame을 반환합니다. 실패하면 같은 열을 가진 빈 DataFrame을 반환합니다.
+        """
+        import pandas as pd
+        import requests
+
+        try:
+            return to_frame(self.fetch_articles(keyword, limit, date_from))
+        except (requests.RequestException, RuntimeError, ValueError) as e:
+            print(f"[{keyword}] 뉴스 검색 실패: {e}")
+            return pd.DataFrame(columns=NEWS_COLUMNS)
+
+    def search_many(self, keywords, limit=30, date_from=None):
+        """
+        여러 키워드를 동시에 조회하여 keywords 순서대로 DataFrame 리스트를 반환합니다.
+        """
+        keywords = list(keywords)
+        if not keywords:
+            return []
+        workers = min(self.max_workers, len(keywords))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda keyword: self.search(keyword, limit, date_from), keywords))
+
+    def close(self):
+        self.session.close()
+
+
+def get_news_client(base_url=DEEPSEARCH_BASE_URL, api_key=DEEPSEARCH_API_KEY):
+    """
+    base_url마다 클라이언트(커넥션 풀)를 한 번만 생성하여 재사용합니다.
+    """
+    key = (base_url, api_key)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = NewsClient(base_url=base_url, api_key=api_key)
+                _clients[key] = client
+    return client
+
+
+###############################################################################
+# 로컬 스텁 서버: DeepSearch 응답 JSON을 재생 (지연, 일시적 오류 주입 가능)
+###############################################################################
+
+def make_synthetic_articles(n, keyword="키워드", month="2024-12"):
+    return [
+        {
+            "title": f"{keyword} 관련 기사 {i}",
+            "published_at": f"{month}-{28 - i % 28:02d}T09:00:00",
+            "sections": ["economy"],
+            "publisher": "스텁일보",
+            "summary": f"{keyword} 시장 동향 요약 {i}\n두 번째 줄",
+            "content_url": f"https://news.example.com/{keyword}/{i}",
+        }
+        for i in range(n)
+    ]
+
+
+class StubDeepSearchServer(StubServer):
+    """
+    /v1/articles를 흉내 내는 로컬 HTTP 서버.
+    articles(기사 JSON 리스트)를 date_from으로 거르고 page/page_size로 잘라 돌려주며,
+    latency초 지연 후 응답하며, fail_every번째 요청마다 503을 반환합니다.
+
+        with StubDeepSearchServer(articles) as server:
+            NewsClient(base_url=server.url).search("AI")
+    """
+
+    def __init__(self, articles=None, latency=0.0, fail_every=0):
+        from http.server import BaseHTTPRequestHandler
+        from urllib.parse import urlparse, parse_qs
+
+        self.articles = articles if articles is not None else make_synthetic_articles(200)
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self.connections = 0
+        lock = threading.Lock()
+        stub = self
+
+        class Handler(StubHandler, BaseHTTPRequestHandler):
+            def setup(self):
+                super().setup()
+                with lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                with lock:
+                    stub.requests += 1
+                    count = stub.requests
+                time.sleep(stub.latency)
+
+                if stub.fail_every and count % stub.fail_every == 0:
+                    self.send_json(503, {"error": "unavailable"})
+                    return
+
+                query = parse_qs(urlparse(self.path).query)
+                page = int(query.get("page", ["1"])[0])
+                page_size = int(query.get("page_size", ["10"])[0])
+                articles = stub.articles
+                date_from = query.get("date_from", [None])[0]
+                if date_from:
+                    articles = [a for a in articles if (a.get("published_at") or "")[:10] >= date_from]
+                total = len(articles)
+                start = (page - 1) * page_size
+                self.send_json(200, {
+                    "data": articles[start:start + page_size],
+                    "total_items": total,
+                    "total_pages": (total + page_size - 1) // page_size,
+                    "page": page,
+                    "page_size": page_size,
+                })
+
+        self.serve(Handler)
+
+
+class FakeNewsClient:
+    """
+    네트워크 없이 키워드별 합성 기사(make_synthetic_articles)를 돌려주는 NewsClient 대용.
+    가짜 LLM 모드(fake_llm.make_fake_pipeline)의 뉴스 저장소가 실제 DeepSearch API를 부르지 않도록 합니다.
+    StubDeepSearchServer처럼 date_from 이후 기사만 돌려줍니다.
+    """
+
+    def __init__(self, n_articles=50, month="2024-12"):
+        self.n_articles = n_articles
+        self.month = month
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def fetch_articles(self, keyword, limit=30, date_from=None):
+        with self._lock:
+            self.requests += 1
+        articles = make_synthetic_articles(self.n_articles, keyword, self.month)
+        if date_from:
+            articles = [a for a in articles if a["published_at"][:10] >= date_from]
+        return articles[:limit]
+
+
+###############################################################################
+# 벤치마크: 기존 방식(키워드마다 requests.get 순차 호출) vs 풀링 + 동시 조회
+###############################################################################
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def benchmark(rounds=20, latency=0.05, fail_every=0, limit=30):
+    import requests
+
+    keywords = ["AI", "반도체", "핀테크"]
+    with StubDeepSearchServer(latency=latency, fail_every=fail_every) as server:
+        def legacy_round():
+            for keyword in keywords:
+                requests.get(server.url + ARTICLES_PATH,
+                             params={"keyword": keyword, "page_size": limit}).json()
+
+        client = NewsClient(base_url=server.url, backoff=0.01)
+
+        def pooled_round():
+            client.search_many(keywords, limit=limit)
+
+        for name, run in [("순차 requests.get", legacy_round), ("세션 풀 + 동시 조회", pooled_round)]:
+            run()  # 워밍업 (pandas import 등 1회성 비용 제외)
+            server.requests = server.connections = 0
+            latencies = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                run()
+                latencies.append(time.perf_counter() - start)
+            total = sum(latencies)
+            print(f"{name:<20} {rounds * len(keywords) / total:7.1f} keywords/s  "
+                  f"p50 {_percentile(latencies, 50) * 1000:6.1f} ms  "
+                  f"p95 {_percentile(latencies, 95) * 1000:6.1f} ms  "
+                  f"p99 {_percentile(latencies, 99) * 1000:6.1f} ms  "
+                  f"(요청 {server.requests}, 연결 {server.connections})")
+
+        # 페이지네이션: page_size 상한을 넘는 기사 수
+        server.requests = 0
+        articles = client.fetch_articles("AI", limit=150)
+        print(f"페이지네이션: 기사 {len(articles)}개, 요청 {server.requests}회")
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="뉴스 클라이언트 처리량/지연 벤치마크 (로컬 스텁 서버)")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 서버 응답 지연(초)")
+    parser.add_argument("--fail-every", type=int, default=0, help="N번째 요청마다 503 반환")
+    args = parser.parse_args()
+
+    benchmark(rounds=args.rounds, latency=args.latency, fail_every=args.fail_every)
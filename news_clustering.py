@@ -0,0 +1,189 @@
+import time
+import argparse
+import numpy as np
+
+from tracing import traced
+
+
+###############################################################################
+# 뉴스 요약 클러스터링
+# - TF-IDF 희소 행렬을 밀집 행렬로 바꾸지 않고 TruncatedSVD(LSA)로 차원 축소
+# - k를 2 ~ max_k 범위에서만 탐색하고, 실루엣 점수가 patience번 연속 개선되지 않으면 중단
+# - 최적 k의 KMeans 결과를 재사용하므로 최종 학습을 다시 하지 않음
+# - 클러스터별 DataFrame과 요약용 클러스터 텍스트를 한 번에 반환
+# - 클러스터 안의 기사는 중심과의 코사인 유사도(centrality) 순으로 정렬
+#   (프롬프트 토큰 예산으로 자를 때 대표 기사부터 남도록, prompts.trim_cluster_text 참고)
+###############################################################################
+
+N_COMPONENTS = 8
+MAX_K = 10
+PATIENCE = 2
+
+
+def create_cluster_text(clustered_news):
+    """
+    클러스터별 기사 요약을 'Cluster {id}' 헤더와 함께 하나의 문자열로 합칩니다.
+    """
+    output_string = []
+    for cluster_id, cluster_df in clustered_news.items():
+        output_string.append(f"Cluster {cluster_id}")
+        output_string.extend(cluster_df['Summary'].tolist())
+        output_string.append("")
+    return "\n".join(output_string)
+
+
+@traced("tfidf_svd")
+def reduce_dimensions(filtered_docs, n_components=N_COMPONENTS, seed=42):
+    """
+    전처리된 문서를 TF-IDF → TruncatedSVD로 변환한 (n_docs, n_components) 행렬을 반환합니다.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.decomposition import TruncatedSVD
+
+    dtm = TfidfVectorizer().fit_transform(filtered_docs)
+    n_components = min(n_components, dtm.shape[0] - 1, dtm.shape[1] - 1)
+    if n_components < 1:
+        return dtm.toarray()
+    return TruncatedSVD(n_components=n_components, random_state=seed).fit_transform(dtm)
+
+
+@traced("kmeans")
+def select_clusters(features, max_k=MAX_K, patience=PATIENCE, seed=42):
+    """
+    실루엣 점수 기준으로 k를 고르고 (라벨, k, k별 점수)를 반환합니다.
+    """
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+
+    n_docs = len(features)
+    upper = min(max_k, n_docs - 1)
+    if upper < 2:
+        return np.zeros(n_docs, dtype=int), 1, {}
+
+    best_labels, best_k, best_score = None, 0, -1.0
+    scores = {}
+    stale = 0
+    for k in range(2, upper + 1):
+        labels = KMeans(n_clusters=k, random_state=seed, n_init=3).fit_predict(features)
+        if len(set(labels)) < 2:
+            break
+        score = silhouette_score(features, labels)
+        scores[k] = score
+
+        if score > best_score:
+            best_labels, best_k, best_score = labels, k, score
+            stale = 0
+        else:
+            stale += 1
+            if stale >= patience:
+                break
+
+    if best_labels is None:
+        return np.zeros(n_docs, dtype=int), 1, scores
+    return best_labels, best_k, scores
+
+
+def centrality(features, labels):
+    """
+    각 문서와 자기 클러스터 중심의 코사인 유사도.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    scores = np.ones(len(features))
+    for label in np.unique(labels):
+        members = labels == label
+        center = features[members].mean(axis=0)
+        norms = np.linalg.norm(features[members], axis=1) * np.linalg.norm(center)
+        scores[members] = np.divide(features[members] @ center, norms, out=np.ones(members.sum()), where=norms > 0)
+    return scores
+
+
+def cluster_news_and_text(news, preprocess=None, max_k=MAX_K, patience=PATIENCE, preprocess_many=None):
+    """
+    뉴스 DataFrame을 클러스터링하여 ({cluster_id: DataFrame}, 클러스터 텍스트)를 반환합니다.
+    cluster_id는 1부터 시작합니다.
+    preprocess_many(요약 리스트 → 전처리 결과 리스트)가 주어지면 preprocess 대신 한 번에 전처리합니다.
+    """
+    news = news.reset_index(drop=True)
+    summaries = news['Summary'].tolist()
+    if preprocess_many is not None:
+        filtered_docs = preprocess_many(summaries)
+    else:
+        filtered_docs = [preprocess(doc) for doc in summaries]
+
+    if len(filtered_docs) < 3 or not any(doc.strip() for doc in filtered_docs):
+        labels = np.zeros(len(news), dtype=int)
+        scores = np.ones(len(news))
+    else:
+        features = reduce_dimensions(filtered_docs)
+        labels, _, _ = select_clusters(features, max_k=max_k, patience=patience)
+        scores = centrality(features, labels)
+
+    news = news.assign(cluster_id=labels + 1, centrality=scores)
+    news = news.sort_values(by=['cluster_id', 'centrality'], ascending=[True, False], kind='stable')
+    news = news.reset_index(drop=True)
+
+    cluster_dict = {
+        cluster_id: cluster_df.reset_index(drop=True)
+        for cluster_id, cluster_df in news.groupby('cluster_id')
+    }
+    return cluster_dict, create_cluster_text(cluster_dict)
+
+
+###############################################################################
+# 벤치마크: 기존 방식(밀집 PCA + k 전체 탐색 + 재학습) 대비 키워드당 소요 시간
+###############################################################################
+
+def legacy_cluster_labels(filtered_docs):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.decomposition import PCA
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+
+    dense = np.array(TfidfVectorizer().fit_transform(filtered_docs).todense())
+    features = PCA(n_components=8).fit_transform(dense)
+    best_k, best_score = 0, -1
+    for k in range(2, len(filtered_docs)):
+        score = silhouette_score(features, KMeans(n_clusters=k, random_state=42).fit_predict(features))
+        if score > best_score:
+            best_k, best_score = k, score
+    return KMeans(n_clusters=best_k, random_state=42).fit_predict(features)
+
+
+def make_synthetic_docs(n_docs, n_topics=5, words_per_doc=40, seed=0):
+    rng = np.random.default_rng(seed)
+    vocab = [f"단어{i}" for i in range(2000)]
+    topics = [rng.choice(len(vocab), 60, replace=False) for _ in range(n_topics)]
+    docs = []
+    for _ in range(n_docs):
+        topic = topics[rng.integers(n_topics)]
+        words = np.concatenate([rng.choice(topic, words_per_doc - 10),
+                                rng.integers(len(vocab), size=10)])
+        docs.append(" ".join(vocab[w] for w in words))
+    return docs
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="뉴스 클러스터링 벤치마크 (키워드당 소요 시간)")
+    parser.add_argument("--docs", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    docs = make_synthetic_docs(args.docs)
+    news = pd.DataFrame({"Summary": docs})
+
+    # 기존 코드는 cluster_news를 두 번 호출(클러스터 dict + 클러스터 텍스트)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        legacy_cluster_labels(docs)
+        legacy_cluster_labels(docs)
+    legacy = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        clusters, _ = cluster_news_and_text(news, preprocess=lambda doc: doc)
+    new = (time.perf_counter() - start) / args.repeat
+
+    print(f"기존 방식   {legacy * 1000:8.1f} ms / keyword")
+    print(f"새 방식     {new * 1000:8.1f} ms / keyword  ({legacy / new:.1f}x, k={len(clusters)})")
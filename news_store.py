@@ -0,0 +1,325 @@
+import os
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from news_client import NEWS_COLUMNS, extract_article, get_news_client
+
+
+###############################################################################
+# 로컬 뉴스 기사 저장소
+# - 기사는 content_url로 중복 제거하여 SQLite에 한 번만 저장, 키워드와는 N:M 연결
+# - 키워드를 마지막으로 갱신한 지 stale_after초가 지나지 않았으면 API를 호출하지 않음
+# - 갱신할 때는 캐시된 가장 최근 기사 날짜를 date_from으로 주어 새 기사만 가져옴
+# - API 호출이 실패하면 캐시된 기사를 그대로 사용하고, 실패를 기록해 지수 백오프
+#   (retry_after초부터 두 배씩, 최대 max(stale_after, retry_after)초) 동안은 그 키워드의 API를 다시 호출하지 않음
+# - 기사 요약의 전처리 결과(Kiwi 명사 토큰)도 요약 해시로 저장하여 한 번만 계산
+###############################################################################
+
+DEFAULT_STORE_PATH = os.environ.get("NEWS_STORE_PATH", "news_store.sqlite")
+DEFAULT_STALE_AFTER = float(os.environ.get("NEWS_STALE_AFTER", 6 * 3600))
+DEFAULT_RETRY_AFTER = float(os.environ.get("NEWS_RETRY_AFTER", 60))
+
+# 전처리 방식이 바뀌면 올려서 이전 토큰 캐시를 무시
+TOKENS_VERSION = 2
+
+
+def text_key(text):
+    return hashlib.sha256(f"{TOKENS_VERSION}\0{text}".encode("utf-8")).hexdigest()
+
+
+def normalize_keyword(keyword):
+    return " ".join(str(keyword).split())
+
+
+class NewsStore:
+    """
+    키워드별 뉴스 기사와 전처리 토큰을 보관하는 SQLite 저장소.
+    client는 fetch_articles(keyword, limit, date_from)를 제공하는 NewsClient이며,
+    없으면 처음 갱신할 때 get_news_client()로 생성합니다.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, client=None, stale_after=DEFAULT_STALE_AFTER,
+                 retry_after=DEFAULT_RETRY_AFTER, max_workers=8):
+        self.path = path
+        self.client = client
+        self.stale_after = stale_after
+        self.retry_after = retry_after
+        self.max_workers = max_workers
+        self.stats = {"fresh": 0, "refreshed": 0, "fetch_failed": 0, "backoff": 0,
+                      "new_articles": 0, "token_hits": 0, "token_misses": 0}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " content_url TEXT PRIMARY KEY, title TEXT, published_at TEXT, date TEXT,"
+                " section TEXT, publisher TEXT, summary TEXT, fetched_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS keyword_articles ("
+                " keyword TEXT NOT NULL, content_url TEXT NOT NULL,"
+                " PRIMARY KEY (keyword, content_url))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS keywords ("
+                " keyword TEXT PRIMARY KEY, refreshed_at REAL NOT NULL, latest_date TEXT)"
+            )
+            # 갱신 실패 기록 (성공하면 지움)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS refresh_failures ("
+                " keyword TEXT PRIMARY KEY, failed_at REAL NOT NULL, failures INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, tokens TEXT NOT NULL)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.stats[name] += n
+
+    def _get_client(self):
+        if self.client is None:
+            self.client = get_news_client()
+        return self.client
+
+    ###########################################################################
+    # 기사
+    ###########################################################################
+
+    def _save(self, keyword, articles):
+        """
+        기사를 저장하고 키워드에 연결합니다. 새로 추가된 기사 수를 반환합니다.
+        """
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            before = conn.total_changes
+            for article in articles:
+                url = article.get("content_url")
+                if not url:
+                    continue
+                row = extract_article(article)
+                conn.execute(
+                    "INSERT OR IGNORE INTO articles"
+                    " (content_url, title, published_at, date, section, publisher, summary, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, row["Title"], article.get("published_at") or "", row["Date"],
+                     row["Section"], row["Publisher"], row["Summary"], now),
+                )
+            added = conn.total_changes - before
+            conn.executemany(
+                "INSERT OR IGNORE INTO keyword_articles (keyword, content_url) VALUES (?, ?)",
+                [(keyword, article["content_url"]) for article in articles if article.get("content_url")],
+            )
+            latest = conn.execute(
+                "SELECT MAX(a.date) FROM articles a JOIN keyword_articles k USING (content_url)"
+                " WHERE k.keyword = ? AND a.date != 'N/A'",
+                (keyword,),
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO keywords (keyword, refreshed_at, latest_date) VALUES (?, ?, ?)",
+                (keyword, now, latest),
+            )
+            conn.execute("DELETE FROM refresh_failures WHERE keyword = ?", (keyword,))
+        return added
+
+    def _record_failure(self, keyword):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO refresh_failures (keyword, failed_at, failures) VALUES (?, ?, 1)"
+                " ON CONFLICT(keyword) DO UPDATE SET failed_at = excluded.failed_at, failures = failures + 1",
+                (keyword, time.time()),
+            )
+
+    def _backing_off(self, keyword):
+        """
+        최근 갱신 실패 후 백오프 시간(retry_after * 2^(실패 횟수 - 1), 최대 max(stale_after, retry_after))이
+        지나지 않았으면 True.
+        """
+        row = self._connect().execute(
+            "SELECT failed_at, failures FROM refresh_failures WHERE keyword = ?", (keyword,)
+        ).fetchone()
+        if row is None:
+            return False
+        delay = min(max(self.stale_after, self.retry_after), self.retry_after * 2 ** (row[1] - 1))
+        return time.time() - row[0] < delay
+
+    def refresh(self, keyword, limit=30, force=False):
+        """
+        keyword가 오래되었으면 API에서 새 기사만 가져와 저장합니다.
+        API 호출이 성공했으면 True를 반환합니다. 최근에 실패한 키워드는 백오프 동안 호출하지 않습니다 (force=True 제외).
+        """
+        import requests
+
+        keyword = normalize_keyword(keyword)
+        row = self._connect().execute(
+            "SELECT refreshed_at, latest_date FROM keywords WHERE keyword = ?", (keyword,)
+        ).fetchone()
+        if row is not None and not force and time.time() - row[0] < self.stale_after:
+            self._count("fresh")
+            return False
+        if not force and self._backing_off(keyword):
+            self._count("backoff")
+            return False
+
+        # 가장 최근 기사 날짜부터 다시 조회 (같은 날짜 기사는 content_url로 중복 제거)
+        date_from = row[1] if row is not None else None
+        try:
+            articles = self._get_client().fetch_articles(keyword, limit=limit, date_from=date_from)
+        except (requests.RequestException, RuntimeError, ValueError) as e:
+            print(f"[{keyword}] 뉴스 갱신 실패, 캐시된 기사를 사용합니다: {e}")
+            self._count("fetch_failed")
+            self._record_failure(keyword)
+            return False
+
+        self._count("new_articles", self._save(keyword, articles))
+        self._count("refreshed")
+        return True
+
+    def articles(self, keyword, limit=30):
+        """
+        keyword의 최신 기사 limit개를 DataFrame(NEWS_COLUMNS)으로 반환합니다.
+        """
+        import pandas as pd
+
+        keyword = normalize_keyword(keyword)
+        rows = self._connect().execute(
+            "SELECT a.title, a.date, a.section, a.publisher, a.summary, a.content_url"
+            " FROM articles a JOIN keyword_articles k USING (content_url)"
+            " WHERE k.keyword = ? ORDER BY a.published_at DESC, a.content_url LIMIT ?",
+            (keyword, limit),
+        ).fetchall()
+        return pd.DataFrame(rows, columns=NEWS_COLUMNS)
+
+    def search(self, keyword, limit=30):
+        """
+        필요하면 갱신한 뒤 keyword의 최신 기사 DataFrame을 반환합니다.
+        """
+        self.refresh(keyword, limit=limit)
+        return self.articles(keyword, limit=limit)
+
+    def search_many(self, keywords, limit=30):
+        """
+        여러 키워드를 동시에 조회하여 keywords 순서대로 DataFrame 리스트를 반환합니다.
+        """
+        keywords = list(keywords)
+        if not keywords:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(keywords))) as pool:
+            return list(pool.map(lambda keyword: self.search(keyword, limit), keywords))
+
+    ###########################################################################
+    # 전처리 토큰
+    ###########################################################################
+
+    def preprocess_many(self, texts, preprocess, batch=False):
+        """
+        texts를 preprocess한 결과를 반환합니다. 이미 계산한 텍스트는 저장된 결과를 사용합니다.
+        batch=True이면 preprocess는 텍스트 리스트를 받아 결과 리스트를 반환하는 함수이며,
+        저장되지 않은 텍스트를 한 번에 넘깁니다.
+        """
+        texts = list(texts)
+        keys = [text_key(text) for text in texts]
+        conn = self._connect()
+
+        cached = {}
+        unique = list(set(keys))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            cached.update(conn.execute(
+                f"SELECT key, tokens FROM tokens WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in pending:
+                pending[key] = text
+        if batch:
+            missing = dict(zip(pending, preprocess(list(pending.values())))) if pending else {}
+        else:
+            missing = {key: preprocess(text) for key, text in pending.items()}
+        if missing:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO tokens (key, tokens) VALUES (?, ?)", missing.items())
+            cached.update(missing)
+
+        self._count("token_misses", len(missing))
+        self._count("token_hits", len(texts) - len(missing))
+        return [cached[key] for key in keys]
+
+    def cached(self, preprocess):
+        """
+        preprocess(text)와 같은 형태로 쓸 수 있는, 결과가 저장되는 함수를 반환합니다.
+        """
+        def cached_preprocess(text):
+            return self.preprocess_many([text], preprocess)[0]
+
+        return cached_preprocess
+
+    def cached_many(self, preprocess_many):
+        """
+        preprocess_many(texts)와 같은 형태로 쓸 수 있는, 결과가 저장되는 배치 함수를 반환합니다.
+        """
+        def cached_preprocess_many(texts):
+            return self.preprocess_many(texts, preprocess_many, batch=True)
+
+        return cached_preprocess_many
+
+    def clear(self):
+        with self._connect() as conn:
+            for table in ("keyword_articles", "articles", "keywords", "refresh_failures", "tokens"):
+                conn.execute(f"DELETE FROM {table}")
+
+
+###############################################################################
+# 데모: 로컬 스텁 서버로 증분 갱신과 중복 제거 확인
+###############################################################################
+
+if __name__ == "__main__":
+    import tempfile
+    from news_client import NewsClient, StubDeepSearchServer, make_synthetic_articles
+
+    parser = argparse.ArgumentParser(description="뉴스 저장소 증분 갱신 데모 (로컬 스텁 서버)")
+    parser.add_argument("--sessions", type=int, default=20, help="같은 키워드를 조회하는 세션 수")
+    args = parser.parse_args()
+
+    keywords = ["AI", "반도체", "핀테크"]
+    with StubDeepSearchServer(latency=0.05) as server, tempfile.TemporaryDirectory() as tmp:
+        store = NewsStore(os.path.join(tmp, "news.sqlite"), client=NewsClient(base_url=server.url), stale_after=60)
+
+        start = time.perf_counter()
+        for _ in range(args.sessions):
+            news = store.search_many(keywords)
+            for df in news:
+                store.preprocess_many(df["Summary"].tolist(), lambda text: " ".join(text.split()[:3]))
+        elapsed = time.perf_counter() - start
+        print(f"{args.sessions}개 세션: API 요청 {server.requests}회, {elapsed * 1000 / args.sessions:.1f} ms/session")
+        print(f"stats: {store.stats}")
+
+        # 새 기사가 추가된 뒤 강제 갱신: date_from 이후 기사만 받아 중복 없이 추가
+        server.articles = make_synthetic_articles(5, keyword="신규", month="2025-01") + server.articles
+        server.requests = 0
+        date_from = store._connect().execute("SELECT latest_date FROM keywords WHERE keyword = 'AI'").fetchone()[0]
+        store.refresh("AI", force=True)
+        print(f"증분 갱신(date_from={date_from}): API 요청 {server.requests}회, 저장된 AI 기사 {len(store.articles('AI', limit=1000))}개, "
+              f"새 기사 누적 {store.stats['new_articles']}개")
+
+        # 업스트림 장애: 오래된 키워드를 여러 세션이 조회해도 첫 실패 후 백오프 동안은 다시 호출하지 않음
+        server.fail_every = 1
+        server.requests = 0
+        store.stale_after = 0
+        for _ in range(args.sessions):
+            store.search("반도체")
+        print(f"장애 중 {args.sessions}회 조회: API 요청 {server.requests}회, 실패 {store.stats['fetch_failed']}회, "
+              f"백오프로 건너뜀 {store.stats['backoff']}회")
@@ -0,0 +1,116 @@
+import time
+import asyncio
+import inspect
+
+
+###############################################################################
+# LLM 파이프라인 비동기 실행기
+# - 각 단계(Stage)와 의존 관계로 DAG를 구성
+# - 의존하는 단계가 모두 끝난 단계부터 동시에 실행 (세마포어로 동시 실행 수 제한)
+# - 동기 함수(기존 client.chat.completions.create 호출 함수)는 스레드에서,
+#   async 함수(AsyncOpenAI 호출 등)는 이벤트 루프에서 바로 실행
+# - 단계별 시작/종료 시각과 소요 시간을 함께 반환
+###############################################################################
+
+class Stage:
+    """
+    파이프라인 단계. fn은 deps 순서대로 앞 단계의 결과를 인자로 받습니다.
+    """
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, deps={self.deps})"
+
+
+def _check_dag(stages):
+    names = {stage.name for stage in stages}
+    if len(names) != len(stages):
+        raise ValueError("단계 이름이 중복되었습니다.")
+    for stage in stages:
+        missing = set(stage.deps) - names
+        if missing:
+            raise ValueError(f"'{stage.name}' 단계의 의존 단계가 없습니다: {sorted(missing)}")
+
+    # 위상 정렬로 순환 의존 확인
+    remaining = {stage.name: set(stage.deps) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"순환 의존이 있습니다: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+async def run_dag(stages, max_concurrency=4):
+    """
+    DAG를 실행하고 (단계별 결과, 단계별 소요 시간)을 반환합니다.
+    한 단계라도 실패하면 나머지 단계를 취소하고 예외를 다시 발생시킵니다.
+    """
+    _check_dag(stages)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = {}
+    results = {}
+    timings = {}
+    origin = time.perf_counter()
+
+    async def run_stage(stage):
+        args = [await tasks[dep] for dep in stage.deps]
+        async with semaphore:
+            start = time.perf_counter()
+            if inspect.iscoroutinefunction(stage.fn):
+                result = await stage.fn(*args)
+            else:
+                result = await asyncio.to_thread(stage.fn, *args)
+            end = time.perf_counter()
+
+        timings[stage.name] = {
+            "start": start - origin,
+            "end": end - origin,
+            "duration": end - start,
+        }
+        results[stage.name] = result
+        return result
+
+    # 의존 단계의 task가 먼저 만들어지도록 위상 순서로 생성
+    pending = list(stages)
+    while pending:
+        for stage in list(pending):
+            if all(dep in tasks for dep in stage.deps):
+                tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+                pending.remove(stage)
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    return results, timings
+
+
+def run_pipeline(stages, max_concurrency=4):
+    """
+    동기 코드(Streamlit 스크립트 등)에서 DAG를 실행합니다.
+    """
+    return asyncio.run(run_dag(stages, max_concurrency))
+
+
+def format_timings(timings):
+    """
+    단계별 소요 시간을 시작 순서대로 정리한 문자열을 반환합니다.
+    """
+    lines = []
+    for name, t in sorted(timings.items(), key=lambda item: item[1]["start"]):
+        lines.append(f"{name:<24} {t['start']:7.2f}s → {t['end']:7.2f}s  ({t['duration']:.2f}s)")
+    if timings:
+        total = max(t["end"] for t in timings.values())
+        serial = sum(t["duration"] for t in timings.values())
+        lines.append(f"전체 {total:.2f}s (순차 실행 시 {serial:.2f}s)")
+    return "\n".join(lines)
@@ -0,0 +1,779 @@
+import os
+import json
+import hashlib
+import time
+import shutil
+import argparse
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+from embedding_store import FIELDS, DEFAULT_PASSAGE_MODEL, EmbeddingStore, content_hash, write_store
+
+
+###############################################################################
+# 세그먼트 기반 공고 인덱스 (공고 요약 + 세 필드 임베딩)
+# - 세그먼트: 한 번 쓰면 바뀌지 않는 공고 묶음 (postings.parquet + embeddings/ 임베딩 저장소)
+#   * 새 공고 → 새 추가(append) 세그먼트
+#   * 삭제/만료 공고 → manifest의 툼스톤 {posting_id: 세그먼트 번호}
+#     (그 번호보다 앞선 세그먼트의 행만 지움 → 같은 id로 다시 추가한 공고는 살아 있음)
+#   * 압축(compaction): 살아 있는 행만 모아 세그먼트 하나로 합치고 툼스톤을 비움
+#   * 재임베딩(reembed): 압축과 같되 임베딩 백엔드를 바꿔 모든 공고를 다시 임베딩 (embedding_backend.py)
+#   * 모든 세그먼트는 같은 임베딩 모델로 만든 것이어야 함 (다른 모델로 추가하면 ValueError)
+# - manifest.json을 임시 파일 + os.replace로 교체하여 커밋 (쓰기는 .lock 파일 잠금으로 한 프로세스씩)
+# - 읽기: PostingIndex.snapshot()이 poll_interval마다 manifest를 확인하여 새 스냅샷으로 교체
+#   이미 연 세그먼트는 다시 읽지 않고 재사용 (앱 재시작 / 전체 재로딩 없음)
+#   임베딩은 세그먼트별 memmap 위의 뷰(SegmentedMatrix)로 읽음 (스냅샷마다 RAM 복사본을 만들지 않음)
+#   서비스는 start_refresher(warm)로 새 스냅샷의 역색인/검색 인덱스를 요청 밖에서 만든 뒤 교체
+#   (career_guide.CareerGuidePipeline.start_index_maintenance: 압축 스레드와 함께 시작)
+# - Snapshot은 불변: 같은 스냅샷의 frame()과 store는 항상 같은 행을 같은 순서로 가리킴
+#   (career_guide.py는 요청 하나 동안 스냅샷 하나를 고정하여 search_db와 retrieval에 함께 사용)
+#
+#   python posting_index.py bootstrap                 # posting_store + embedding_store → 기본 세그먼트
+#   python posting_index.py append new.xlsx           # 새 공고 임베딩 후 세그먼트 추가 (Upstage API)
+#   python posting_index.py delete p12 p40            # 툼스톤
+#   python posting_index.py expire                    # expires_at이 지난 공고 툼스톤
+#   python posting_index.py compact [--watch 60]      # 압축 (--watch: 주기적으로 필요할 때만)
+#   python posting_index.py status
+#   python posting_index.py bench                     # 합성 코퍼스: 추가 후 첫 요청 비용, 압축, 전체 재빌드
+###############################################################################
+
+INDEX_VERSION = 1
+POSTING_INDEX_DIR = os.environ.get("POSTING_INDEX_DIR", "posting_index")
+POLL_INTERVAL = float(os.environ.get("POSTING_INDEX_POLL_INTERVAL", 5))
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".lock"
+
+# 세그먼트에 저장하는 공고 열 (posting_id, expires_at 제외)
+COLUMNS = ("job", "org_sum", "work_sum", "skills_sum", "total_sum")
+
+# 압축 조건: 세그먼트 수 또는 툼스톤 비율이 기준을 넘을 때
+COMPACT_MAX_SEGMENTS = 8
+COMPACT_MAX_DEAD_RATIO = 0.2
+
+# 압축 후 manifest에서 빠진 세그먼트 디렉토리를 지우기까지의 유예 시간(초)
+# (그 사이 이전 스냅샷을 읽는 프로세스가 있을 수 있음. POSIX에서는 열린 memmap은 삭제 후에도 유효)
+SEGMENT_GC_GRACE = float(os.environ.get("POSTING_INDEX_GC_GRACE", 600))
+
+
+def segment_name(seq):
+    return f"seg-{seq:06d}"
+
+
+def segment_seq(name):
+    return int(name.split("-")[1])
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != INDEX_VERSION:
+        raise ValueError(f"지원하지 않는 공고 인덱스 버전입니다: {manifest.get('version')}")
+    return manifest
+
+
+###############################################################################
+# 읽기: 세그먼트 / 스냅샷
+###############################################################################
+
+class Segment:
+    """
+    불변 세그먼트 하나. 공고 열은 처음 열 때 읽고, 임베딩은 memmap으로 엽니다.
+    """
+
+    def __init__(self, path, name):
+        import pandas as pd
+
+        self.name = name
+        self.seq = segment_seq(name)
+        self.path = os.path.join(path, name)
+        self.frame = pd.read_parquet(os.path.join(self.path, "postings.parquet"))
+        self.store = EmbeddingStore(os.path.join(self.path, "embeddings"))
+        if len(self.frame) != len(self.store):
+            raise ValueError(f"{name}: 공고 수와 임베딩 수가 다릅니다.")
+
+    def __len__(self):
+        return len(self.frame)
+
+    def live_rows(self, tombstones):
+        """
+        툼스톤으로 지워지지 않은 행 번호 배열.
+        """
+        if not tombstones:
+            return np.arange(len(self))
+        dead = [pid for pid, seq in tombstones.items() if self.seq < seq]
+        return np.flatnonzero(~self.frame["posting_id"].isin(dead).to_numpy())
+
+
+class SegmentedMatrix:
+    """
+    여러 세그먼트 memmap의 살아 있는 행을 이어 붙인 것처럼 읽는 (N, D) 읽기 전용 뷰.
+    matrix[start:stop], matrix[ids]는 해당 세그먼트에서 필요한 행만 읽어 복사하고,
+    np.asarray(matrix)만 전체를 이어 붙입니다 (압축 등 쓰기 경로 전용).
+    """
+
+    def __init__(self, blocks, dim, dtype=np.float32):
+        self.blocks = blocks  # [(memmap, 살아 있는 행 번호 또는 None(전체))]
+        self.offsets = np.cumsum([0] + [len(matrix) if rows is None else len(rows) for matrix, rows in blocks])
+        self.shape = (int(self.offsets[-1]), dim)
+        self.dtype = blocks[0][0].dtype if blocks else np.dtype(dtype)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _read(self, b, local):
+        matrix, rows = self.blocks[b]
+        return matrix[local] if rows is None else matrix[rows[local]]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return self[np.arange(start, stop, step)]
+            pieces = []
+            for b in range(len(self.blocks)):
+                lo, hi = max(start, self.offsets[b]), min(stop, self.offsets[b + 1])
+                if lo < hi:
+                    pieces.append(np.asarray(self._read(b, slice(lo - self.offsets[b], hi - self.offsets[b]))))
+            return np.concatenate(pieces) if pieces else np.empty((0, self.shape[1]), dtype=self.dtype)
+        if np.isscalar(key):
+            return self[np.array([key])][0]
+
+        ids = np.asarray(key, dtype=np.int64)
+        ids = np.where(ids < 0, ids + len(self), ids)
+        out = np.empty((len(ids), self.shape[1]), dtype=self.dtype)
+        which = np.searchsorted(self.offsets, ids, side="right") - 1
+        for b in np.unique(which):
+            mask = which == b
+            out[mask] = self._read(b, ids[mask] - self.offsets[b])
+        return out
+
+    def __array__(self, dtype=None, copy=None):
+        matrix = self[:]
+        return matrix if dtype is None else matrix.astype(dtype, copy=False)
+
+
+class SnapshotStore:
+    """
+    스냅샷의 살아 있는 행만 모은 임베딩 저장소 (embedding_store.EmbeddingStore와 같은 인터페이스).
+    지워진 행이 없는 단일 세그먼트는 memmap을 그대로 쓰고, 그 외에는 세그먼트별 memmap 위의
+    SegmentedMatrix 뷰를 돌려줍니다 (스냅샷마다 임베딩을 RAM에 복사하지 않음).
+    """
+
+    def __init__(self, parts):
+        self.parts = parts  # [(Segment, 살아 있는 행 번호)]
+        first = parts[0][0].store if parts else None
+        self.fields = first.fields if first else FIELDS
+        self.dim = first.dim if first else 0
+        self.model = first.model if first else None
+        self.rows = sum(len(rows) for _, rows in parts)
+        self._matrices = {}
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        # content_hash: 세그먼트별 해시(write_store가 기록) + 살아 있는 행 번호 → 임베딩 전체를 읽지 않음
+        if self._manifest is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for segment, rows in self.parts:
+                digest.update(content_hash(segment.store).encode())
+                digest.update(np.ascontiguousarray(rows, dtype=np.int64).tobytes())
+            self._manifest = {"model": self.model, "rows": self.rows, "dim": self.dim,
+                              "content_hash": digest.hexdigest()}
+        return self._manifest
+
+    def __getitem__(self, field):
+        matrix = self._matrices.get(field)
+        if matrix is None:
+            if len(self.parts) == 1 and len(self.parts[0][1]) == len(self.parts[0][0]):
+                matrix = self.parts[0][0].store[field]
+            else:
+                blocks = [(segment.store[field], None if len(rows) == len(segment) else rows)
+                          for segment, rows in self.parts]
+                matrix = SegmentedMatrix(blocks, self.dim)
+            self._matrices[field] = matrix
+        return matrix
+
+    def __contains__(self, field):
+        return field in self.fields
+
+    def __len__(self):
+        return self.rows
+
+
+class Snapshot:
+    """
+    특정 generation의 불변 공고 집합. frame()의 행 순서 = store 행 순서 = 검색 결과 행 번호.
+
+    derived(key, factory)는 이 스냅샷에서 만든 역색인/검색 인덱스를 스냅샷과 함께 보관합니다
+    (스냅샷이 교체되면 함께 해제). previous(key)는 직전 스냅샷의 같은 값을 한 번 돌려주므로
+    factory가 학습 결과 등을 재사용할 수 있습니다 (refresh(warm)이 준비를 마치면 나머지는 놓음).
+    """
+
+    def __init__(self, generation, segments, tombstones, previous=None):
+        self.generation = generation
+        self.parts = [(segment, segment.live_rows(tombstones)) for segment in segments]
+        self.store = SnapshotStore(self.parts)
+        self._frames = {}
+        self._derived = {}
+        self._previous = dict(previous._derived) if previous is not None else {}
+        # derived()의 factory가 frame()을 부를 수 있으므로 재진입 가능 잠금
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self.store.rows
+
+    def frame(self, *columns):
+        """
+        살아 있는 공고의 요청한 열 DataFrame (RangeIndex). 같은 요청에는 같은 객체를 돌려줍니다.
+        """
+        df = self._frames.get(columns)
+        if df is None:
+            import pandas as pd
+
+            with self._lock:
+                df = self._frames.get(columns)
+                if df is None:
+                    pieces = [segment.frame.iloc[rows][list(columns)] for segment, rows in self.parts]
+                    df = pd.concat(pieces, ignore_index=True) if pieces else pd.DataFrame(columns=list(columns))
+                    self._frames[columns] = df
+        return df
+
+    def derived(self, key, factory):
+        value = self._derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = factory()
+                    self._derived[key] = value
+        return value
+
+    def previous(self, key):
+        return self._previous.pop(key, None)
+
+    def release_previous(self):
+        self._previous = {}
+
+
+class StaticSnapshot(Snapshot):
+    """
+    세그먼트 인덱스가 없을 때 쓰는 스냅샷: 기존 PostingStore(Parquet/엑셀) + 임베딩 저장소.
+    """
+
+    def __init__(self, postings, store):
+        self.generation = 0
+        self.postings = postings
+        self.store = store
+        self._derived = {}
+        self._previous = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.store)
+
+    def frame(self, *columns):
+        return self.postings.frame(*columns)
+
+
+class PostingIndex:
+    """
+    세그먼트 인덱스 읽기 객체 (프로세스 단위로 공유).
+
+        index = PostingIndex("posting_index")
+        snapshot = index.snapshot()      # poll_interval마다 manifest 확인
+        snapshot.frame("job"), snapshot.store["org_sum"]
+
+    start_refresher(warm)을 부르면 manifest 확인과 새 스냅샷 준비(warm: 역색인/검색 인덱스 생성)를
+    백그라운드 스레드가 맡고, snapshot()은 준비가 끝난 스냅샷만 돌려줍니다 (요청 경로에서 재빌드 없음).
+    """
+
+    def __init__(self, path=POSTING_INDEX_DIR, poll_interval=POLL_INTERVAL):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._segments = {}
+        self._snapshot = None
+        self._manifest_stat = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._warm = None
+        self._refresher = None
+
+    def snapshot(self):
+        if self._snapshot is None or (
+            self._refresher is None and time.monotonic() - self._checked_at >= self.poll_interval
+        ):
+            self.refresh(self._warm)
+        return self._snapshot
+
+    def refresh(self, warm=None):
+        """
+        manifest가 바뀌었으면 새 스냅샷을 엽니다. 새로 생긴 세그먼트만 읽습니다.
+        warm(snapshot)이 있으면 새 스냅샷을 내보내기 전에 호출합니다 (실패해도 내보내고, 그 값은 처음 쓸 때 생성).
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            stat = os.stat(os.path.join(self.path, MANIFEST_NAME))
+            key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if self._snapshot is not None and key == self._manifest_stat:
+                return False
+
+            manifest = read_manifest(self.path)
+            if self._snapshot is not None and manifest["generation"] == self._snapshot.generation:
+                self._manifest_stat = key
+                return False
+
+            segments = {}
+            for name in manifest["segments"]:
+                segments[name] = self._segments.get(name) or Segment(self.path, name)
+            snapshot = Snapshot(manifest["generation"], list(segments.values()), manifest["tombstones"],
+                                previous=self._snapshot)
+            if warm is not None:
+                try:
+                    warm(snapshot)
+                except Exception as e:
+                    print(f"[posting_index] 스냅샷 준비 실패 (generation {snapshot.generation}): {e}")
+                snapshot.release_previous()
+            self._segments = segments
+            self._snapshot = snapshot
+            self._manifest_stat = key
+            return True
+
+    def start_refresher(self, warm=None, interval=None):
+        """
+        interval초(기본 poll_interval)마다 refresh(warm)하는 백그라운드(daemon) 스레드를 시작합니다.
+        이후 snapshot()은 manifest를 확인하지 않고 준비가 끝난 최신 스냅샷을 바로 돌려줍니다.
+        """
+        if self._refresher is not None:
+            return self._refresher
+        self._warm = warm
+        self.snapshot()
+        interval = self.poll_interval if interval is None else interval
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh(warm)
+                except Exception as e:
+                    print(f"[posting_index] 스냅샷 갱신 실패: {e}")
+
+        self._refresher = threading.Thread(target=run, name="posting-index-refresher", daemon=True)
+        self._refresher.start()
+        return self._refresher
+
+
+def open_posting_index(path=None):
+    """
+    path(기본 POSTING_INDEX_DIR)에 세그먼트 인덱스가 있으면 PostingIndex, 없으면 None.
+    """
+    path = path or POSTING_INDEX_DIR
+    if os.path.exists(os.path.join(path, MANIFEST_NAME)):
+        return PostingIndex(path)
+    return None
+
+
+###############################################################################
+# 쓰기: 추가 / 삭제 / 만료 / 압축
+###############################################################################
+
+@contextmanager
+def _writer_lock(path):
+    import fcntl
+
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, LOCK_NAME), "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _commit(path, manifest):
+    manifest = dict(manifest, version=INDEX_VERSION, generation=manifest.get("generation", 0) + 1,
+                    updated_at=time.time())
+    tmp = os.path.join(path, MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(path, MANIFEST_NAME))
+    return manifest
+
+
+def _load_or_empty(path):
+    if os.path.exists(os.path.join(path, MANIFEST_NAME)):
+        return read_manifest(path)
+    return {"version": INDEX_VERSION, "generation": 0, "segments": [], "tombstones": {},
+            "next_seq": 1, "next_id": 0}
+
+
+def _write_segment(path, seq, frame, matrices, model):
+    """
+    세그먼트를 임시 디렉토리에 쓴 뒤 이름을 바꿔 완성합니다 (manifest에 올리기 전까지 읽는 쪽은 모름).
+    """
+    name = segment_name(seq)
+    tmp_dir = os.path.join(path, f"{name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    frame.to_parquet(os.path.join(tmp_dir, "postings.parquet"), index=False)
+    write_store(matrices, os.path.join(tmp_dir, "embeddings"), source=name, model=model)
+    os.replace(tmp_dir, os.path.join(path, name))
+    return name
+
+
+def _segment_frame(records, manifest):
+    """
+    공고 레코드 리스트(dict)를 세그먼트 DataFrame으로 바꿉니다. posting_id가 없으면 새로 부여합니다.
+    """
+    import pandas as pd
+    from posting_store import _typed
+
+    df = pd.DataFrame(list(records))
+    for column in COLUMNS:
+        if column not in df:
+            df[column] = ""
+    if "posting_id" not in df:
+        df["posting_id"] = None
+    missing = df["posting_id"].isna()
+    start = manifest["next_id"]
+    df.loc[missing, "posting_id"] = [f"p{start + i}" for i in range(int(missing.sum()))]
+    manifest["next_id"] = start + int(missing.sum())
+    if "expires_at" not in df:
+        df["expires_at"] = np.nan
+
+    out = _typed(df[["posting_id", *COLUMNS]])
+    out["expires_at"] = pd.to_numeric(df["expires_at"], errors="coerce").astype("float64")
+    return out
+
+
+def _existing_ids(path, manifest):
+    import pandas as pd
+
+    ids = set()
+    for name in manifest["segments"]:
+        ids.update(pd.read_parquet(os.path.join(path, name, "postings.parquet"), columns=["posting_id"])["posting_id"])
+    return ids
+
+
+def _segments_model(path, manifest):
+    if not manifest["segments"]:
+        return None
+    return EmbeddingStore(os.path.join(path, manifest["segments"][0], "embeddings")).model
+
+
+def append(records, client=None, embeddings=None, path=None, model=DEFAULT_PASSAGE_MODEL, backend=None):
+    """
+    새 공고를 추가 세그먼트로 씁니다. 기존 posting_id와 같은 공고는 이전 행을 툼스톤 처리(갱신)합니다.
+    embeddings({필드: (n, D) 행렬}, model로 만든 것)가 없으면 backend(embedding_backend.py)로,
+    backend도 없으면 client(Upstage API)의 model로 세 요약 열을 임베딩합니다.
+    반환: 커밋된 manifest
+    """
+    from embedding_store import embed_texts
+
+    if embeddings is None and backend is not None:
+        model = backend.passage_model
+    path = path or POSTING_INDEX_DIR
+    records = list(records)
+    if not records:
+        raise ValueError("추가할 공고가 없습니다.")
+    with _writer_lock(path):
+        manifest = _load_or_empty(path)
+        existing_model = _segments_model(path, manifest)
+        if existing_model is not None and existing_model != model:
+            raise ValueError(f"공고 인덱스는 '{existing_model}' 임베딩입니다 ('{model}'로 추가 불가). "
+                             f"먼저 python embedding_backend.py reembed로 재임베딩하세요.")
+        frame = _segment_frame(records, manifest)
+        if embeddings is None:
+            embeddings = {}
+            for field in FIELDS:
+                texts = frame[field].fillna("").astype(str).tolist()
+                embeddings[field] = (backend.embed_passages(texts) if backend is not None
+                                     else embed_texts(client, texts, model=model))
+        seq = manifest["next_seq"]
+        name = _write_segment(path, seq, frame, embeddings, model)
+        # 같은 id의 이전 세그먼트 행은 지움 (새 세그먼트 seq 이상은 살아 있음)
+        tombstones = dict(manifest["tombstones"])
+        tombstones.update({pid: seq for pid in _existing_ids(path, manifest) & set(frame["posting_id"])})
+        manifest.update(segments=manifest["segments"] + [name], tombstones=tombstones, next_seq=seq + 1)
+        return _commit(path, manifest)
+
+
+def delete(posting_ids, path=None):
+    """
+    posting_ids 공고를 툼스톤 처리합니다 (현재까지의 모든 세그먼트에서 지움).
+    """
+    path = path or POSTING_INDEX_DIR
+    with _writer_lock(path):
+        return _tombstone(path, read_manifest(path), posting_ids)
+
+
+def _tombstone(path, manifest, posting_ids):
+    tombstones = dict(manifest["tombstones"])
+    tombstones.update({pid: manifest["next_seq"] for pid in posting_ids})
+    manifest.update(tombstones=tombstones)
+    return _commit(path, manifest)
+
+
+def expire(now=None, path=None):
+    """
+    expires_at이 now(기본: 현재 시각)보다 이른 공고를 툼스톤 처리하고 그 id 리스트를 반환합니다.
+    만료 대상을 고르는 동안에도 쓰기 잠금을 잡습니다 (그 사이 같은 id로 다시 추가된 공고를 지우지 않도록).
+    """
+    path = path or POSTING_INDEX_DIR
+    now = time.time() if now is None else now
+    with _writer_lock(path):
+        manifest = read_manifest(path)
+        snapshot = PostingIndex(path, poll_interval=0).snapshot()
+        expired = []
+        for segment, rows in snapshot.parts:
+            frame = segment.frame.iloc[rows]
+            expired += frame.loc[frame["expires_at"] < now, "posting_id"].tolist()
+        if expired:
+            _tombstone(path, manifest, expired)
+    return expired
+
+
+def needs_compaction(manifest, path, max_segments=COMPACT_MAX_SEGMENTS, max_dead_ratio=COMPACT_MAX_DEAD_RATIO):
+    if len(manifest["segments"]) > max_segments:
+        return True
+    if not manifest["tombstones"]:
+        return False
+    snapshot = PostingIndex(path, poll_interval=0).snapshot()
+    total = sum(len(segment) for segment, _ in snapshot.parts)
+    return total > 0 and 1 - len(snapshot) / total > max_dead_ratio
+
+
+def compact(path=None, force=True, gc_grace=SEGMENT_GC_GRACE):
+    """
+    살아 있는 행만 모아 세그먼트 하나로 합칩니다. force=False이면 needs_compaction()일 때만 실행합니다.
+    반환: 커밋된 manifest (압축하지 않았으면 None)
+    """
+    path = path or POSTING_INDEX_DIR
+    with _writer_lock(path):
+        manifest = read_manifest(path)
+        if not force and not needs_compaction(manifest, path):
+            _gc(path, manifest, gc_grace)
+            return None
+
+        snapshot = PostingIndex(path, poll_interval=0).snapshot()
+        import pandas as pd
+
+        frame = pd.concat([segment.frame.iloc[rows] for segment, rows in snapshot.parts], ignore_index=True)
+        matrices = {field: np.asarray(snapshot.store[field]) for field in snapshot.store.fields}
+        return _replace_all(path, manifest, frame, matrices, snapshot.store.model, gc_grace)
+
+
+def reembed(backend, path=None, gc_grace=SEGMENT_GC_GRACE):
+    """
+    살아 있는 모든 공고를 backend(embedding_backend.py)로 다시 임베딩하여 세그먼트 하나로 교체합니다.
+    임베딩하는 동안 쓰기 잠금을 잡으므로 추가/삭제는 끝날 때까지 기다립니다 (읽기는 이전 스냅샷으로 계속).
+    반환: 커밋된 manifest
+    """
+    path = path or POSTING_INDEX_DIR
+    with _writer_lock(path):
+        manifest = read_manifest(path)
+        snapshot = PostingIndex(path, poll_interval=0).snapshot()
+        import pandas as pd
+
+        frame = pd.concat([segment.frame.iloc[rows] for segment, rows in snapshot.parts], ignore_index=True)
+        matrices = {field: backend.embed_passages(frame[field].fillna("").astype(str).tolist()) for field in FIELDS}
+        return _replace_all(path, manifest, frame, matrices, backend.passage_model, gc_grace)
+
+
+def _replace_all(path, manifest, frame, matrices, model, gc_grace):
+    seq = manifest["next_seq"]
+    name = _write_segment(path, seq, frame, matrices, model)
+    manifest.update(segments=[name], tombstones={}, next_seq=seq + 1)
+    manifest = _commit(path, manifest)
+    _gc(path, manifest, gc_grace)
+    return manifest
+
+
+def _gc(path, manifest, grace):
+    """
+    manifest에 없는 세그먼트 디렉토리 중 grace초보다 오래된 것을 지웁니다.
+    """
+    now = time.time()
+    for name in os.listdir(path):
+        if not name.startswith("seg-") or name in manifest["segments"]:
+            continue
+        full = os.path.join(path, name)
+        if now - os.path.getmtime(full) >= grace:
+            shutil.rmtree(full, ignore_errors=True)
+
+
+def start_compactor(path=None, interval=60.0):
+    """
+    interval초마다 필요할 때만 압축하는 백그라운드(daemon) 스레드를 시작합니다.
+    """
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                compact(path, force=False)
+            except Exception as e:
+                print(f"[posting_index] 압축 실패: {e}")
+
+    thread = threading.Thread(target=run, name="posting-index-compactor", daemon=True)
+    thread.start()
+    return thread
+
+
+def bootstrap(path=None, postings=None, store_dir=None):
+    """
+    기존 공고 DB(PostingStore)와 임베딩 저장소를 API 호출 없이 첫 세그먼트로 만듭니다.
+    """
+    from posting_store import PostingStore
+    from embedding_store import DEFAULT_STORE_DIR
+
+    path = path or POSTING_INDEX_DIR
+    if os.path.exists(os.path.join(path, MANIFEST_NAME)):
+        raise FileExistsError(f"이미 공고 인덱스가 있습니다: {path}")
+    postings = postings or PostingStore()
+    store = EmbeddingStore(store_dir or DEFAULT_STORE_DIR)
+    records = postings.frame(*COLUMNS).to_dict(orient="records")
+    return append(records, embeddings={field: np.asarray(store[field]) for field in store.fields}, path=path,
+                  model=store.model)
+
+
+###############################################################################
+# 벤치마크: 추가 세그먼트 반영 vs 전체 재빌드, 압축 전후 검색 결과 비교
+###############################################################################
+
+def _append_synthetic(path, n, start, dim, rng):
+    records = [{"posting_id": f"s{start + i}", **{column: f"{column} {start + i}" for column in COLUMNS}}
+               for i in range(n)]
+    embeddings = {field: rng.standard_normal((n, dim)).astype(np.float32) for field in FIELDS}
+    return append(records, embeddings=embeddings, path=path)
+
+
+def benchmark(n=20_000, dim=64, batches=10, batch_size=100, n_queries=50):
+    """
+    추가 세그먼트가 반영된 뒤 첫 요청의 비용을 실제 파이프라인(career_guide, 가짜 LLM)으로 잽니다.
+      lazy       : 요청이 새 스냅샷을 처음 쓸 때 역색인/검색 인덱스/BM25를 만드는 경우 (refresher 없음)
+      background : PostingIndex.start_refresher처럼 요청 밖에서 준비(warm_snapshot)한 뒤 교체하는 경우
+    """
+    import tempfile
+    from reranker import FusedReranker
+    from fake_llm import make_fake_pipeline
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "index")
+        start = time.perf_counter()
+        _append_synthetic(path, n, 0, dim, rng)
+        print(f"[base] {n:,}건 x 3 x {dim} 세그먼트 쓰기 {time.perf_counter() - start:.2f}s")
+
+        reader = PostingIndex(path, poll_interval=0)
+        pipeline, _ = make_fake_pipeline(workdir, latency=0.0, dim=dim, posting_index=reader, retrieval_mode="hybrid")
+        posting = "조직 설명: org_sum 17\n직무 설명: work_sum 17\n필요 역량: skills_sum 17"
+        start = time.perf_counter()
+        pipeline.warm_up()
+        pipeline.similar_postings(posting)  # 쿼리 임베딩은 캐시에 넣어 두고 검색 비용만 잼
+        print(f"[base] 파이프라인 준비 (Kiwi, 역색인, 검색 인덱스, BM25) {time.perf_counter() - start:.2f}s")
+
+        def query(i):
+            # 요청 하나: 직무명 검색 + 하이브리드 유사 공고 검색 (같은 스냅샷)
+            start = time.perf_counter()
+            with pipeline.pin_snapshot():
+                pipeline.search_db(f"job {i}")
+                pipeline.similar_postings(posting)
+            return time.perf_counter() - start
+
+        appended, results = [], {"lazy": ([], [], []), "background": ([], [], [])}
+        for b in range(2 * batches):
+            mode = "lazy" if b < batches else "background"
+            start = time.perf_counter()
+            _append_synthetic(path, batch_size, n + b * batch_size, dim, rng)
+            appended.append(time.perf_counter() - start)
+            prepare, first, repeat = results[mode]
+            start = time.perf_counter()
+            reader.refresh(pipeline.warm_snapshot if mode == "background" else None)
+            prepare.append(time.perf_counter() - start)
+            first.append(query(b))
+            repeat.append(query(b))
+        snapshot = reader.snapshot()
+        print(f"[append] {batch_size}건 x {2 * batches}회  쓰기 평균 {np.mean(appended) * 1000:.1f}ms  "
+              f"(세그먼트 {len(snapshot.parts)}개, 살아 있는 공고 {len(snapshot):,}건)")
+        for mode, (prepare, first, repeat) in results.items():
+            print(f"[{mode:<10}] 새 스냅샷 열기/준비(요청 밖) {np.mean(prepare) * 1000:7.1f}ms  "
+                  f"추가 후 첫 요청 {np.mean(first) * 1000:7.1f}ms  이후 요청 {np.mean(repeat) * 1000:6.1f}ms")
+        delete([f"s{i}" for i in range(0, n, 10)], path=path)  # 기본 세그먼트의 10% 삭제
+        snapshot = reader.snapshot()
+
+        queries = FusedReranker(snapshot.store).encode_queries(
+            {field: rng.standard_normal((n_queries, dim)) for field in FIELDS})
+
+        def top3(snap):
+            ids = snap.frame("posting_id")["posting_id"].to_numpy()
+            scores = FusedReranker(snap.store).encoded_scores(queries)
+            return ids[np.argsort(-scores, axis=1)[:, :3]]
+
+        before = top3(snapshot)
+        start = time.perf_counter()
+        compact(path, gc_grace=0)
+        compact_s = time.perf_counter() - start
+        snapshot = reader.snapshot()
+        after = top3(snapshot)
+        print(f"[compact] {compact_s:.2f}s → 세그먼트 {len(snapshot.parts)}개  "
+              f"압축 전후 top-3 일치 {np.mean(before == after):.3f}")
+
+        start = time.perf_counter()
+        matrices = {field: np.asarray(snapshot.store[field]) for field in FIELDS}
+        write_store(matrices, os.path.join(workdir, "full_store"))
+        full = EmbeddingStore(os.path.join(workdir, "full_store"))
+        np.concatenate([np.asarray(full[field]) for field in FIELDS], axis=1)
+        # 전체 재빌드는 여기에 더해 모든 공고(3 x N개 텍스트)를 다시 임베딩해야 함 (추가 세그먼트는 새 공고만)
+        print(f"[full rebuild] 임베딩 제외 전체 저장소 다시 쓰고 읽기 {time.perf_counter() - start:.2f}s "
+              f"+ 임베딩 {3 * len(snapshot):,}개 (추가 반영 1회 평균 {np.mean(appended) + np.mean(prepare):.3f}s, "
+              f"임베딩 {3 * batch_size}개)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="세그먼트 기반 공고 인덱스")
+    parser.add_argument("--path", default=POSTING_INDEX_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("bootstrap", help="posting_store + embedding_store로 첫 세그먼트 생성")
+    append_parser = subparsers.add_parser("append", help="엑셀/CSV의 새 공고를 임베딩하여 추가")
+    append_parser.add_argument("file")
+    delete_parser = subparsers.add_parser("delete", help="공고 툼스톤 처리")
+    delete_parser.add_argument("posting_ids", nargs="+")
+    subparsers.add_parser("expire", help="expires_at이 지난 공고 툼스톤 처리")
+    compact_parser = subparsers.add_parser("compact", help="세그먼트 압축")
+    compact_parser.add_argument("--watch", type=float, help="N초마다 필요할 때만 압축")
+    subparsers.add_parser("status")
+    bench_parser = subparsers.add_parser("bench")
+    bench_parser.add_argument("--n", type=int, default=20_000)
+    bench_parser.add_argument("--dim", type=int, default=64)
+    args = parser.parse_args()
+
+    if args.command == "bootstrap":
+        manifest = bootstrap(args.path)
+        print(f"공고 인덱스 생성: {args.path} (generation {manifest['generation']})")
+    elif args.command == "append":
+        import pandas as pd
+        from openai import OpenAI
+
+        df = pd.read_csv(args.file) if args.file.endswith(".csv") else pd.read_excel(args.file)
+        upstage_client = OpenAI(api_key=os.environ.get("UPSTAGE_API_KEY", ""),
+                                base_url="https://api.upstage.ai/v1/solar")
+        manifest = append(df.to_dict(orient="records"), client=upstage_client, path=args.path)
+        print(f"{len(df)}건 추가 (generation {manifest['generation']}, 세그먼트 {len(manifest['segments'])}개)")
+    elif args.command == "delete":
+        manifest = delete(args.posting_ids, args.path)
+        print(f"{len(args.posting_ids)}건 삭제 (generation {manifest['generation']})")
+    elif args.command == "expire":
+        print(f"만료 {len(expire(path=args.path))}건")
+    elif args.command == "compact":
+        if args.watch:
+            start_compactor(args.path, args.watch).join()
+        manifest = compact(args.path)
+        print(f"압축 완료 (generation {manifest['generation']})")
+    elif args.command == "status":
+        manifest = read_manifest(args.path)
+        snapshot = PostingIndex(args.path, poll_interval=0).snapshot()
+        print(f"generation {manifest['generation']}  세그먼트 {len(manifest['segments'])}개  "
+              f"툼스톤 {len(manifest['tombstones'])}개  살아 있는 공고 {len(snapshot):,}건  "
+              f"압축 필요: {needs_compaction(manifest, args.path)}")
+    else:
+        benchmark(n=args.n, dim=args.dim)
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+
+
+###############################################################################
+# 공고 DB 컬럼형 저장소
+# - data/의 엑셀 DB를 타입이 지정된 Parquet 파일로 변환 (ingest)
+# - 앱은 import 시점에 아무것도 읽지 않고, 필요한 열만 처음 사용할 때 읽음
+# - 원본 엑셀이 Parquet보다 새로우면 (수정 시각 비교) 처음 읽을 때 그 테이블을 다시 변환
+# - 같은 열 조합은 프로세스 안에서 한 번만 읽고 같은 DataFrame 객체를 재사용
+# - pandas도 실제로 읽을 때 import (앱 시작 시간 단축)
+###############################################################################
+
+DATA_DIR = os.environ.get("POSTING_DATA_DIR", "data")
+STORE_DIR = os.environ.get("POSTING_STORE_DIR", "posting_store")
+
+# 테이블 이름 → 원본 엑셀 파일
+TABLES = {
+    "summaries": "processed_final_summaries.xlsx",
+    "preprocessed": "[DB]preprocessed_final.xlsx",
+}
+
+# 열별 저장 타입 (여기 없는 열은 pandas가 읽은 타입 그대로)
+COLUMN_DTYPES = {
+    "posting_id": "string",
+    "job": "string",
+    "org": "string",
+    "work": "string",
+    "skills": "string",
+    "category": "category",
+    "desc": "string",
+    "org_sum": "string",
+    "work_sum": "string",
+    "skills_sum": "string",
+    "total_sum": "string",
+}
+
+
+def _typed(df):
+    df = df.copy()
+    for column in df.columns:
+        dtype = COLUMN_DTYPES.get(column)
+        if dtype is not None:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def _source_path(table, data_dir):
+    return os.path.join(data_dir, TABLES[table])
+
+
+def _parquet_path(table, out_dir):
+    return os.path.join(out_dir, f"{table}.parquet")
+
+
+def is_stale(table, data_dir=DATA_DIR, out_dir=STORE_DIR):
+    """
+    Parquet이 없거나 원본 엑셀보다 오래되었으면 True (원본이 없으면 있는 Parquet을 그대로 씀).
+    """
+    parquet, source = _parquet_path(table, out_dir), _source_path(table, data_dir)
+    if not os.path.exists(parquet):
+        return True
+    return os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(parquet)
+
+
+def ingest_table(table, data_dir=DATA_DIR, out_dir=STORE_DIR):
+    """
+    테이블 하나를 Parquet으로 변환하고 manifest.json의 해당 항목을 갱신합니다.
+    임시 파일에 쓴 뒤 교체하므로 다른 프로세스가 반쯤 쓰인 파일을 읽지 않습니다.
+    """
+    import pandas as pd
+
+    os.makedirs(out_dir, exist_ok=True)
+    df = _typed(pd.read_excel(_source_path(table, data_dir)))
+    path = _parquet_path(table, out_dir)
+    df.to_parquet(f"{path}.tmp", index=False)
+    os.replace(f"{path}.tmp", path)
+
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    manifest[table] = {
+        "source": TABLES[table],
+        "rows": len(df),
+        "columns": {column: str(dtype) for column, dtype in df.dtypes.items()},
+    }
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return manifest[table]
+
+
+def ingest(data_dir=DATA_DIR, out_dir=STORE_DIR):
+    """
+    엑셀 DB를 Parquet으로 변환하고 manifest.json에 테이블별 행 수와 열 타입을 기록합니다.
+    """
+    return {table: ingest_table(table, data_dir, out_dir) for table in TABLES}
+
+
+class PostingStore:
+    """
+    Parquet 공고 DB를 열 단위로 지연 로딩합니다.
+    Parquet이 아직 없으면 원본 엑셀에서 필요한 열만 읽고, 원본 엑셀이 더 새로우면 Parquet을 다시 만듭니다.
+    """
+
+    def __init__(self, store_dir=STORE_DIR, data_dir=DATA_DIR):
+        self.store_dir = store_dir
+        self.data_dir = data_dir
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _read(self, table, columns):
+        import pandas as pd
+
+        path = _parquet_path(table, self.store_dir)
+        if os.path.exists(path) and is_stale(table, self.data_dir, self.store_dir):
+            try:
+                ingest_table(table, self.data_dir, self.store_dir)
+            except OSError:
+                # 저장소에 쓸 수 없으면 이번에는 원본 엑셀에서 읽음
+                return _typed(pd.read_excel(_source_path(table, self.data_dir), usecols=list(columns)))
+        if os.path.exists(path):
+            return pd.read_parquet(path, columns=list(columns))
+        return _typed(pd.read_excel(_source_path(table, self.data_dir), usecols=list(columns)))
+
+    def frame(self, *columns, table="summaries"):
+        """
+        요청한 열만 담은 DataFrame을 반환합니다. 같은 요청에는 같은 객체를 돌려줍니다.
+        """
+        key = (table, columns)
+        df = self._frames.get(key)
+        if df is None:
+            with self._lock:
+                df = self._frames.get(key)
+                if df is None:
+                    df = self._read(table, columns)[list(columns)]
+                    self._frames[key] = df
+        return df
+
+
+###############################################################################
+# 시작 시간 벤치마크: 새 프로세스에서 import + DB 로딩까지의 시간 비교
+###############################################################################
+
+BENCH_SCRIPTS = {
+    "excel (전체 열)": "import pandas as pd; pd.read_excel({xlsx!r})",
+    "parquet (job + 요약 열)": (
+        "import pandas as pd; "
+        "pd.read_parquet({parquet!r}, columns=['job', 'org_sum', 'work_sum', 'skills_sum'])"
+    ),
+    "parquet (total_sum)": "import pandas as pd; pd.read_parquet({parquet!r}, columns=['total_sum'])",
+}
+
+
+def benchmark(repeat=5, data_dir=DATA_DIR, out_dir=STORE_DIR):
+    paths = {
+        "xlsx": os.path.join(data_dir, TABLES["summaries"]),
+        "parquet": os.path.join(out_dir, "summaries.parquet"),
+    }
+    baseline = [sys.executable, "-c", "import pandas"]
+
+    def run(args):
+        start = time.perf_counter()
+        subprocess.run(args, check=True)
+        return time.perf_counter() - start
+
+    base = min(run(baseline) for _ in range(repeat))
+    print(f"{'pandas import':<28} {base * 1000:8.1f} ms")
+    for name, script in BENCH_SCRIPTS.items():
+        args = [sys.executable, "-c", script.format(**paths)]
+        best = min(run(args) for _ in range(repeat))
+        print(f"{name:<28} {best * 1000:8.1f} ms  (로딩 {(best - base) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공고 DB 컬럼형 저장소")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("ingest", help="data/의 엑셀 DB를 Parquet으로 변환")
+    bench = subparsers.add_parser("bench", help="엑셀 vs Parquet 시작 시간 비교")
+    bench.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        for table, info in ingest().items():
+            print(f"{table}: {info['rows']} rows → {STORE_DIR}/{table}.parquet")
+    else:
+        benchmark(repeat=args.repeat)
@@ -0,0 +1,588 @@
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from llm_client import estimate_tokens
+
+
+###############################################################################
+# 프롬프트 템플릿
+# - 지침, 평가 기준, 예제, 출력 형식 등 변하지 않는 부분은 system 메시지(정적 접두부)에,
+#   직무/회사/검색 결과 등 입력값은 user 메시지에 둠
+#   → 호출마다 접두부가 같으므로 제공자 측 프롬프트 캐시(OpenAI: 1024토큰 이상 공통 접두부)가 적중
+# - 들여쓰기/탭 등 불필요한 공백을 압축
+# - 검색된 문맥(유사 공고, 뉴스 클러스터)은 유사도 점수 순으로 토큰 예산 안에서 자름
+# - 만든 프롬프트마다 토큰 수를 prompt_stats()에 집계하고, PROMPT_LOG_PATH가 있으면 JSONL로 기록
+#
+#   python prompts.py        # 고정 입력 세션의 입력 토큰 수 비교 (압축/예산 적용 전후)
+###############################################################################
+
+# 검색된 문맥의 토큰 예산
+SIMILAR_POSTINGS_TOKENS = int(os.environ.get("SIMILAR_POSTINGS_TOKENS", 1200))
+CLUSTER_TEXT_TOKENS = int(os.environ.get("CLUSTER_TEXT_TOKENS", 1500))
+
+PROMPT_LOG_PATH = os.environ.get("PROMPT_LOG_PATH", "")
+
+
+def compact(text):
+    """
+    줄마다 앞뒤 공백을 없애고, 연속 공백/탭은 하나로, 연속 빈 줄은 하나로 줄입니다.
+    """
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+###############################################################################
+# 토큰 예산
+###############################################################################
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。다])\s+")
+
+
+def truncate_tokens(text, budget):
+    """
+    text를 budget 토큰 이내로 자릅니다. 가능하면 문장 단위로 자르고, 첫 문장부터 넘으면 글자 단위로 자릅니다.
+    """
+    if budget <= 0:
+        return ""
+    if estimate_tokens(text) <= budget:
+        return text
+
+    kept, used = [], 0
+    for sentence in _SENTENCE_END.split(text):
+        tokens = estimate_tokens(sentence) + 1
+        if used + tokens > budget:
+            break
+        kept.append(sentence)
+        used += tokens
+    if kept:
+        return " ".join(kept)
+
+    # 첫 문장이 예산보다 긴 경우: 토큰 비율만큼 앞부분을 남김
+    return text[:max(1, len(text) * budget // estimate_tokens(text))]
+
+
+def fit_to_budget(texts, scores, budget):
+    """
+    유사도 점수에 비례하여 budget 토큰을 나누어 각 텍스트를 자릅니다.
+    점수가 높은 텍스트부터 배분하며, 다 쓰지 못한 몫은 다음 텍스트로 넘깁니다. 입력 순서를 유지합니다.
+    """
+    weights = [max(float(score), 0.0) + 1e-6 for score in scores]
+    total = sum(weights)
+    order = sorted(range(len(texts)), key=lambda i: -weights[i])
+
+    fitted, carry = list(texts), 0
+    for i in order:
+        allotment = int(budget * weights[i] / total) + carry
+        fitted[i] = truncate_tokens(texts[i], allotment)
+        carry = max(0, allotment - estimate_tokens(fitted[i]))
+    return fitted
+
+
+_CLUSTER_HEADER = re.compile(r"^Cluster \d+$")
+
+
+def trim_cluster_text(text, budget=CLUSTER_TEXT_TOKENS):
+    """
+    news_clustering.create_cluster_text 형식('Cluster {id}' + 요약 줄)의 텍스트를 budget 토큰 이내로 줄입니다.
+    클러스터마다 크기에 비례한 몫을 주고, 각 클러스터 안에서는 앞쪽 줄(중심에 가까운 기사)부터 남깁니다.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+
+    clusters = []
+    for line in text.splitlines():
+        if _CLUSTER_HEADER.match(line):
+            clusters.append((line, []))
+        elif line.strip() and clusters:
+            clusters[-1][1].append(line)
+    if not clusters:
+        return truncate_tokens(text, budget)
+
+    sizes = [sum(estimate_tokens(line) + 1 for line in lines) for _, lines in clusters]
+    header_tokens = sum(estimate_tokens(header) + 2 for header, _ in clusters)
+    available = max(0, budget - header_tokens)
+
+    output = []
+    for (header, lines), size in zip(clusters, sizes):
+        allotment = available * size // max(1, sum(sizes))
+        output.append(header)
+        used = 0
+        for j, line in enumerate(lines):
+            tokens = estimate_tokens(line) + 1
+            if used + tokens > allotment and j > 0:
+                break
+            # 클러스터마다 최소 한 줄은 남김 (주제를 알 수 있도록)
+            output.append(line if used + tokens <= allotment else truncate_tokens(line, max(1, allotment)))
+            used += tokens
+        output.append("")
+    return "\n".join(output)
+
+
+###############################################################################
+# 토큰 기록
+###############################################################################
+
+_stats = {}
+_lock = threading.Lock()
+
+
+def record_prompt(name, system_tokens, user_tokens):
+    with _lock:
+        entry = _stats.setdefault(name, {"calls": 0, "static_tokens": 0, "input_tokens": 0})
+        entry["calls"] += 1
+        entry["static_tokens"] += system_tokens
+        entry["input_tokens"] += system_tokens + user_tokens
+    if PROMPT_LOG_PATH:
+        record = {"time": time.time(), "prompt": name, "static_tokens": system_tokens,
+                  "input_tokens": system_tokens + user_tokens}
+        with _lock, open(PROMPT_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def prompt_stats():
+    """
+    프롬프트별 {calls, static_tokens, input_tokens} 누적값.
+    """
+    with _lock:
+        return {name: dict(entry) for name, entry in _stats.items()}
+
+
+def reset_prompt_stats():
+    with _lock:
+        _stats.clear()
+
+
+class PromptTemplate:
+    """
+    (정적 system 접두부, 입력값을 채우는 user 템플릿) 쌍.
+    render(**values)는 (system, user) 문자열을 반환하고 토큰 수를 기록합니다.
+    """
+
+    def __init__(self, name, system, user):
+        self.name = name
+        self.raw_system = system
+        self.raw_user = user
+        self.system = compact(system)
+        self.user = compact(user)
+        self.system_tokens = estimate_tokens(self.system)
+
+    def render(self, compacted=True, **values):
+        if compacted:
+            system, user = self.system, self.user.format(**values)
+        else:
+            system, user = self.raw_system, self.raw_user.format(**values)
+        record_prompt(self.name, self.system_tokens if compacted else estimate_tokens(system), estimate_tokens(user))
+        return system, user
+
+
+###############################################################################
+# 템플릿
+###############################################################################
+
+JOB_POSTING_FROM_DB = PromptTemplate("job_posting_from_db", """
+    당신은 채용 공고 작성 전문가입니다. 입력으로 회사와 직무, 그 직무와 관련된 기존 데이터가 주어집니다.
+    기존 데이터를 바탕으로 더 완성도 높은 채용 공고를 작성해주세요.
+    부족한 내용은 보완하고, 전문적이고 직무에 적합한 문구를 사용하여 작성해주세요.
+
+    **출력 형식**:
+    1. 조직 설명: [수정 또는 보완된 조직 설명]
+    2. 직무 설명: [수정 또는 보완된 직무 설명]
+    3. 필요 역량: [수정 또는 보완된 필요 역량]
+    """, """
+    직무 이름: {job}
+    회사 이름: {company}
+
+    아래는 {company}의 {job} 직무와 관련된 기존 데이터입니다:
+    1. 조직 설명: {org_summary}
+    2. 직무 설명: {work_summary}
+    3. 필요 역량: {skills_summary}
+    """)
+
+JOB_POSTING = PromptTemplate("job_posting", """
+        입력된 직무와 회사 정보를 기반으로 채용 공고 내용을 요약하세요. 아래는 참고 예제입니다:
+
+        [예제1]
+        직무: 쇼콜라티에
+				회사: 신라호텔
+				조직 설명: 신라호텔의 디저트 제작 팀은 고급 디저트 문화를 선도하며, 고객에게 독창적이고 정교한 초콜릿 경험을 제공하는 것을 목표로 합니다.
+								 이 팀은 초콜릿 조각과 공예를 통해 호텔의 품격을 반영하는 작품을 제작하며, 맞춤형 디저트와 특별한 행사를 위한 창의적인 초콜릿 아트를 선보이고 있습니다.
+
+				직무 설명: 쇼콜라티에는 신라호텔의 고급 초콜릿 디저트와 예술 작품을 기획하고 제작하는 역할을 담당합니다. 주요 업무에는 고객 맞춤형 초콜릿 디자인, 대규모 행사 및 웨딩 초콜릿 세트 제작, 계절별 신제품 개발,
+								 그리고 초콜릿 품질 관리와 디스플레이 준비가 포함됩니다. 또한, 호텔 브랜드를 대표할 수 있는 초콜릿 작품 개발과 국제 초콜릿 공모전 출품을 위한 창의적 디자인도 포함됩니다.
+
+				필요 역량: 초콜릿 공예 및 디저트 제작 분야에서 풍부한 경험과 전문성을 갖춘 지원자를 찾습니다. 초콜릿 작업에 필요한 재료 특성에 대한 깊은 이해와 이를 바탕으로 한 품질 관리 능력이 요구되며,
+								 창의적이고 독창적인 초콜릿 디자인을 개발할 수 있는 역량이 필요합니다. 디저트 및 초콜릿 관련 공모전에서 수상한 경력이나 이를 증명할 수 있는 포트폴리오를 보유한 지원자를 우대하며,
+								 대규모 행사 및 고객 맞춤형 초콜릿 프로젝트 경험을 가진 지원자는 더욱 환영합니다.
+
+		[예제2]
+        직무: AIML쇼핑검색개인화기술연구개발
+        회사: 네이버쇼핑
+        조직 설명: 해당 조직은 개인화된 쇼핑 검색 경험을 구현하는 팀으로, 사용자의 취향과 이력을 기반으로 한 맞춤형 검색 결과를 제공하는 것을 목표로 합니다.
+                이 팀은 브랜드 선호도, 가격, 스타일, 구매 패턴 등 다양한 신호를 분석하여 사용자에게 더 효율적이고 탐색적인 쇼핑 경험을 제공하는 데 중점을 두고 있습니다.
+        직무 설명: 직무는 사용자 취향 및 의도를 반영한 개인화 검색 추천 모델을 설계, 개발 및 고도화하는 것입니다.
+                주요 업무에는 대규모 로그 분석을 통한 특성 추출, 모델 피처 엔지니어링, AB 테스트를 통한 지표 모니터링 및 모델 성능 평가가 포함됩니다. 또한, 추천 시스템과 관련된 연구 개발 및 AIML 기반 추천 모델의 서비스 적용도 포함됩니다.
+        필요 역량: 직무를 성공적으로 수행하기 위해서는 AIML 기반 추천 모델 개발 및 서비스 경험이 3년 이상 필요하며,
+                사용자 분석, 콘텐츠 이해, 모델링 로직 설계 등 문제 정의 및 해결 능력이 요구됩니다.
+                또한, LLM 최신 기술 및 NLP, RecSys 관련 기술 활용 경험이 필요하며,
+                검색 추천 관련 학회에 논문을 게재하거나 오픈소스에 기여한 경험이 있는 것이 바람직합니다.
+
+        **출력 형식**:
+        1. 조직 설명: [해당 회사 및 직무가 포함된 팀이나 조직의 역할, 목표 및 성격을 명확히 서술]
+        2. 직무 설명: [입력된 직무와 관련된 주요 업무, 책임, 그리고 기대되는 활동을 구체적으로 서술]
+        3. 필요 역량: [직무를 성공적으로 수행하기 위해 요구되는 기술적(예: 특정 소프트웨어나 툴 사용 능력) 및 비기술적 역량(예: 소통 능력, 문제 해결 능력 등)을 상세히 서술]
+        """, """
+        **입력**:
+        직무 이름: {job}
+        회사 이름: {company}
+        """)
+
+REQUIRED_SKILLS = PromptTemplate("required_skills", """
+    입력으로 새로 생성된 채용 공고와 기존 유사 공고가 주어집니다.
+    이 내용을 바탕으로 직무를 성공적으로 수행하기 위해 필요한 역량(기술적 3개, 비기술적 3개)을 구체적으로 도출하세요.
+
+    **출력 형식**
+    1. 기술적 역량:
+    - [역량1: 설명]
+    - [역량2: 설명]
+    - [역량3: 설명]
+
+    2. 비기술적 역량:
+    - [역량1: 설명]
+    - [역량2: 설명]
+    - [역량3: 설명]
+    """, """
+    직무: {job}
+
+    [새로 생성된 공고]
+    '{job_posting}'
+
+    [기존 유사 공고]
+    {similar}
+    """)
+
+STATEMENT = PromptTemplate("statement", """
+    당신은 자기소개서 글감 및 개요 추출을 전문으로 하는 AI 조력자입니다.
+    사용자가 제공한 직무 정보와 활동 정보를 바탕으로, 아래 지침에 따라 자기소개서 글감과 개요를 생성하세요.
+
+    **요청 사항**:
+       - 직무의 필요 역량 중 해당 활동을 통해 강조할 수 있는 역량을 하나만 골라 글감과 개요를 작성하세요.
+       - 글감: 입력한 활동에서 도출된 주요 주제를 간결히 표현하세요.
+       - 개요: 글감에서 도출된 주제를 구체적으로 확장하여 자기소개서에서 활용 가능한 세부 내용을 포함하세요.
+         - **배경 설명**: [활동의 배경 및 맥락]
+         - **성과/결과**: [활동의 결과나 성취]
+         - **직무/기업과의 연결**: [직무나 기업의 요구 사항에 대한 연관성]
+
+    **출력 형식**:
+       - **강조 역량**: [강조할 역량]
+         **글감**: [사용자의 활동에서 추출된 주요 주제]
+         **개요**:
+           - **배경 설명**: [활동의 배경 및 맥락]
+           - **성과/결과**: [활동의 결과나 성취]
+           - **직무/기업과의 연결**: [직무나 기업의 요구 사항에 대한 연관성]
+    """, """
+    1. **직무 정보**:
+       - 직무 이름: {job}
+       - 이 직무와 관련된 필요 역량은 다음과 같습니다: {skills}
+
+    2. **사용자 활동 정보**:
+       - **{category}**: {activity}
+    """)
+
+Q1 = PromptTemplate("q1", """
+    당신은 활동 기반 면접 질문을 생성하는 전문가입니다.
+    주어진 텍스트는 지원자가 입력한 활동을 기반으로 필요한 역량을 강조할 수 있도록 작성된 자기소개서 글감 개요입니다.
+    이 텍스트를 바탕으로 활동 기반 면접 질문 3개를 생성하세요.
+    각 질문은 입력된 직무에 지원하는 지원자의 경험과 역량을 효과적으로 평가할 수 있어야 합니다.
+    다음 지침을 따르세요:
+
+    1. 첫 번째 질문은 텍스트에서 언급된 주요 활동이나 경험의 구체적인 내용을 탐구하는 질문이어야 합니다.
+    2. 두 번째 질문은 지원자의 문제 해결 능력, 협업 경험, 또는 의사결정 과정을 평가할 수 있는 질문이어야 합니다.
+    3. 세 번째 질문은 지원자의 해당 경험에서 얻은 교훈이나 배운 점을 직무와 연결 지을 수 있도록 구성해야 합니다.
+
+    출력 (활동 기반 면접 질문):
+    1. [주요 활동이나 경험을 탐구하는 질문]
+    2. [문제 해결, 협업, 의사결정과 관련된 질문]
+    3. [경험과 직무 관련 역량을 연결하는 질문]
+    """, """
+    직무: {job}
+
+    입력 텍스트:
+    "{personal_statement}"
+    """)
+
+NEWS_KEYWORD = PromptTemplate("news_keyword", """
+    당신은 트렌드 관련 키워드 생성 전문가입니다. 어떤 직무와 회사가 주어지더라도, 관련된 2025년 최신 트렌드, 기술, 혹은 사례를 조사할 때 유용한 **구체적이고 세부적인 키워드** 3개를 작성하세요.
+    입력된 회사의 직무에 관련된 트렌드 정보 및 배경 지식을 조사할 때 유용하게 활용할 수 있는 **구체적이고 세부적인 키워드** 3개를 도출하세요.
+
+    키워드는 다음 조건을 충족해야 합니다:
+    1. 입력된 직무와 밀접하게 관련된 2025년 최신 트렌드, 기술, 혹은 사례를 반영해야 합니다.
+    2. 뉴스 사이트나 검색 엔진에서 검색했을 때, **구체적이고 신뢰할 수 있는 정보를 바로 찾을 수 있는 형태**여야 합니다.
+    3. 키워드는 특정 활동, 기술, 혹은 트렌드처럼 **명확하고 세부적인 주제**를 포함해야 합니다.
+    4. 키워드는 **명사 + 명사** 형식으로 작성해야 하며, "~의" 같은 조사나 불필요한 접속사를 포함하지 않아야 합니다.
+    5. 입력된 직무나 회사의 **산업 도메인 특성**을 반영하여, 일반적이지 않고 관련성이 높은 키워드를 작성해야 합니다.
+
+    출력 형식:
+    - 키워드 1: [구체적인 기술/활동/트렌드]
+    - 키워드 2: [구체적인 기술/활동/트렌드]
+    - 키워드 3: [구체적인 기술/활동/트렌드]
+    """, """
+    회사: {company}
+    직무: {job}
+    """)
+
+SUMMARIZE_CLUSTER = PromptTemplate("summarize_cluster", """
+    당신은 직무 관련 트렌드 전문가입니다.
+    입력 텍스트는 입력된 회사의 직무에 지원하는 지원자가 면접 준비 과정에서 입력된 검색어로 뉴스 기사를 검색한 결과입니다.
+    여러 클러스터로 분류되어 있는데, 이때 각 클러스터는 특정 주제를 중심으로 구성된 기사의 요약으로 이루어져 있습니다.
+    입력 텍스트를 바탕으로 각 클러스터의 **주제**를 도출하고, 클러스터 내 문장들을 분석하여 **적당한 길이의 핵심 요약**을 작성하세요.
+
+    출력 시 가장 중요한 클러스터 top 3만 출력해야 합니다. 정렬 기준은 다음과 같습니다.
+    1. (가장 중요) 지원자의 채용 준비 과정에서 **직무 트렌드를 깊이 이해하는 데 실질적인 도움을 주는가** (40%)
+    2. 검색어와의 연관성이 높으며, 직무 수행에 있어 필수적인 키워드를 포함하고 있는가 (30%)
+    3. 주제가 특정 기업의 홍보에 치우치지 않고, 업계 전반의 흐름을 포괄하며 다양한 시각을 제공하는가 (30%)
+
+    예시로, 다음과 같이 클러스터를 선정해야 합니다.
+
+    ‘디지털 금융의 발전과 핀테크 산업 성장’ (적절한 클러스터)
+    : 핀테크 및 디지털 금융 트렌드, 기업들의 투자 및 혁신 사례가 포함되어 있어 금융 분야의 변화 흐름을 이해하는 데 적합함.
+
+    ‘글로벌 경기 둔화와 국내 금융 정책 대응’ (적절한 클러스터)
+    : 경제 환경 변화에 따른 정책적 대응 전략을 포함하고 있어 지원자가 경제 전반의 맥락을 파악하는 데 도움을 줄 수 있음.
+
+    ‘은행별 새로운 서비스 출시 소식’ (부적절한 클러스터)
+    : 특정 은행의 개별 서비스 홍보에 초점이 맞춰져 있으며, 산업 전체의 흐름을 이해하는 데는 한계가 있음.
+
+    **출력 형식**:
+    최종 클러스터: a, b, c
+    1. [클러스터 주제]
+    : [클러스터 a의 요약문들을 바탕으로 생성된 핵심 요약]
+
+    2. [클러스터 주제]
+    : [클러스터 b의 요약문들을 바탕으로 생성된 핵심 요약]
+
+    3. [클러스터 주제]
+    : [클러스터 c의 요약문들을 바탕으로 생성된 핵심 요약]
+
+    **출력 지침**:
+    - 클러스터 a, b, c에는 각각 해당 클러스터의 id가 들어갑니다.
+    - 각 클러스터의 주제는 해당 클러스터를 대표할 수 있는 단 하나의 문장으로 작성합니다.
+    - 핵심 요약은 클러스터에 포함된 문장들을 기반으로 간결하고 일관되게 작성하되, 중요한 정보를 빠뜨리지 않도록 주의하세요.
+    - 요약은 클러스터 내 문장들의 주요 내용을 종합한 형태로 작성하며, 지나치게 세부적이거나 불필요한 정보는 제외합니다.
+
+    **출력 예시**:
+    1. 국내 AI 창업자의 글로벌 영향력 및 성공 사례
+    : 한국 AI 창업자들이 글로벌 시장에서 두각을 나타내며 성공적인 투자 유치와 혁신적인 AI 솔루션을 제공하고 있음.
+    포브스가 선정한 '주목할 AI 창업자'로 소개되며 글로벌 AI 산업에서의 입지를 강화함.
+    """, """
+    회사: {company}
+    직무: {job}
+    검색어: {keyword}
+
+    **입력 텍스트**:
+    {text}
+    """)
+
+Q2 = PromptTemplate("q2", """
+    입력 텍스트는 입력된 회사의 직무에 지원하는 지원자가 면접 준비 과정에서 입력된 검색어로 뉴스 기사를 검색한 후,
+    자신이 원하는 주제의 기사만 골라서 요약한 결과입니다.
+    뉴스 텍스트를 바탕으로 해당 직무를 준비하는 지원자에게 도움이 될 만한 질문 5개를 생성하고, 각 질문을 평가한 뒤, Top 3개의 질문만 출력하세요.
+
+    **질문 생성 및 평가 지침**
+    [질문 생성]
+        - 도메인 관심도 평가: 기사 내용 및 관련 트렌드를 기반으로 지원자가 해당 도메인에 대한 관심과 이해도를 나타낼 수 있는 질문을 작성하세요.
+        - 상황 기반 질문: 기사에서 다루는 특정 상황을 바탕으로 지원자의 사고력과 문제 해결 능력을 평가할 수 있는 질문을 작성하세요.
+        - 토론 유도 질문: 기사에서 언급된 산업 동향, 경쟁 상황, 또는 소비자 행동 변화와 관련하여 지원자의 의견을 유도할 수 있는 질문을 작성하세요.
+        - 창의적 사고 질문: 기사에서 다룬 주제를 확장하거나 새로운 아이디어를 제시할 수 있도록 창의적인 사고를 유도하는 질문을 작성하세요.
+
+    [질문 평가]
+      - 도메인 관련 지식 평가 (최대 5점): 직무와 관련된 도메인의 검색어 관련 지식을 평가할 수 있어야 함.
+      - 직무 수행에 필요한 이해도 평가 (최대 5점): 직무 수행에 필요한 도메인 이해도를 평가할 수 있어야 함.
+      - 질문의 적절성 및 범용성 (최대 3점): 특정 기업이나 기술에 치우치지 않으며 보편적으로 평가 가능해야 함. 지엽적일 경우 감점(-3점).
+      - 창의적 사고 유도 (최대 3점): 창의적 사고를 유도하는 질문일 경우 높은 점수.
+      - 지나치게 일반적인 질문 방지 (-2점): 지나치게 일반적인 질문은 감점 처리.
+
+    **출력 형식**
+    위의 질문 생성 및 평가 지침을 활용하여, 점수를 기반으로 상위 3개의 질문만 출력하세요.
+    이때 질문만 출력하고, 점수 등 평가 내용은 출력하지 마세요.
+       1. [질문 내용]
+       2. [질문 내용]
+       3. [질문 내용]
+    """, """
+    회사: {company}
+    직무: {job}
+    검색어: {keyword}
+
+    **입력 내용**:
+    뉴스 주제: {topic}
+    요약 내용: {text}
+    """)
+
+Q3 = PromptTemplate("q3", """
+    You are a professional interview question generator.
+
+    당신은 직무 관련 면접 질문을 생성하는 전문가입니다.
+    주어진 직무와 키워드를 바탕으로, 면접 질문에서 사용자의 특정 지식이나 기술 이해도를 평가할 수 있는 질문 3개를 생성하세요.
+    질문은 다음 조건을 충족해야 합니다:
+    1. 질문은 해당 직무에서 필요한 구체적인 지식(예: 기술, 개념, 이론)에 대해 물어야 합니다.
+    2. 질문 형식은 간단하며, 예를 들어 직무와 관련된 특정 개념이나 기술에 대해 설명을 요청하는 형태여야 합니다.
+    3. 채용 공고를 1순위로 참고하고, 추출된 키워드는 2순위로 참고하세요.
+
+    예시:
+    직무: "데이터 분석가"
+    추출된 키워드: "데이터, 분석, 문제 해결"
+    출력 (면접 질문):
+    1. 데이터 분석에서 'hierarchical clustering'이란 무엇인가요?
+    2. 'k-means clustering'의 작동 방식을 설명해주세요.
+    3. 데이터 분석 과정에서 'PCA(주성분 분석)'가 사용되는 이유는 무엇인가요?
+    """, """
+    이제 아래 정보를 바탕으로 면접 질문 3개를 생성하세요.
+
+    직무: "{job}"
+    채용 공고: "{job_posting}"
+    추출된 키워드: {keywords}
+
+    출력 (면접 질문 3개):
+    """)
+
+
+###############################################################################
+# 프롬프트 생성 함수 (system, user)
+###############################################################################
+
+def job_posting_prompt(job, company, db_data, compacted=True):
+    """
+    '채용 공고' 생성 프롬프트. db_data는 search_db 결과(없으면 None)입니다.
+    """
+    if db_data is not None:
+        return JOB_POSTING_FROM_DB.render(
+            compacted, job=job, company=company, org_summary=db_data['org_sum'],
+            work_summary=db_data['work_sum'], skills_summary=db_data['skills_sum'],
+        )
+    return JOB_POSTING.render(compacted, job=job, company=company)
+
+
+def required_skills_prompt(job, job_posting, similar_sum, scores=None, compacted=True):
+    """
+    필요 역량 프롬프트. scores(유사도)가 있으면 유사 공고를 점수에 비례한 토큰 예산으로 자릅니다.
+    """
+    if compacted:
+        scores = scores if scores is not None else [1.0] * len(similar_sum)
+        similar_sum = fit_to_budget([compact(text) for text in similar_sum], scores, SIMILAR_POSTINGS_TOKENS)
+    similar = "\n".join(f"{i}. '{text}'" for i, text in enumerate(similar_sum, 1))
+    return REQUIRED_SKILLS.render(compacted, job=job, job_posting=job_posting, similar=similar)
+
+
+def statement_prompt(job, category, activity, skills, compacted=True):
+    return STATEMENT.render(compacted, job=job, category=category, activity=activity, skills=skills)
+
+
+def q1_prompt(job, personal_statement, compacted=True):
+    return Q1.render(compacted, job=job, personal_statement=personal_statement)
+
+
+def news_keyword_prompt(job, company, compacted=True):
+    return NEWS_KEYWORD.render(compacted, job=job, company=company)
+
+
+def summarize_cluster_prompt(text, job, company, keyword, compacted=True):
+    """
+    클러스터 요약 프롬프트. 클러스터 텍스트는 CLUSTER_TEXT_TOKENS 예산으로 줄입니다.
+    """
+    if compacted:
+        text = trim_cluster_text(text)
+    return SUMMARIZE_CLUSTER.render(compacted, job=job, company=company, keyword=keyword, text=text)
+
+
+def q2_prompt(job, company, keyword, topic, text, compacted=True):
+    return Q2.render(compacted, job=job, company=company, keyword=keyword, topic=topic, text=text)
+
+
+def q3_prompt(job, keywords, job_posting, compacted=True):
+    return Q3.render(compacted, job=job, keywords=keywords, job_posting=job_posting)
+
+
+###############################################################################
+# 벤치마크: 고정 입력 세션의 입력 토큰 수 (압축/예산 적용 전후)
+###############################################################################
+
+def _session_prompts(compacted):
+    """
+    한 사용자 세션(공고 → 역량 → 글감 → 면접 질문)에서 만드는 프롬프트를 고정 입력으로 생성합니다.
+    유사 공고와 뉴스 클러스터는 공고 DB의 실제 요약을 사용합니다.
+    """
+    import pandas as pd
+    import kr_text
+    from posting_store import PostingStore
+    from news_clustering import cluster_news_and_text
+
+    db = PostingStore().frame("total_sum", "work_sum")
+    job, company = "데이터 분석가", "카카오"
+    job_posting = compact(JOB_POSTING.raw_system.split("[예제2]")[1].split("**출력 형식**")[0])
+    similar = db["total_sum"].iloc[[3, 17, 42]].tolist()
+    scores = [0.83, 0.79, 0.74]
+    skills = "1. 기술적 역량:\n- SQL: 데이터 추출\n- Python: 분석 자동화\n- 통계: 실험 설계\n" \
+             "2. 비기술적 역량:\n- 소통\n- 문제 해결\n- 주도성"
+    activity = "교내 데이터 분석 동아리에서 공공 데이터로 상권 분석 프로젝트를 진행하고 결과를 발표했습니다."
+
+    prompts = [
+        job_posting_prompt(job, company, None, compacted),
+        required_skills_prompt(job, job_posting, similar, scores, compacted),
+        statement_prompt(job, "역량/경험", activity, skills, compacted),
+        q1_prompt(job, [activity], compacted),
+        news_keyword_prompt(job, company, compacted),
+    ]
+    for k in range(3):
+        news = pd.DataFrame({"Summary": db["work_sum"].iloc[k * 30:(k + 1) * 30].tolist()})
+        _, cluster_text = cluster_news_and_text(news, preprocess_many=kr_text.preprocess_many)
+        prompts.append(summarize_cluster_prompt(cluster_text, job, company, f"키워드{k}", compacted))
+    topic_text = db["work_sum"].iloc[0]
+    prompts.append(q2_prompt(job, company, "키워드0", "데이터 기반 의사결정 확산", topic_text, compacted))
+    prompts.append(q3_prompt(job, ["데이터", "분석", "SQL"], job_posting, compacted))
+    return prompts
+
+
+def _live_latency(prompts, model="gpt-4o-mini"):
+    """
+    OPENAI_API_KEY가 있을 때 실제 API로 세션 프롬프트를 호출하여 (전체 지연, 캐시된 입력 토큰)을 측정합니다.
+    """
+    import openai
+
+    client = openai.OpenAI()
+    elapsed, cached = 0.0, 0
+    for system, user in prompts:
+        start = time.perf_counter()
+        response = client.chat.completions.create(
+            model=model, max_tokens=300, temperature=0,
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+        )
+        elapsed += time.perf_counter() - start
+        details = getattr(response.usage, "prompt_tokens_details", None)
+        cached += getattr(details, "cached_tokens", 0) or 0
+    return elapsed, cached
+
+
+def benchmark(live=False):
+    for label, compacted in [("압축/예산 미적용", False), ("압축/예산 적용", True)]:
+        reset_prompt_stats()
+        prompts = _session_prompts(compacted)
+        stats = prompt_stats()
+        total = sum(entry["input_tokens"] for entry in stats.values())
+        static = sum(entry["static_tokens"] for entry in stats.values())
+        print(f"[{label}] 세션 입력 토큰 {total:,} (정적 접두부 {static:,}, {static / total:.0%})")
+        for name, entry in stats.items():
+            print(f"    {name:<22} {entry['calls']}회  {entry['input_tokens']:6,} 토큰")
+        if live:
+            # 같은 세션을 두 번 호출하여 두 번째 호출의 접두부 캐시 적중을 확인
+            _live_latency(prompts)
+            elapsed, cached = _live_latency(prompts)
+            print(f"    API 지연 {elapsed:.2f}s / 세션, 캐시된 입력 토큰 {cached:,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프롬프트 입력 토큰 벤치마크 (고정 입력 세션)")
+    parser.add_argument("--live", action="store_true", help="OPENAI_API_KEY로 실제 호출하여 지연과 캐시 적중 측정")
+    args = parser.parse_args()
+    benchmark(live=args.live)
@@ -0,0 +1,133 @@
+import json
+import hashlib
+import numpy as np
+
+from embedding_store import FIELDS, content_hash, normalize_rows
+
+
+###############################################################################
+# 세 필드(조직/직무/역량) 가중 유사도 기반 공고 재정렬
+# - 저장소 행렬이 정규화되어 있으므로 코사인 유사도 = 내적
+# - 가중치는 쿼리 쪽에 곱하고 필드별 memmap 블록과 각각 내적해 합산
+#   → 가중 결합 행렬(N, F*D)을 프로세스마다 따로 만들지 않고 OS 페이지 캐시를 공유 (user-001)
+# - 상위 k개는 argpartition으로 선택 후 k개만 정렬
+###############################################################################
+
+DEFAULT_WEIGHTS = {"org_sum": 0.2, "work_sum": 0.4, "skills_sum": 0.4}
+
+
+def top_k_indices(scores, k):
+    """
+    (B, N) 점수 행렬에서 행마다 점수가 높은 순서로 k개의 인덱스를 반환합니다.
+    """
+    scores = np.atleast_2d(scores)
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+class FusedReranker:
+    """
+    필드별 가중치를 반영한 융합 점수로 공고를 정렬합니다.
+
+    queries는 {필드명: (B, D) 또는 (D,) 임베딩} 형태이며, 여러 쿼리를 한 번에 처리할 수 있습니다.
+
+    재정렬기 자체가 가중 결합 행렬 (N, F*D)의 읽기 전용 뷰처럼 동작합니다 (len, shape, reranker[ids]).
+    행은 요청할 때 저장소에서 읽으므로 ann_index.py / compact_index.py가 전체 행렬 없이 학습/재정렬할 수 있습니다.
+    """
+
+    def __init__(self, store, weights=None, chunk_size=65536):
+        weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        unknown = set(weights) - set(store.fields)
+        if unknown:
+            raise ValueError(f"임베딩 저장소에 없는 필드입니다: {sorted(unknown)}")
+
+        self.store = store
+        self.weights = weights
+        self.fields = tuple(field for field in FIELDS if field in weights)
+        self.dim = store.dim
+        self.chunk_size = chunk_size
+        self._fingerprint = None
+
+    def __len__(self):
+        return len(self.store)
+
+    @property
+    def shape(self):
+        return len(self.store), len(self.fields) * self.dim
+
+    def __getitem__(self, ids):
+        return self.rows(ids)
+
+    def fingerprint(self):
+        """
+        저장소 내용 해시 + 필드 가중치. 가중 결합 벡터로 학습해 저장한 검색 인덱스가 지금 재정렬기와
+        맞는지 확인합니다 (행 수가 같아도 임베딩이나 가중치가 바뀌면 다른 값).
+        """
+        if self._fingerprint is None:
+            key = json.dumps([content_hash(self.store), [[f, self.weights[f]] for f in self.fields]])
+            self._fingerprint = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return self._fingerprint
+
+    def rows(self, ids):
+        """
+        ids 행의 가중 결합 벡터 (len(ids), F*D)를 저장소에서 읽어 반환합니다.
+        """
+        return np.hstack(
+            [np.asarray(self.store[field][ids], dtype=np.float32) * np.float32(self.weights[field])
+             for field in self.fields]
+        )
+
+    def encode_queries(self, queries):
+        """
+        필드별 쿼리 임베딩을 정규화한 뒤 (B, F*D) 행렬로 이어 붙입니다.
+        """
+        parts = []
+        for field in self.fields:
+            if field not in queries:
+                raise KeyError(f"쿼리에 '{field}' 임베딩이 없습니다.")
+            parts.append(normalize_rows(np.atleast_2d(queries[field])))
+
+        batch_sizes = {part.shape[0] for part in parts}
+        if len(batch_sizes) != 1:
+            raise ValueError("필드별 쿼리 개수가 다릅니다.")
+        return np.hstack(parts)
+
+    def encoded_scores(self, encoded):
+        """
+        encode_queries()의 (B, F*D) 쿼리로 모든 공고의 융합 점수 (B, N)를 계산합니다.
+        필드 가중치를 쿼리에 곱한 뒤 필드별 저장소 행렬(memmap)과 청크 단위로 내적합니다.
+        """
+        encoded = np.atleast_2d(np.asarray(encoded, dtype=np.float32))
+        n = len(self.store)
+        scores = np.zeros((len(encoded), n), dtype=np.float32)
+        for i, field in enumerate(self.fields):
+            query = encoded[:, i * self.dim:(i + 1) * self.dim] * np.float32(self.weights[field])
+            matrix = self.store[field]
+            for start in range(0, n, self.chunk_size):
+                block = np.asarray(matrix[start:start + self.chunk_size], dtype=np.float32)
+                scores[:, start:start + len(block)] += query @ block.T
+        return scores
+
+    def scores(self, queries):
+        """
+        모든 공고에 대한 융합 점수 (B, N)를 반환합니다.
+        """
+        return self.encoded_scores(self.encode_queries(queries))
+
+    def top_k(self, queries, k=3):
+        """
+        쿼리마다 융합 점수 상위 k개 공고의 (인덱스, 점수)를 반환합니다.
+        """
+        scores = self.scores(queries)
+        indices = top_k_indices(scores, k)
+        return indices, np.take_along_axis(scores, indices, axis=1)
+
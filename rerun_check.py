@@ -0,0 +1,107 @@
+import os
+import sys
+import argparse
+import tempfile
+
+
+###############################################################################
+# Streamlit 재실행(rerun)별 LLM 호출 수 검사
+# - streamlit.testing(AppTest)으로 demo.py를 브라우저 없이 실행하며 사용자 상호작용을 순서대로 재현
+# - 서비스는 가짜 LLM 파이프라인(fake_llm.py) + 로컬 뉴스 스텁 서버(news_client.StubDeepSearchServer)
+# - 상호작용마다 세션 Trace(tracing.py)의 LLM 요청 수(응답 캐시 적중 포함)를 세어 기대값과 비교
+#   기대값과 다르면 실패(exit 1) → 위젯 클릭/키 입력이 LLM 단계를 다시 실행하거나 (많음)
+#   필요한 단계를 건너뛰는 (적음) 회귀를 잡아냄
+#
+#   python rerun_check.py
+###############################################################################
+
+JOB = "데이터 분석가"
+COMPANY = "카카오"
+CATEGORY = "역량/경험"
+
+
+def llm_requests(at):
+    """
+    세션 Trace에 기록된 LLM 요청 수 (실제 호출 + 응답 캐시 적중).
+    """
+    trace = at.session_state["trace"]
+    return sum(record["llm_calls"] + record["cache_hits"] for record in trace.records())
+
+
+def topic_checkbox(at, n):
+    # 뉴스 트렌드 탭의 n번째 토픽 체크박스 (key: "{키워드}_{번호}")
+    boxes = [box for box in at.checkbox if box.key and box.key != "debug_trace"]
+    return boxes[n - 1]
+
+
+# (상호작용 이름, AppTest 조작, 기대 LLM 요청 수)
+# 채용 공고 생성: 공고 1 + 필요 역량 1
+# 글감 생성: 문항 1 + 면접 질문(활동 기반 1, 기술 1, 뉴스 키워드 1, 클러스터 요약 3)
+INTERACTIONS = [
+    ("첫 화면", lambda at: at, 0),
+    ("직무 입력", lambda at: at.text_input(key="job").input(JOB), 0),
+    ("회사 입력", lambda at: at.text_input(key="company").input(COMPANY), 0),
+    ("채용 공고 생성 클릭", lambda at: at.button(key="generate_posting").click(), 2),
+    ("문항 선택", lambda at: at.multiselect(key="categories").select(CATEGORY), 0),
+    ("활동 입력", lambda at: at.text_area(key=f"activity_{CATEGORY}").input("교내 데이터 분석 공모전 수상"), 0),
+    ("글감 생성 클릭", lambda at: at.button(key="generate_statement").click(), 7),
+    ("활동 수정 (글감 재생성 전)", lambda at: at.text_area(key=f"activity_{CATEGORY}").input("공모전 수상, 인턴"), 0),
+    ("뉴스 토픽 1 선택", lambda at: topic_checkbox(at, 1).check(), 1),
+    ("뉴스 토픽 1 해제", lambda at: topic_checkbox(at, 1).uncheck(), 0),
+    ("첫 번째 토픽 다시 선택", lambda at: topic_checkbox(at, 1).check(), 0),
+    ("디버그 패널 켜기", lambda at: at.sidebar.checkbox(key="debug_trace").check(), 0),
+    ("직무 입력 수정 (공고 재생성 전)", lambda at: at.text_input(key="job").input("백엔드 개발자"), 0),
+]
+
+
+def run(timeout=120):
+    """
+    INTERACTIONS를 순서대로 실행하고 [(이름, LLM 요청 수, 기대값)]을 반환합니다.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    import guide_client
+    from fake_llm import make_fake_pipeline
+    from news_client import NewsClient, StubDeepSearchServer
+    from news_store import NewsStore
+
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as workdir, StubDeepSearchServer() as server:
+        news_store = NewsStore(os.path.join(workdir, "news_store.sqlite"), client=NewsClient(base_url=server.url))
+        pipeline, _ = make_fake_pipeline(workdir, latency=0.0, news_store=news_store)
+        # demo.py의 load_service()가 가짜 파이프라인을 쓰도록 교체 (AppTest는 같은 프로세스에서 실행)
+        guide_client.get_guide_service = lambda: pipeline
+
+        at = AppTest.from_file(os.path.join(repo_dir, "demo.py"), default_timeout=timeout)
+        results = []
+        for name, interact, expected in INTERACTIONS:
+            # 상호작용마다 세션 Trace를 비워 그 재실행에서 보낸 요청만 셈 (span 보관 상한과 무관)
+            if "trace" in at.session_state:
+                at.session_state["trace"].clear()
+            interact(at).run()
+            if at.exception:
+                raise RuntimeError(f"{name}: {at.exception[0].message}")
+            results.append((name, llm_requests(at), expected))
+        return results
+
+
+def report(results):
+    print(f"{'상호작용':<34} {'LLM 요청':>8} {'기대':>6}")
+    failed = []
+    for name, count, expected in results:
+        mark = "" if count == expected else ("  ← 초과" if count > expected else "  ← 부족")
+        print(f"{name:<34} {count:>8} {expected:>6}{mark}")
+        if count != expected:
+            failed.append(name)
+    if failed:
+        print(f"[FAIL] LLM 호출 수가 기대값과 다름: {', '.join(failed)}")
+        return False
+    print("[OK] 상호작용별 LLM 호출 수 검사 통과")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="demo.py 재실행별 LLM 호출 수 검사")
+    parser.add_argument("--timeout", type=float, default=120, help="재실행 한 번의 제한 시간(초)")
+    args = parser.parse_args()
+    sys.exit(0 if report(run(args.timeout)) else 1)
@@ -0,0 +1,100 @@
+import os
+import re
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+
+###############################################################################
+# 앱 시작(import) 시간 프로파일
+# - `python -X importtime`으로 demo.py를 새 프로세스에서 import하여 모듈별 누적 시간 집계
+# - 시작 시점에 무거운 모듈(Kiwi, sklearn 등)이 로딩되면 실패(exit 1)로 처리하여
+#   지연 로딩이 깨지는 변경을 잡아내는 회귀 검사로 사용
+#
+#   python startup_profile.py                 # 상위 모듈 보고 + 회귀 검사
+#   python startup_profile.py --budget-ms 3000
+###############################################################################
+
+# 시작 시점에 import되면 안 되는 패키지 (뉴스/키워드 탭을 열 때만 로딩)
+LAZY_PACKAGES = ("kiwipiepy", "sklearn")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+PROBE = (
+    "import sys, json, {module}; "
+    "print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}})))"
+)
+
+
+def profile_import(module="demo", repo_dir=None):
+    """
+    새 프로세스에서 module을 import하고
+    (전체 누적 시간(us), 직접 import한 패키지별 누적 시간(us), 로딩된 최상위 패키지 목록)을 반환합니다.
+    캐시 파일 등이 저장소에 생기지 않도록 임시 디렉토리에서 실행합니다.
+    """
+    repo_dir = os.path.abspath(repo_dir or os.path.dirname(__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_dir, env.get("PYTHONPATH")]))
+
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+            cwd=cwd, env=env, capture_output=True, text=True,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr[-2000:]}")
+
+    # 들여쓰기 깊이 0 = module 자신, 깊이 1 = module이 직접 import한 패키지
+    # (누적 시간에 하위 import 포함)
+    breakdown = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        depth = (len(match.group(3)) - 1) // 2
+        name = match.group(4)
+        if depth == 0 and name == module:
+            total_us = int(match.group(2))
+        elif depth == 1:
+            package = name.split(".")[0]
+            breakdown[package] = breakdown.get(package, 0) + int(match.group(2))
+
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return total_us, breakdown, loaded
+
+
+def report(total_us, breakdown, loaded, top=15, budget_ms=None):
+    """
+    상위 모듈 시간 표를 출력하고, 회귀 검사를 통과하면 True를 반환합니다.
+    """
+    total_ms = total_us / 1000
+    print(f"{'package':<28} {'cumulative':>12}")
+    for package, us in sorted(breakdown.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<28} {us / 1000:>9.1f} ms")
+    print(f"{'전체':<28} {total_ms:>9.1f} ms")
+
+    ok = True
+    eager = sorted(set(LAZY_PACKAGES) & set(loaded))
+    if eager:
+        print(f"[FAIL] 시작 시점에 로딩되면 안 되는 패키지: {', '.join(eager)}")
+        ok = False
+    if budget_ms is not None and total_ms > budget_ms:
+        print(f"[FAIL] import 시간 {total_ms:.0f} ms > 예산 {budget_ms:.0f} ms")
+        ok = False
+    if ok:
+        print("[OK] 지연 로딩 회귀 검사 통과")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="앱 import 시간 프로파일")
+    parser.add_argument("--module", default="demo")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    total_us, breakdown, loaded = profile_import(args.module)
+    sys.exit(0 if report(total_us, breakdown, loaded, args.top, args.budget_ms) else 1)
@@ -0,0 +1,70 @@
+import json
+import threading
+
+
+###############################################################################
+# 로컬 스텁 HTTP 서버 공통 부분
+# - 임베딩(embedding_client.StubEmbeddingServer), LLM(llm_client.MockRateLimitServer),
+#   뉴스(news_client.StubDeepSearchServer) 스텁이 함께 사용
+# - StubServer: 127.0.0.1 임의 포트의 ThreadingHTTPServer + 백그라운드 스레드 + with 문
+# - StubHandler: 요청 핸들러 믹스인 (keep-alive, TCP_NODELAY, 응답 전송, 로그 끔)
+# - http.server는 서버를 만들 때만 import (앱 시작 시간에 포함되지 않도록)
+#
+#   class Handler(StubHandler, BaseHTTPRequestHandler):
+#       def do_GET(self):
+#           self.send_json(200, {"ok": True})
+#
+#   class MyStub(StubServer):
+#       def __init__(self):
+#           self.serve(Handler, "/v1")
+###############################################################################
+
+
+class StubHandler:
+    """
+    BaseHTTPRequestHandler 앞에 섞어 쓰는 믹스인.
+    HTTP/1.1 keep-alive로 응답하고, TCP_NODELAY(disable_nagle_algorithm)로 헤더와 본문을 나눠 써도
+    Nagle/지연 ACK 때문에 응답이 늦어지지 않게 합니다.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_body(status, body, "application/json", headers)
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    """
+    스텁 서버 기반 클래스. 하위 클래스의 __init__에서 serve(handler, path)를 호출하면
+    url(예: http://127.0.0.1:포트/v1)이 정해지고, with 블록 동안 백그라운드 스레드에서 요청을 처리합니다.
+    """
+
+    def serve(self, handler, path=""):
+        from http.server import ThreadingHTTPServer
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,346 @@
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+###############################################################################
+# 단계별 지연 시간 / 비용 추적
+# - @traced로 감싼 함수 호출마다 span(이름, 시작/종료 시각, 부모 span)을 기록
+# - LLM 응답의 usage(입력/출력 토큰)와 캐시 적중은 호출 중인 span에 누적 (llm_cache.py)
+# - 스트리밍 응답을 반환하는 함수는 스트림을 다 읽을 때 span이 끝남
+#   (마지막 청크의 usage — llm_stream.ChatStream.usage — 를 같은 방식으로 기록)
+# - 수집: collect()/activate()로 지정한 Trace(세션 단위)에 span을 모음
+#   (asyncio 단계와 asyncio.to_thread 스레드에도 contextvars로 전달)
+# - 내보내기 (설치되어 있을 때만):
+#   opentelemetry-api → span으로 내보냄 (TracerProvider 설정은 실행 환경에서)
+#   prometheus_client → 단계별 소요 시간 히스토그램, 토큰/캐시 적중/오류 카운터
+#
+#   with collect() as trace:
+#       pipeline.generate_guide("데이터 분석가", "카카오")
+#   print(format_trace(trace))
+###############################################################################
+
+# 현재 요청/세션의 Trace와 호출 중인 span
+_current_trace = ContextVar("career_guide_trace", default=None)
+_current_span = ContextVar("career_guide_span", default=None)
+
+# span에 누적하는 수치 항목
+COUNTERS = ("llm_calls", "prompt_tokens", "completion_tokens", "cache_hits")
+
+
+class Span:
+    """
+    함수 호출 하나의 기록. start/end는 time.perf_counter() 값입니다.
+    """
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.otel = _start_otel_span(name, parent)
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def depth(self):
+        return 0 if self.parent is None else self.parent.depth + 1
+
+    def add(self, **counts):
+        for name, value in counts.items():
+            self.counts[name] += value
+
+    def finish(self, error=None):
+        if self.end is not None:
+            return
+        self.end = time.perf_counter()
+        self.error = type(error).__name__ if error is not None else None
+        _export(self)
+
+
+class Trace:
+    """
+    한 요청 또는 한 Streamlit 세션의 span 모음 (스레드 안전).
+    max_spans를 주면 가장 최근 span만 그만큼 보관합니다 (오래 열려 있는 세션의 메모리 상한).
+    """
+
+    def __init__(self, max_spans=None):
+        self.origin = time.perf_counter()
+        self.spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self.spans = deque(maxlen=self.spans.maxlen)
+            self.origin = time.perf_counter()
+
+    def records(self):
+        """
+        끝난 span을 시작 순서대로 dict 리스트로 반환합니다 (시각은 Trace 생성 시점 기준 초).
+        """
+        with self._lock:
+            spans = [span for span in self.spans if span.end is not None]
+        return [
+            {
+                "name": span.name,
+                "depth": span.depth,
+                "parent": span.parent.name if span.parent else None,
+                "start": span.start - self.origin,
+                "end": span.end - self.origin,
+                "duration": span.end - span.start,
+                "error": span.error,
+                **span.counts,
+            }
+            for span in sorted(spans, key=lambda span: span.start)
+        ]
+
+    def summary(self):
+        """
+        span 이름별 {calls, total_s, llm_calls, prompt_tokens, completion_tokens, cache_hits}.
+        """
+        summary = {}
+        for record in self.records():
+            row = summary.setdefault(record["name"], {"calls": 0, "total_s": 0.0, **dict.fromkeys(COUNTERS, 0)})
+            row["calls"] += 1
+            row["total_s"] += record["duration"]
+            for name in COUNTERS:
+                row[name] += record[name]
+        return summary
+
+
+@contextmanager
+def collect(trace=None):
+    """
+    블록 안의 @traced 호출을 trace(없으면 새 Trace)에 모읍니다.
+    """
+    trace = trace if trace is not None else Trace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def activate(trace):
+    """
+    현재 컨텍스트(스레드)의 이후 @traced 호출을 trace에 모읍니다.
+    Streamlit 스크립트처럼 블록으로 감싸기 어려운 곳에서 사용합니다.
+    """
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def record_usage(usage=None, cache_hit=False):
+    """
+    호출 중인 span에 LLM 호출 하나의 usage(prompt_tokens/completion_tokens)와 캐시 적중을 더합니다.
+    """
+    span = _current_span.get()
+    if span is None:
+        return
+    if cache_hit:
+        span.add(cache_hits=1)
+        return
+    span.add(llm_calls=1)
+    if usage is not None:
+        span.add(prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                 completion_tokens=getattr(usage, "completion_tokens", 0) or 0)
+
+
+def _is_stream(result):
+    # llm_stream.ChatStream, guide_client.RemoteStream
+    return hasattr(result, "__iter__") and hasattr(result, "format_metrics")
+
+
+class TracedStream:
+    """
+    스트리밍 응답을 감싸 스트림을 다 읽을 때 span을 끝냅니다. 그 외 속성은 원래 스트림의 것을 그대로 씁니다.
+    """
+
+    def __init__(self, stream, span):
+        self.stream = stream
+        self.span = span
+
+    def __iter__(self):
+        token = _current_span.set(self.span)
+        error = None
+        try:
+            yield from self.stream
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            cache_hit = getattr(self.stream, "cache_hit", False)
+            if cache_hit or error is None:
+                record_usage(getattr(self.stream, "usage", None), cache_hit=cache_hit)
+            _current_span.reset(token)
+            self.span.finish(error)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def traced(name=None):
+    """
+    함수 호출을 span으로 기록하는 데코레이터. 수집 중인 Trace가 없어도 메트릭 내보내기는 수행합니다.
+
+        @traced("retrieval")
+        def retrieval(self, job_posting, top_n=3): ...
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            span = Span(span_name, parent=_current_span.get())
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.add(span)
+            token = _current_span.set(span)
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                span.finish(e)
+                raise
+            finally:
+                _current_span.reset(token)
+            if _is_stream(result):
+                return TracedStream(result, span)
+            span.finish()
+            return result
+
+        return wrapper
+    return decorator
+
+
+def format_trace(trace, width=40):
+    """
+    span을 시작 순서대로 들여쓴 텍스트 워터폴로 반환합니다.
+    """
+    records = trace.records()
+    if not records:
+        return ""
+    total = max(record["end"] for record in records) or 1.0
+    lines = []
+    for record in records:
+        left = int(record["start"] / total * width)
+        bar = " " * left + "█" * max(1, int(record["duration"] / total * width))
+        label = "  " * record["depth"] + record["name"]
+        extra = ""
+        if record["llm_calls"] or record["cache_hits"]:
+            extra = (f"  LLM {record['llm_calls']}회 · 토큰 {record['prompt_tokens']}/{record['completion_tokens']}"
+                     f" · 캐시 {record['cache_hits']}")
+        if record["error"]:
+            extra += f"  [{record['error']}]"
+        lines.append(f"{label:<32} {bar:<{width}} {record['start']:6.2f}s +{record['duration']:.2f}s{extra}")
+    return "\n".join(lines)
+
+
+###############################################################################
+# 내보내기 (OpenTelemetry / Prometheus, 설치되어 있을 때만)
+###############################################################################
+
+_exporters = None
+_exporters_lock = threading.Lock()
+
+
+def _load_exporters():
+    global _exporters
+    if _exporters is None:
+        with _exporters_lock:
+            if _exporters is None:
+                _exporters = {"otel": _otel_tracer(), "prometheus": _prometheus_metrics()}
+    return _exporters
+
+
+def _otel_tracer():
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace.get_tracer("career_guide")
+
+
+def _prometheus_metrics():
+    try:
+        import prometheus_client
+    except ImportError:
+        return None
+    return {
+        "seconds": prometheus_client.Histogram(
+            "career_guide_stage_seconds", "파이프라인 단계별 소요 시간", ["stage"],
+            buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+        ),
+        "errors": prometheus_client.Counter("career_guide_stage_errors_total", "단계별 오류 수", ["stage"]),
+        "llm_calls": prometheus_client.Counter("career_guide_llm_calls_total", "LLM 호출 수", ["stage"]),
+        "tokens": prometheus_client.Counter("career_guide_llm_tokens_total", "LLM 토큰 사용량", ["stage", "kind"]),
+        "cache_hits": prometheus_client.Counter("career_guide_llm_cache_hits_total", "LLM 응답 캐시 적중 수", ["stage"]),
+    }
+
+
+def _start_otel_span(name, parent):
+    tracer = _load_exporters()["otel"]
+    if tracer is None:
+        return None
+    from opentelemetry import trace
+    context = trace.set_span_in_context(parent.otel) if parent is not None and parent.otel is not None else None
+    return tracer.start_span(name, context=context)
+
+
+def _export(span):
+    exporters = _load_exporters()
+    if span.otel is not None:
+        for counter, value in span.counts.items():
+            span.otel.set_attribute(f"career_guide.{counter}", value)
+        if span.error:
+            span.otel.set_attribute("error.type", span.error)
+        span.otel.end()
+
+    metrics = exporters["prometheus"]
+    if metrics is not None:
+        stage = span.name
+        metrics["seconds"].labels(stage).observe(span.end - span.start)
+        if span.error:
+            metrics["errors"].labels(stage).inc()
+        if span.counts["llm_calls"]:
+            metrics["llm_calls"].labels(stage).inc(span.counts["llm_calls"])
+        if span.counts["cache_hits"]:
+            metrics["cache_hits"].labels(stage).inc(span.counts["cache_hits"])
+        for kind in ("prompt_tokens", "completion_tokens"):
+            if span.counts[kind]:
+                metrics["tokens"].labels(stage, kind).inc(span.counts[kind])
+
+
+###############################################################################
+# 예시: 가짜 LLM 파이프라인으로 가이드 생성 후 워터폴 출력
+###############################################################################
+
+if __name__ == "__main__":
+    import tempfile
+    from fake_llm import make_fake_pipeline
+    # 파이프라인 모듈과 같은 ContextVar를 쓰도록 __main__이 아닌 tracing 모듈에서 가져옴
+    import tracing
+
+    with tempfile.TemporaryDirectory() as workdir:
+        pipeline, _ = make_fake_pipeline(workdir, latency=0.2)
+        pipeline.warm_up()
+        for label in ("첫 호출", "캐시 적중"):
+            with tracing.collect() as trace:
+                pipeline.generate_guide("데이터 분석가", "카카오")
+            print(f"[{label}]")
+            print(tracing.format_trace(trace))
+            print()